@@ -0,0 +1,37 @@
+"""
+Backfill the local price history of every market-priced holding
+
+Downloads only the dates each instrument is missing (the full configured
+history for new instruments), plus the NIFTY 50 benchmark. Safe to run
+repeatedly, e.g. daily from cron after market close.
+
+Usage:
+    python backfill_prices.py
+"""
+import sys
+from database import SessionLocal
+from models import AssetClass, Investment
+from services.market_data_service import MarketDataService
+from services.price_history import PriceHistoryStore, price_history
+
+
+def main():
+    with SessionLocal() as db:
+        holdings = db.query(Investment.symbol, AssetClass.name).join(
+            AssetClass, Investment.asset_class_id == AssetClass.asset_class_id
+        ).distinct().all()
+
+    instruments = [PriceHistoryStore.instrument(asset_class_name, symbol) for symbol, asset_class_name in holdings]
+    instruments = [instrument for instrument in instruments if instrument]
+    instruments.append(('index', MarketDataService.INDICES['NIFTY50']))
+
+    appended = price_history.backfill(instruments)
+    for (kind, symbol), rows in sorted(appended.items()):
+        last = price_history.last_date(kind, symbol)
+        print(f"{'✓' if last else '✗'} {kind}:{symbol} +{rows} rows (through {last or 'n/a'})")
+    print(f"✓ {sum(appended.values())} rows appended for {len(appended)} instruments")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
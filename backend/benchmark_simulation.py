@@ -0,0 +1,145 @@
+"""
+Benchmark for the vectorized Monte Carlo engine
+
+Compares SimulationEngine against the original per-cell loop implementation on a
+long-horizon goal, checks that both produce statistically matching results and
+that the speedup is at least 50x. Also checks that a seeded run is
+bit-identical whatever the number of worker processes.
+
+Both implementations are seeded, so the comparison gives the same verdict on
+every run, and each is timed several times with the median taken, so a single
+slow run (another process, CPU frequency scaling) does not decide the speedup.
+
+Usage:
+    python benchmark_simulation.py
+"""
+import math
+import sys
+import time
+import numpy as np
+from services.simulation_engine import SimulationEngine
+
+REQUIRED_SPEEDUP = 50
+LEGACY_RUNS = 5
+VECTORIZED_RUNS = 15
+LEGACY_SEED = 20240101
+VECTORIZED_SEED = 20240102
+
+GOAL = {
+    'current_allocation': 1_500_000,
+    'target_amount': 25_000_000,
+    'years': 30,
+    'expected_return': 0.11,
+    'volatility': 0.15,
+    'monthly_sip': 15_000,
+}
+
+
+def legacy_terminal_values(current_allocation, years, expected_return, volatility,
+                           monthly_sip=0, num_simulations=5000):
+    """Original double-loop implementation, kept here as the reference"""
+    outcomes = []
+    months = years * 12
+    monthly_return = expected_return / 12
+    monthly_volatility = volatility / math.sqrt(12)
+
+    for _ in range(num_simulations):
+        portfolio_value = current_allocation
+        for month in range(months):
+            portfolio_value += monthly_sip
+            random_return = np.random.normal(monthly_return, monthly_volatility)
+            portfolio_value *= (1 + random_return)
+        outcomes.append(portfolio_value)
+
+    return np.array(outcomes)
+
+
+def legacy_monte_carlo(target_amount, seed, **params):
+    """The legacy simulation summarized like SimulationEngine.run; seeds numpy's global generator"""
+    np.random.seed(seed)
+    outcomes = legacy_terminal_values(**params)
+    return SimulationEngine.summarize_outcomes(outcomes, target_amount), outcomes
+
+
+def timed(fn, runs, **kwargs):
+    """Result of the first run and the median time over all runs"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(**kwargs)
+        times.append(time.perf_counter() - start)
+    return result, float(np.median(times))
+
+
+def median_standard_error(outcomes):
+    """
+    Distribution-free standard error of a sample median
+
+    The order statistics n/2 +- sqrt(n)/2 bracket the median with about 68%
+    confidence, i.e. they lie about one standard error either side of it.
+    """
+    ordered = np.sort(outcomes)
+    n = len(ordered)
+    half_width = int(math.ceil(math.sqrt(n) / 2))
+    return (ordered[min(n // 2 + half_width, n - 1)] - ordered[max(n // 2 - half_width, 0)]) / 2
+
+
+def check_reproducibility(seed=20240101, num_simulations=50_000):
+    """Seeded runs must match bit for bit across worker counts"""
+    params = {k: v for k, v in GOAL.items() if k != 'target_amount'}
+    reference = SimulationEngine.simulate_terminal_values(
+        **params, num_simulations=num_simulations, seed=seed, workers=1
+    )
+    for workers in (2, 4):
+        outcomes = SimulationEngine.simulate_terminal_values(
+            **params, num_simulations=num_simulations, seed=seed, workers=workers
+        )
+        if not np.array_equal(reference, outcomes):
+            print(f"✗ Seeded run differs with {workers} workers")
+            return False
+    print("✓ Seeded runs are bit-identical across 1, 2 and 4 workers")
+    return True
+
+
+def main():
+    num_simulations = 5000
+
+    # Warm up numpy before timing
+    SimulationEngine.run(**GOAL, num_simulations=100)
+
+    (legacy, legacy_outcomes), legacy_time = timed(
+        legacy_monte_carlo, LEGACY_RUNS, **GOAL, num_simulations=num_simulations, seed=LEGACY_SEED
+    )
+    vectorized, vectorized_time = timed(
+        SimulationEngine.run, VECTORIZED_RUNS, **GOAL, num_simulations=num_simulations, seed=VECTORIZED_SEED
+    )
+    speedup = legacy_time / vectorized_time
+
+    print(f"Goal: {GOAL['years']} years, {num_simulations} simulations")
+    print(f"{'metric':<22}{'legacy':>18}{'vectorized':>18}")
+    for key in ('median_outcome', 'worst_case', 'best_case', 'success_probability'):
+        print(f"{key:<22}{legacy[key]:>18,.2f}{vectorized[key]:>18,.2f}")
+    print(f"{'median time (s)':<22}{legacy_time:>18.4f}{vectorized_time:>18.4f}")
+    print(f"Speedup: {speedup:.1f}x (median of {LEGACY_RUNS} legacy and {VECTORIZED_RUNS} vectorized runs)")
+
+    # Success probability is a binomial proportion; allow 4 combined standard errors
+    p = legacy['success_probability'] / 100
+    tolerance = 4 * math.sqrt(2 * max(p * (1 - p), 1e-4) / num_simulations) * 100
+    probability_ok = abs(legacy['success_probability'] - vectorized['success_probability']) <= tolerance
+    # Likewise for the median, from the spread of the legacy outcomes around it
+    median_tolerance = 4 * math.sqrt(2) * median_standard_error(legacy_outcomes)
+    median_ok = abs(legacy['median_outcome'] - vectorized['median_outcome']) <= median_tolerance
+
+    if not probability_ok or not median_ok:
+        print("✗ Vectorized results do not match the legacy implementation")
+        return 1
+    if speedup < REQUIRED_SPEEDUP:
+        print(f"✗ Speedup below required {REQUIRED_SPEEDUP}x")
+        return 1
+    print(f"✓ Results match and speedup is at least {REQUIRED_SPEEDUP}x")
+
+    return 0 if check_reproducibility() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
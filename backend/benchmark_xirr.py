@@ -0,0 +1,93 @@
+"""
+Benchmark for the batched XIRR solver
+
+Solves XIRR for a synthetic book of investments with SIP-style ledgers in one
+call, checks the rates against a per-investment scalar solve, and checks that
+both the cold solve and a warm-started re-solve (as after one new transaction
+per investment) stay within the time budget.
+
+Usage:
+    python benchmark_xirr.py
+"""
+import sys
+import time
+import numpy as np
+from scipy.optimize import brentq
+from services.xirr_solver import XirrSolver
+
+NUM_INVESTMENTS = 5000
+MAX_SECONDS = 1.0
+TODAY = 739000
+
+
+def synthetic_ledger(num_investments, seed=7):
+    """SIP/buy outflows over up to ten years plus the current value today"""
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(2, 60, num_investments)
+    group_index = np.repeat(np.arange(num_investments), counts)
+    day_numbers = TODAY - rng.integers(30, 3650, group_index.size)
+    amounts = -rng.uniform(1_000, 50_000, group_index.size)
+
+    # Current value: money in, grown by a random annual return
+    annual_returns = rng.uniform(-0.2, 0.35, num_investments)
+    years_held = (TODAY - day_numbers) / 365
+    grown = -amounts * (1 + annual_returns[group_index]) ** years_held
+    current_values = np.bincount(group_index, weights=grown, minlength=num_investments)
+
+    return (
+        np.concatenate([amounts, current_values]),
+        np.concatenate([day_numbers, np.full(num_investments, TODAY)]),
+        np.concatenate([group_index, np.arange(num_investments)]),
+        annual_returns
+    )
+
+
+def scalar_xirr(amounts, day_numbers):
+    """Reference solve of a single series"""
+    times = (day_numbers - day_numbers.min()) / 365
+    return brentq(lambda rate: np.sum(amounts * (1 + rate) ** -times), -0.99, 10, xtol=1e-12)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    amounts, day_numbers, group_index, annual_returns = synthetic_ledger(NUM_INVESTMENTS)
+
+    rates, cold_time = timed(XirrSolver.solve, amounts, day_numbers, group_index, NUM_INVESTMENTS)
+
+    # One more SIP instalment per investment, re-solved from the stored rates
+    new_amounts = np.concatenate([amounts, np.full(NUM_INVESTMENTS, -5_000.0)])
+    new_days = np.concatenate([day_numbers, np.full(NUM_INVESTMENTS, TODAY - 1)])
+    new_index = np.concatenate([group_index, np.arange(NUM_INVESTMENTS)])
+    _, warm_time = timed(XirrSolver.solve, new_amounts, new_days, new_index, NUM_INVESTMENTS, rates)
+
+    print(f"Investments: {NUM_INVESTMENTS}, cash flows: {amounts.size}")
+    print(f"Cold solve: {cold_time:.4f}s")
+    print(f"Warm-started re-solve: {warm_time:.4f}s")
+
+    # The synthetic ledgers are built so that each XIRR equals its annual return
+    max_error = np.max(np.abs(rates - annual_returns))
+    sample = np.random.default_rng(0).choice(NUM_INVESTMENTS, 50, replace=False)
+    scalar_error = max(
+        abs(rates[g] - scalar_xirr(amounts[group_index == g], day_numbers[group_index == g]))
+        for g in sample
+    )
+    print(f"Max error vs constructed returns: {max_error:.2e}, vs scalar solves: {scalar_error:.2e}")
+
+    if np.isnan(rates).any() or max_error > 1e-8 or scalar_error > 1e-8:
+        print("✗ Batched XIRR does not match the reference")
+        return 1
+    if cold_time > MAX_SECONDS or warm_time > MAX_SECONDS:
+        print(f"✗ Solve slower than {MAX_SECONDS}s")
+        return 1
+
+    print("✓ Rates match and time budget met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Query plan regression check for the service hot paths
+
+Builds a scratch SQLite database with the baseline schema - the models'
+tables without the columns and indexes that migrations add - and upgrades it
+with the migrations, so that the indexes checked are the ones the migrations
+create, not ones create_all would have made. It then asserts that every
+column and index the models declare exists, runs each hot service method
+while capturing the SQL it sends, and asks SQLite for the plan of every
+captured SELECT. The check fails if any plan reads a whole table (a SCAN of a
+table rather than an index SEARCH), which is what a missing or unusable index
+looks like.
+
+The database is small and not ANALYZEd, so SQLite plans as it would for large
+tables of unknown distribution, i.e. it uses an index whenever one applies.
+
+Usage:
+    python check_query_plans.py
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+# The services import the app's database module, which needs settings; the
+# check itself only uses its own scratch database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "query-plan-check")
+
+from sqlalchemy import Column, ForeignKey, MetaData, Table, create_engine, event, inspect
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from migrations import upgrade
+from models import (
+    User, FamilyMember, RelationEnum, Portfolio, AssetClass, Investment, InvestmentTransaction,
+    TransactionTypeEnum, Goal, HorizonEnum, GoalInvestmentMapping, GoalHistory, GoalSimulationHistory
+)
+from services.asset_assumptions import AssetAssumptions
+from services.goal_service import GoalService
+from services.portfolio_service import PortfolioService
+
+USER_ID = 1
+
+# Lookup tables small enough that reading them whole is expected
+SMALL_TABLES = {"asset_classes"}
+
+SCAN_PATTERN = re.compile(r"^SCAN (\w+)")
+
+# Columns that migrations add to the baseline tables
+MIGRATED_COLUMNS = {
+    ("goal_simulation_history", "seed"),
+    ("goal_simulation_history", "num_simulations"),
+    ("investments", "xirr"),
+    ("investments", "xirr_updated_at"),
+    ("investments", "last_priced_at"),
+}
+
+
+def baseline_metadata():
+    """
+    The model tables as the first deployments created them
+
+    Migrated columns are left out, and the only indexes are those on primary
+    keys and unique columns; every other index has to come from a migration.
+    """
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        columns = [
+            Column(
+                column.name, column.type,
+                *[ForeignKey(foreign_key.target_fullname) for foreign_key in column.foreign_keys],
+                primary_key=column.primary_key,
+                nullable=column.nullable,
+                unique=column.unique,
+                index=bool(column.index) and (column.primary_key or bool(column.unique)),
+                autoincrement=column.autoincrement,
+                server_default=column.server_default.arg if column.server_default is not None else None
+            )
+            for column in table.columns
+            if (table.name, column.name) not in MIGRATED_COLUMNS
+        ]
+        Table(table.name, metadata, *columns)
+    return metadata
+
+
+def index_columns(index):
+    """Column names of a model Index, including descending ones (desc('name') wraps a textual reference)"""
+    names = []
+    for expression in index.expressions:
+        while not hasattr(expression, 'name') and hasattr(expression, 'element'):
+            expression = expression.element
+        names.append(expression if isinstance(expression, str) else expression.name)
+    return names
+
+
+def missing_schema(engine):
+    """
+    Model columns and indexes absent from the database
+
+    An index counts as present if one exists whose leading columns are the
+    declared ones, the same rule create_index_if_missing applies.
+    """
+    inspector = inspect(engine)
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        columns = {column['name'] for column in inspector.get_columns(table.name)}
+        missing += [f"column {table.name}.{column.name}" for column in table.columns if column.name not in columns]
+
+        existing = [index['column_names'] for index in inspector.get_indexes(table.name)]
+        for index in table.indexes:
+            wanted = index_columns(index)
+            if not any(list(names[:len(wanted)]) == wanted for names in existing):
+                missing.append(f"index {index.name} on {table.name}({', '.join(wanted)})")
+    return missing
+
+
+def seed(session):
+    """A family with a few members, holdings with SIP ledgers, goals and their history"""
+    session.add(User(user_id=USER_ID, email="plans@example.com", password_hash="x"))
+    for asset_class_id, name in enumerate(AssetAssumptions.ASSET_CLASSES, start=1):
+        session.add(AssetClass(asset_class_id=asset_class_id, name=name))
+
+    investment_id = 0
+    for member_id in range(1, 4):
+        session.add(FamilyMember(member_id=member_id, user_id=USER_ID, name=f"Member {member_id}",
+                                 relation=RelationEnum.self))
+        session.add(Portfolio(portfolio_id=member_id, member_id=member_id, portfolio_name=f"Portfolio {member_id}"))
+
+        for asset_class_id in range(1, len(AssetAssumptions.ASSET_CLASSES) + 1):
+            investment_id += 1
+            session.add(Investment(
+                investment_id=investment_id, portfolio_id=member_id, member_id=member_id,
+                asset_class_id=asset_class_id, name=f"Holding {investment_id}", symbol=f"H{investment_id}",
+                invested_value=Decimal(12000), current_value=Decimal(12000 + 500 * investment_id),
+                units=Decimal(100)
+            ))
+            for month in range(12):
+                session.add(InvestmentTransaction(
+                    investment_id=investment_id, date=date(2024, 1, 1) + timedelta(days=30 * month),
+                    type=TransactionTypeEnum.sip, units=Decimal(8), price_per_unit=Decimal(125),
+                    amount=Decimal(1000)
+                ))
+
+    for goal_id in range(1, 4):
+        session.add(Goal(
+            goal_id=goal_id, created_by_user_id=USER_ID, beneficiary_member_id=goal_id,
+            goal_name=f"Goal {goal_id}", target_amount=Decimal(2000000), years_until_due=5 + goal_id,
+            horizon=HorizonEnum.long, expected_return=Decimal(10), volatility=Decimal(12)
+        ))
+        for offset in range(3):
+            session.add(GoalInvestmentMapping(goal_id=goal_id, investment_id=goal_id + 9 * offset,
+                                              allocation_percentage=Decimal(50)))
+            session.add(GoalHistory(goal_id=goal_id, snapshot_date=date(2024, 1 + offset, 1),
+                                    current_allocation=Decimal(10000), success_probability=Decimal(60)))
+            session.add(GoalSimulationHistory(goal_id=goal_id, run_timestamp=datetime(2024, 1 + offset, 1),
+                                              success_probability=Decimal(60 + offset)))
+
+    session.commit()
+
+
+def hot_queries():
+    """(label, function of a session) for every service method on a hot path"""
+    def next_cursor(page):
+        return page['next_cursor']
+
+    return [
+        ("goals summary", lambda db: GoalService(db).get_all_goals_summary(USER_ID)),
+        ("goal details", lambda db: GoalService(db).get_goal_with_details(1)),
+        ("goal history", lambda db: GoalService(db).get_goal_history(1)),
+        ("goal asset weights", lambda db: GoalService(db).get_goal_asset_weights(1)),
+        ("portfolio totals", lambda db: PortfolioService(db).get_total_portfolio_value(USER_ID)),
+        ("asset allocation", lambda db: PortfolioService(db).get_asset_allocation(USER_ID)),
+        ("member allocation", lambda db: PortfolioService(db).get_member_wise_allocation(USER_ID)),
+        ("investment details", lambda db: PortfolioService(db).get_investment_detailed(USER_ID, 5)),
+        ("investments page", lambda db: PortfolioService(db).get_investments_page(
+            USER_ID, limit=5, cursor=next_cursor(PortfolioService(db).get_investments_page(USER_ID, limit=5))
+        )),
+        ("filtered investments page", lambda db: PortfolioService(db).get_investments_page(
+            USER_ID, limit=5, sort='gain_loss_percentage', descending=True, member_id=2, asset_class_id=3
+        )),
+        ("transactions page", lambda db: PortfolioService(db).get_investment_transactions_page(
+            5, limit=5, cursor=next_cursor(PortfolioService(db).get_investment_transactions_page(5, limit=5))
+        )),
+        ("performers", lambda db: PortfolioService(db).get_performers(USER_ID, 5)),
+        ("xirr", lambda db: PortfolioService(db).calculate_xirr(USER_ID, 'member')),
+    ]
+
+
+def full_scans(conn, statement, parameters):
+    """Tables read whole by the plan of a statement"""
+    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    scans = []
+    for row in plan:
+        match = SCAN_PATTERN.match(row[-1])
+        if match and match.group(1) in Base.metadata.tables and match.group(1) not in SMALL_TABLES:
+            scans.append(row[-1])
+    return scans
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'plans.db')}")
+        baseline = baseline_metadata()
+        baseline.create_all(engine)
+
+        baseline_missing = len(missing_schema(engine))
+        upgrade(engine)
+        missing = missing_schema(engine)
+        if missing:
+            print(f"✗ Schema after migrations lacks: {'; '.join(missing)}")
+            engine.dispose()
+            return 1
+        print(f"✓ Migrations created all {baseline_missing} columns and indexes missing from the baseline schema")
+
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            seed(session)
+
+        captured = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                captured.append((statement, parameters))
+
+        failures = 0
+        for label, run in hot_queries():
+            captured.clear()
+            with Session() as session:
+                run(session)
+            statements = list(captured)
+
+            with engine.connect() as conn:
+                problems = [scan for statement, parameters in statements
+                            for scan in full_scans(conn, statement, parameters)]
+
+            if problems:
+                failures += 1
+                print(f"✗ {label}: {'; '.join(problems)}")
+            else:
+                print(f"✓ {label} ({len(statements)} queries)")
+
+        engine.dispose()
+
+    if failures:
+        print(f"✗ {failures} hot paths read whole tables")
+        return 1
+
+    print("✓ No full table scans on hot paths")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
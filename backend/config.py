@@ -1,11 +1,35 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     database_url: str
+    async_database_url: Optional[str] = None  # Defaults to database_url with its async driver
+    read_replica_url: Optional[str] = None  # Read-only routes use this database when set
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: int = 30
+    db_pool_recycle_seconds: int = 1800  # Replace connections before MySQL's wait_timeout drops them
+    db_pool_pre_ping: bool = False  # Ping on every checkout; costs a round-trip, recycling usually suffices
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    simulation_cache_size: int = 1024
+    simulation_cache_ttl_seconds: int = 3600
+    quote_fetch_workers: int = 16  # Threads shared by batch quote fetches
+    quote_batch_timeout_seconds: float = 10  # Deadline for a whole batch; slower symbols are left out
+    quote_cache_size: int = 4096
+    quote_cache_index_ttl_seconds: float = 5
+    quote_cache_stock_ttl_seconds: float = 30
+    quote_cache_nav_ttl_seconds: float = 21600  # NAVs are published once a day
+    market_blocking_workers: int = 8  # Threads for blocking provider calls of async routes
+    market_http_max_connections: int = 20
+    market_http_timeout_seconds: float = 5
+    price_refresh_enabled: bool = True
+    price_refresh_interval_seconds: float = 300
+    price_refresh_batch_size: int = 50  # Symbols per bulk quote download
+    price_history_dir: str = "data/price_history"
+    price_history_years: int = 5  # Depth of the first backfill of an instrument
     
     class Config:
         env_file = ".env"
@@ -1,12 +1,81 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import get_settings
+from pool_metrics import pool_metrics, TimedQueuePool, TimedAsyncAdaptedQueuePool
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+# Async drivers for the sync drivers DATABASE_URL may name
+ASYNC_DRIVERS = {
+    'mysql': 'mysql+aiomysql',
+    'mysql+pymysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite'
+}
+
+def async_database_url(url: str) -> str:
+    """
+    URL of the same database for an async driver (e.g. mysql+pymysql -> mysql+aiomysql)
+    """
+    parsed = make_url(url)
+    if parsed.drivername not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.drivername]).render_as_string(hide_password=False)
+
+def pool_options(url: str, is_async: bool = False) -> dict:
+    """
+    Engine keyword arguments for the configured connection pool
+
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool, which
+    the queue pool settings do not apply to.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == 'sqlite' and parsed.database in (None, '', ':memory:'):
+        return {}
+    return {
+        'poolclass': TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        'pool_size': settings.db_pool_size,
+        'max_overflow': settings.db_max_overflow,
+        'pool_timeout': settings.db_pool_timeout_seconds,
+        'pool_recycle': settings.db_pool_recycle_seconds,
+        'pool_pre_ping': settings.db_pool_pre_ping
+    }
+
+def _create_engine(url: str):
+    return create_engine(url, **pool_options(url))
+
+def _create_async_engine(url: str):
+    return create_async_engine(url, **pool_options(url, is_async=True))
+
+# Writes (and reads that must see them) go to the primary; read-only routes use
+# the read replica when one is configured, otherwise the primary as well
+engine = _create_engine(settings.database_url)
+read_engine = _create_engine(settings.read_replica_url) if settings.read_replica_url else engine
+
+async_engine = _create_async_engine(settings.async_database_url or async_database_url(settings.database_url))
+async_read_engine = (
+    _create_async_engine(async_database_url(settings.read_replica_url))
+    if settings.read_replica_url else async_engine
+)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Objects stay usable after commit without a refresh, which would need another await
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+pool_metrics.register('primary', engine)
+pool_metrics.register('replica', read_engine)
+pool_metrics.register('async_primary', async_engine.sync_engine)
+pool_metrics.register('async_replica', async_read_engine.sync_engine)
 
 Base = declarative_base()
 
@@ -16,3 +85,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """Session for read-only routes, from the read replica if configured"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """Async session for read-only routes, from the read replica if configured"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
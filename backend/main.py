@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routes import auth, dashboard, goals, portfolio, family, market
+from config import get_settings
+from pool_metrics import pool_metrics
+from services.market_data_service import close_http_client
+from services.price_refresher import price_refresher
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if get_settings().price_refresh_enabled:
+        price_refresher.start()
+    yield
+    price_refresher.stop(timeout=5)
+    # Close the pooled market data HTTP connections
+    await close_http_client()
 
 app = FastAPI(
     title="Family Wealth Planner API",
     description="API for managing family investments, portfolios, and financial goals",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware configuration - Must be added before routers
@@ -15,6 +30,7 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Pagination cursor of list endpoints
 )
 
 # Include routers
@@ -37,6 +53,11 @@ def root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db-pool")
+def db_pool_metrics():
+    """Connection pool usage and checkout waits per database engine"""
+    return pool_metrics.snapshot()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,37 @@
+"""
+Apply pending schema migrations to the configured database
+
+Usage:
+    python migrate.py             # apply all pending migrations
+    python migrate.py --to 2      # apply pending migrations up to version 2
+    python migrate.py --status    # list migrations and whether they are applied
+"""
+import argparse
+import sys
+from database import engine
+from migrations import applied_versions, load_migrations, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--to", type=int, default=None, help="Last version to apply")
+    parser.add_argument("--status", action="store_true", help="Only show which migrations are applied")
+    args = parser.parse_args()
+
+    if args.status:
+        applied = applied_versions(engine)
+        for module in load_migrations():
+            mark = "✓" if module.VERSION in applied else " "
+            print(f"[{mark}] {module.VERSION:04d} {module.DESCRIPTION}")
+        return 0
+
+    migrated = upgrade(engine, args.to)
+    for module in migrated:
+        print(f"✓ Applied {module.VERSION:04d} {module.DESCRIPTION}")
+    if not migrated:
+        print("✓ Database is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
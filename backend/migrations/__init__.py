@@ -0,0 +1,98 @@
+"""
+Versioned schema migrations
+
+Each module in migrations/versions defines VERSION (a positive integer, the
+order of application), DESCRIPTION and upgrade(conn). Applied versions are
+recorded in the schema_migrations table, and upgrade() applies the pending ones
+in order, each in its own transaction.
+
+Migrations only use the idempotent helpers in migrations.operations, so they
+can be run against databases imported from the SQL dumps, created with
+Base.metadata.create_all, or partly migrated by hand. MySQL commits DDL
+implicitly, so a migration interrupted halfway is completed by running it again.
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+from types import ModuleType
+from typing import List, Optional, Set
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.engine import Engine
+
+migrations_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migrations_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False)
+)
+
+
+def load_migrations() -> List[ModuleType]:
+    """
+    Import all migration modules, ordered by VERSION
+
+    Raises:
+        ValueError: If two migrations share a version
+    """
+    from migrations import versions
+
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    modules.sort(key=lambda module: module.VERSION)
+
+    seen = [module.VERSION for module in modules]
+    if len(seen) != len(set(seen)):
+        raise ValueError(f"Duplicate migration versions: {seen}")
+
+    return modules
+
+
+def applied_versions(engine: Engine) -> Set[int]:
+    """
+    Versions already applied to the database
+    """
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine: Engine, target: Optional[int] = None) -> List[ModuleType]:
+    """
+    Migrations not yet applied, up to and including the target version (all if None)
+    """
+    applied = applied_versions(engine)
+    return [
+        module for module in load_migrations()
+        if module.VERSION not in applied and (target is None or module.VERSION <= target)
+    ]
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[ModuleType]:
+    """
+    Apply pending migrations in version order
+
+    Args:
+        engine: Database to migrate
+        target: Last version to apply; None for all
+
+    Returns:
+        The migrations applied
+    """
+    applied = []
+
+    for module in pending_migrations(engine, target):
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=module.VERSION,
+                description=module.DESCRIPTION,
+                applied_at=datetime.utcnow()
+            ))
+        applied.append(module)
+
+    return applied
@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Index, MetaData, Table, inspect, text
+from sqlalchemy.engine import Connection
+from typing import Sequence
+
+
+def add_column_if_missing(conn: Connection, table_name: str, column: Column) -> bool:
+    """
+    Add a nullable column to a table unless it already exists
+
+    Returns:
+        True if the column was added
+    """
+    existing = {c['name'] for c in inspect(conn).get_columns(table_name)}
+    if column.name in existing:
+        return False
+
+    preparer = conn.dialect.identifier_preparer
+    conn.execute(text(
+        f"ALTER TABLE {preparer.quote(table_name)} "
+        f"ADD COLUMN {preparer.quote(column.name)} {column.type.compile(dialect=conn.dialect)}"
+    ))
+    return True
+
+
+def create_index_if_missing(
+    conn: Connection,
+    table_name: str,
+    index_name: str,
+    columns: Sequence[str],
+    descending: Sequence[str] = ()
+) -> bool:
+    """
+    Create an index unless one with this name, or one leading with these columns, exists
+
+    An existing index whose first columns are the requested ones serves the same
+    lookups, so e.g. a MySQL foreign key index under another name is not duplicated.
+
+    Args:
+        columns: Indexed columns, in order
+        descending: Columns among them to index in descending order
+
+    Returns:
+        True if the index was created
+    """
+    columns = list(columns)
+    for index in inspect(conn).get_indexes(table_name):
+        if index['name'] == index_name or list(index['column_names'][:len(columns)]) == columns:
+            return False
+
+    table = Table(table_name, MetaData(), autoload_with=conn)
+    Index(
+        index_name,
+        *[table.c[name].desc() if name in descending else table.c[name] for name in columns]
+    ).create(conn)
+    return True
@@ -0,0 +1,10 @@
+from sqlalchemy import BigInteger, Column, Integer
+from migrations.operations import add_column_if_missing
+
+VERSION = 1
+DESCRIPTION = "Seed and path count of each goal simulation run"
+
+
+def upgrade(conn):
+    add_column_if_missing(conn, "goal_simulation_history", Column("seed", BigInteger))
+    add_column_if_missing(conn, "goal_simulation_history", Column("num_simulations", Integer))
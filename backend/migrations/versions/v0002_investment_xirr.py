@@ -0,0 +1,10 @@
+from sqlalchemy import DECIMAL, Column, DateTime
+from migrations.operations import add_column_if_missing
+
+VERSION = 2
+DESCRIPTION = "Stored XIRR per investment"
+
+
+def upgrade(conn):
+    add_column_if_missing(conn, "investments", Column("xirr", DECIMAL(10, 4)))
+    add_column_if_missing(conn, "investments", Column("xirr_updated_at", DateTime))
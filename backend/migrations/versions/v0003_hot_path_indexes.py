@@ -0,0 +1,38 @@
+from migrations.operations import create_index_if_missing
+
+VERSION = 3
+DESCRIPTION = "Composite indexes for per-goal, per-investment and per-member lookups"
+
+# (table, index name, columns, descending columns)
+COMPOSITE_INDEXES = [
+    ("goal_simulation_history", "ix_goal_simulation_history_goal_id_run_timestamp",
+     ["goal_id", "run_timestamp"], ["run_timestamp"]),
+    ("investment_transactions", "ix_investment_transactions_investment_id_date",
+     ["investment_id", "date"], []),
+    ("goal_investment_mapping", "ix_goal_investment_mapping_goal_id_investment_id",
+     ["goal_id", "investment_id"], []),
+    ("goal_history", "ix_goal_history_goal_id_snapshot_date",
+     ["goal_id", "snapshot_date"], []),
+    ("investments", "ix_investments_member_id_asset_class_id",
+     ["member_id", "asset_class_id"], []),
+]
+
+# Foreign key columns not leading any composite index. MySQL indexes these
+# already; databases created with create_all before they were declared do not.
+FOREIGN_KEY_INDEXES = [
+    ("family_members", "user_id"),
+    ("portfolios", "member_id"),
+    ("investments", "portfolio_id"),
+    ("investments", "asset_class_id"),
+    ("goals", "created_by_user_id"),
+    ("goals", "beneficiary_member_id"),
+    ("goal_investment_mapping", "investment_id"),
+]
+
+
+def upgrade(conn):
+    for table_name, index_name, columns, descending in COMPOSITE_INDEXES:
+        create_index_if_missing(conn, table_name, index_name, columns, descending)
+
+    for table_name, column in FOREIGN_KEY_INDEXES:
+        create_index_if_missing(conn, table_name, f"ix_{table_name}_{column}", [column])
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, DateTime
+from migrations.operations import add_column_if_missing
+
+VERSION = 4
+DESCRIPTION = "Last market pricing time per investment"
+
+
+def upgrade(conn):
+    add_column_if_missing(conn, "investments", Column("last_priced_at", DateTime))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, Date, DateTime, ForeignKey, Enum as SQLEnum, TIMESTAMP
+from sqlalchemy import Column, Integer, BigInteger, String, DECIMAL, Date, DateTime, ForeignKey, Enum as SQLEnum, TIMESTAMP, Index, desc
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -33,7 +33,7 @@ class FamilyMember(Base):
     __tablename__ = "family_members"
     
     member_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     relation = Column(SQLEnum(RelationEnum), nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
@@ -49,7 +49,7 @@ class Portfolio(Base):
     __tablename__ = "portfolios"
     
     portfolio_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    member_id = Column(Integer, ForeignKey("family_members.member_id"), nullable=False)
+    member_id = Column(Integer, ForeignKey("family_members.member_id"), nullable=False, index=True)
     portfolio_name = Column(String(255), nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     
@@ -72,9 +72,9 @@ class Investment(Base):
     __tablename__ = "investments"
     
     investment_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    portfolio_id = Column(Integer, ForeignKey("portfolios.portfolio_id"), nullable=False)
+    portfolio_id = Column(Integer, ForeignKey("portfolios.portfolio_id"), nullable=False, index=True)
     member_id = Column(Integer, ForeignKey("family_members.member_id"), nullable=False)
-    asset_class_id = Column(Integer, ForeignKey("asset_classes.asset_class_id"), nullable=False)
+    asset_class_id = Column(Integer, ForeignKey("asset_classes.asset_class_id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     symbol = Column(String(100))
     folio_number = Column(String(100))
@@ -82,6 +82,13 @@ class Investment(Base):
     current_value = Column(DECIMAL(15, 2))
     units = Column(DECIMAL(15, 4))
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+    xirr = Column(DECIMAL(10, 4))  # Annualized money-weighted return, in percent
+    xirr_updated_at = Column(DateTime)
+    last_priced_at = Column(DateTime)  # When current_value was last set from a market quote
+    
+    __table_args__ = (
+        Index('ix_investments_member_id_asset_class_id', 'member_id', 'asset_class_id'),
+    )
     
     # Relationships
     portfolio = relationship("Portfolio", back_populates="investments")
@@ -112,6 +119,10 @@ class InvestmentTransaction(Base):
     amount = Column(DECIMAL(15, 2))
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     
+    __table_args__ = (
+        Index('ix_investment_transactions_investment_id_date', 'investment_id', 'date'),
+    )
+    
     # Relationships
     investment = relationship("Investment", back_populates="transactions")
 
@@ -127,8 +138,8 @@ class Goal(Base):
     __tablename__ = "goals"
     
     goal_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    created_by_user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
-    beneficiary_member_id = Column(Integer, ForeignKey("family_members.member_id"), nullable=False)
+    created_by_user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False, index=True)
+    beneficiary_member_id = Column(Integer, ForeignKey("family_members.member_id"), nullable=False, index=True)
     goal_name = Column(String(255), nullable=False)
     target_amount = Column(DECIMAL(15, 2), nullable=False)
     years_until_due = Column(Integer, nullable=False)
@@ -150,9 +161,13 @@ class GoalInvestmentMapping(Base):
     
     map_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     goal_id = Column(Integer, ForeignKey("goals.goal_id"), nullable=False)
-    investment_id = Column(Integer, ForeignKey("investments.investment_id"), nullable=False)
+    investment_id = Column(Integer, ForeignKey("investments.investment_id"), nullable=False, index=True)
     allocation_percentage = Column(DECIMAL(5, 2))
     
+    __table_args__ = (
+        Index('ix_goal_investment_mapping_goal_id_investment_id', 'goal_id', 'investment_id'),
+    )
+    
     # Relationships
     goal = relationship("Goal", back_populates="investment_mappings")
     investment = relationship("Investment", back_populates="goal_mappings")
@@ -168,6 +183,10 @@ class GoalHistory(Base):
     required_pv = Column(DECIMAL(15, 2))
     success_probability = Column(DECIMAL(5, 2))
     
+    __table_args__ = (
+        Index('ix_goal_history_goal_id_snapshot_date', 'goal_id', 'snapshot_date'),
+    )
+    
     # Relationships
     goal = relationship("Goal", back_populates="history")
 
@@ -182,6 +201,13 @@ class GoalSimulationHistory(Base):
     worst_case = Column(DECIMAL(15, 2))
     best_case = Column(DECIMAL(15, 2))
     success_probability = Column(DECIMAL(5, 2))
+    seed = Column(BigInteger)
+    num_simulations = Column(Integer)
+    
+    # Latest run per goal is read newest first
+    __table_args__ = (
+        Index('ix_goal_simulation_history_goal_id_run_timestamp', 'goal_id', desc('run_timestamp')),
+    )
     
     # Relationships
     goal = relationship("Goal", back_populates="simulation_history")
@@ -0,0 +1,112 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Dict
+
+
+class PoolStats:
+    """
+    Checkout counters of one connection pool
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, wait_seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': round(self.total_wait_seconds / attempts * 1000, 3) if attempts else 0.0,
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 3)
+            }
+
+
+class _CheckoutTimingMixin:
+    """
+    Times how long each checkout waits for a connection (including opening a new one)
+    """
+
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() replaces the pool; the counters carry over
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class PoolMetrics:
+    """
+    Registry of the application's engines for pool usage and checkout wait metrics
+    """
+
+    def __init__(self):
+        self._engines = {}
+
+    def register(self, name: str, engine) -> None:
+        """
+        Track an engine under a name; engines sharing a pool are reported once
+        """
+        pool = engine.pool
+        if not any(existing.pool is pool for existing in self._engines.values()):
+            if not hasattr(pool, 'stats'):
+                pool.stats = PoolStats()
+            self._engines[name] = engine
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Current usage and cumulative checkout waits per engine
+        """
+        result = {}
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            entry = {'pool': type(pool).__name__}
+            if isinstance(pool, QueuePool):
+                entry.update({
+                    'size': pool.size(),
+                    'checked_out': pool.checkedout(),
+                    'idle': pool.checkedin(),
+                    'overflow': max(pool.overflow(), 0)
+                })
+            if isinstance(pool, _CheckoutTimingMixin):
+                entry.update(pool.stats.as_dict())
+            result[name] = entry
+        return result
+
+
+# Shared by database.py and the metrics endpoint
+pool_metrics = PoolMetrics()
@@ -1,17 +1,19 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from database import get_db
+from database import get_async_read_db
 from auth import get_current_user
 from models import User
-from services.portfolio_service import PortfolioService
-from services.goal_service import GoalService
+from services.portfolio_service import AsyncPortfolioService
+from services.goal_service import AsyncGoalService
+from services.request_context import RequestContext, get_async_request_context
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 @router.get("/summary")
-def get_dashboard_summary(
-    db: Session = Depends(get_db)
+async def get_dashboard_summary(
+    db: AsyncSession = Depends(get_async_read_db),
+    context: RequestContext = Depends(get_async_request_context)
 ):
     """
     Get dashboard summary including:
@@ -20,18 +22,19 @@ def get_dashboard_summary(
     - Goal status counts
     - Recent performance
     """
-    portfolio_service = PortfolioService(db)
-    goal_service = GoalService(db)
+    # Both services share one request context, so each fact is loaded once
+    portfolio_service = AsyncPortfolioService(db, context)
+    goal_service = AsyncGoalService(db, context)
     
     # Use first user for demo (user_id = 1)
     user_id = 1
     
     # Get portfolio metrics
-    portfolio_metrics = portfolio_service.get_total_portfolio_value(user_id)
-    daily_change = portfolio_service.calculate_daily_change(user_id)
+    portfolio_metrics = await portfolio_service.get_total_portfolio_value(user_id)
+    daily_change = await portfolio_service.calculate_daily_change(user_id)
     
     # Get all goals and count statuses
-    goals = goal_service.get_all_goals_summary(user_id)
+    goals = await goal_service.get_all_goals_summary(user_id)
     
     status_counts = {
         'green': 0,
@@ -59,39 +62,49 @@ def get_dashboard_summary(
     }
 
 @router.get("/asset-allocation")
-def get_asset_allocation(
-    db: Session = Depends(get_db)
+async def get_asset_allocation(
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get asset class wise allocation breakdown"""
     user_id = 1
-    portfolio_service = PortfolioService(db)
-    return portfolio_service.get_asset_allocation(user_id)
+    portfolio_service = AsyncPortfolioService(db)
+    return await portfolio_service.get_asset_allocation(user_id)
 
 @router.get("/member-allocation")
-def get_member_allocation(
-    db: Session = Depends(get_db)
+async def get_member_allocation(
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get member-wise portfolio breakdown"""
     user_id = 1
-    portfolio_service = PortfolioService(db)
-    return portfolio_service.get_member_wise_allocation(user_id)
+    portfolio_service = AsyncPortfolioService(db)
+    return await portfolio_service.get_member_wise_allocation(user_id)
+
+@router.get("/performers")
+async def get_performers(
+    limit: int = 5,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get top and worst performing investments together"""
+    user_id = 1
+    portfolio_service = AsyncPortfolioService(db)
+    return await portfolio_service.get_performers(user_id, limit)
 
 @router.get("/top-performers")
-def get_top_performers(
+async def get_top_performers(
     limit: int = 5,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get top performing investments"""
     user_id = 1
-    portfolio_service = PortfolioService(db)
-    return portfolio_service.get_top_performers(user_id, limit)
+    portfolio_service = AsyncPortfolioService(db)
+    return await portfolio_service.get_top_performers(user_id, limit)
 
 @router.get("/worst-performers")
-def get_worst_performers(
+async def get_worst_performers(
     limit: int = 5,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get worst performing investments"""
     user_id = 1
-    portfolio_service = PortfolioService(db)
-    return portfolio_service.get_worst_performers(user_id, limit)
+    portfolio_service = AsyncPortfolioService(db)
+    return await portfolio_service.get_worst_performers(user_id, limit)
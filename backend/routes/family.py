@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
-from database import get_db
+from database import get_db, get_read_db
 from auth import get_current_user
 from models import User, FamilyMember, Portfolio
 from schemas import FamilyMemberCreate, FamilyMemberResponse, PortfolioCreate, PortfolioResponse
@@ -10,7 +10,7 @@ router = APIRouter(prefix="/api/family", tags=["family"])
 
 @router.get("/members", response_model=List[FamilyMemberResponse])
 def get_family_members(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all family members for the current user"""
     user_id = 1  # Demo mode
@@ -42,7 +42,7 @@ def create_family_member(
 @router.get("/members/{member_id}", response_model=FamilyMemberResponse)
 def get_family_member(
     member_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get details of a specific family member"""
     user_id = 1  # Demo mode
@@ -111,7 +111,7 @@ def delete_family_member(
 
 @router.get("/portfolios", response_model=List[PortfolioResponse])
 def get_portfolios(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all portfolios for the user's family"""
     user_id = 1  # Demo mode
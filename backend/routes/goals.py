@@ -1,33 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from database import get_db
+from database import get_db, get_read_db, get_async_read_db
 from auth import get_current_user
 from models import User, Goal
-from schemas import GoalCreate, GoalResponse, GoalWithCalculations, SimulationRequest, GoalSimulationResponse, GoalHistoryResponse
-from services.goal_service import GoalService
+from schemas import GoalCreate, GoalResponse, GoalWithCalculations, SimulationRequest, GoalSimulationResponse, GoalHistoryResponse, GoalProjectionResponse, RescueStrategyRequest, ContributionSolveRequest, ContributionSolveResponse, HouseholdSimulationRequest, HouseholdSimulationResponse
+from services.goal_service import GoalService, AsyncGoalService
+from services.simulation_cache import simulation_cache
+from services.simulation_engine import SimulationEngine
 from decimal import Decimal
+import math
 
 router = APIRouter(prefix="/api/goals", tags=["goals"])
 
+# Upper bound on profiles (including expanded grid points) per rescue evaluation
+MAX_RESCUE_PROFILES = 500
+
 @router.get("/", response_model=List[GoalWithCalculations])
-def get_all_goals(
+async def get_all_goals(
     user_id: int = 1,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all goals for the current user with calculated metrics"""
+    goal_service = AsyncGoalService(db)
+    return await goal_service.get_all_goals_summary(user_id)
+
+@router.get("/simulation-cache/stats")
+def get_simulation_cache_stats():
+    """Get simulation cache size and hit/miss counters"""
+    return simulation_cache.stats()
+
+@router.post("/household/simulate", response_model=HouseholdSimulationResponse)
+def run_household_simulation(
+    simulation_request: HouseholdSimulationRequest,
+    user_id: int = 1,
+    db: Session = Depends(get_db)
+):
+    """Simulate all goals of the current user together with shared market shocks"""
     goal_service = GoalService(db)
-    return goal_service.get_all_goals_summary(user_id)
+    return goal_service.run_household_simulation(
+        user_id,
+        num_simulations=simulation_request.num_simulations,
+        market_correlation=simulation_request.market_correlation,
+        seed=simulation_request.seed,
+        record_history=simulation_request.record_history
+    )
 
 @router.get("/{goal_id}", response_model=GoalWithCalculations)
-def get_goal_details(
+async def get_goal_details(
     goal_id: int,
     user_id: int = 1,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get detailed information about a specific goal"""
-    goal_service = GoalService(db)
-    goal = goal_service.get_goal_with_details(goal_id)
+    goal_service = AsyncGoalService(db)
+    goal = await goal_service.get_goal_with_details(goal_id)
     
     if not goal:
         raise HTTPException(
@@ -112,21 +140,21 @@ def delete_goal(
     return None
 
 @router.get("/{goal_id}/history", response_model=List[GoalHistoryResponse])
-def get_goal_history(
+async def get_goal_history(
     goal_id: int,
     user_id: int = 1,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get historical tracking data for a goal"""
-    goal = db.query(Goal).filter(Goal.goal_id == goal_id).first()
+    goal = await db.get(Goal, goal_id)
     if not goal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Goal not found"
         )
     
-    goal_service = GoalService(db)
-    return goal_service.get_goal_history(goal_id)
+    goal_service = AsyncGoalService(db)
+    return await goal_service.get_goal_history(goal_id)
 
 @router.post("/{goal_id}/simulate", response_model=GoalSimulationResponse)
 def run_simulation(
@@ -144,16 +172,95 @@ def run_simulation(
         )
     
     goal_service = GoalService(db)
-    return goal_service.run_goal_simulation(
+    try:
+        return goal_service.run_goal_simulation(
+            goal_id,
+            num_simulations=simulation_request.num_simulations,
+            seed=simulation_request.seed,
+            target_precision=simulation_request.target_precision,
+            sampling=simulation_request.sampling,
+            use_cache=simulation_request.use_cache,
+            record_cached=simulation_request.record_cached,
+            model=simulation_request.model,
+            rebalance=simulation_request.rebalance
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/{goal_id}/required-contribution", response_model=ContributionSolveResponse)
+def solve_required_contribution(
+    goal_id: int,
+    solve_request: ContributionSolveRequest,
+    user_id: int = 1,
+    db: Session = Depends(get_read_db)
+):
+    """Find the minimum monthly SIP or lump sum that reaches a target success probability"""
+    goal = db.query(Goal).filter(Goal.goal_id == goal_id).first()
+    if not goal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found"
+        )
+    
+    goal_service = GoalService(db)
+    return goal_service.solve_required_contribution(
+        goal_id,
+        target_probability=solve_request.target_probability,
+        solve_for=solve_request.solve_for,
+        monthly_sip=float(solve_request.monthly_sip),
+        num_simulations=solve_request.num_simulations,
+        seed=solve_request.seed
+    )
+
+@router.get("/{goal_id}/projection", response_model=GoalProjectionResponse)
+def get_goal_projection(
+    goal_id: int,
+    quantiles: str = "10,50,90",
+    num_paths: int = Query(1000, ge=1, le=SimulationEngine.MAX_PROJECTION_PATHS),
+    user_id: int = 1,
+    db: Session = Depends(get_read_db)
+):
+    """Get monthly percentile bands of projected goal value"""
+    goal = db.query(Goal).filter(Goal.goal_id == goal_id).first()
+    if not goal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found"
+        )
+    
+    try:
+        quantile_list = [float(q) for q in quantiles.split(",") if q.strip()]
+    except ValueError:
+        quantile_list = []
+    
+    # NaN fails every comparison, so check finiteness explicitly
+    if not quantile_list or any(not math.isfinite(q) or not 0 <= q <= 100 for q in quantile_list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Quantiles must be comma-separated percentiles between 0 and 100"
+        )
+    
+    if len(set(quantile_list)) > SimulationEngine.MAX_PROJECTION_QUANTILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {SimulationEngine.MAX_PROJECTION_QUANTILES} quantiles can be requested"
+        )
+    
+    goal_service = GoalService(db)
+    return goal_service.get_goal_projection(
         goal_id,
-        num_simulations=simulation_request.num_simulations
+        quantiles=quantile_list,
+        num_paths=num_paths
     )
 
 @router.get("/{goal_id}/rescue-strategies")
 def get_rescue_strategies(
     goal_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get rescue strategies for underperforming goals"""
     # Verify goal belongs to user
@@ -171,3 +278,40 @@ def get_rescue_strategies(
         'goal_id': goal_id,
         'strategies': strategies
     }
+
+@router.post("/{goal_id}/rescue-strategies")
+def evaluate_rescue_strategies(
+    goal_id: int,
+    strategy_request: RescueStrategyRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Evaluate a custom list or grid of strategy profiles on shared random scenarios"""
+    goal = db.query(Goal).filter(Goal.goal_id == goal_id).first()
+    if not goal or goal.created_by_user_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found"
+        )
+    
+    profiles = [profile.model_dump() for profile in strategy_request.profiles]
+    grid = strategy_request.grid
+    grid_size = len(grid.expected_returns) * len(grid.volatilities) * len(grid.monthly_sips or [None]) if grid else 0
+    
+    # Rejected before expansion so an oversized grid never gets built
+    if not 1 <= len(profiles) + grid_size <= MAX_RESCUE_PROFILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Provide between 1 and {MAX_RESCUE_PROFILES} strategy profiles"
+        )
+    
+    if grid:
+        profiles += GoalService.expand_strategy_grid(grid.expected_returns, grid.volatilities, grid.monthly_sips)
+    
+    goal_service = GoalService(db)
+    strategies = goal_service.generate_rescue_strategies(goal_id, profiles=profiles)
+    
+    return {
+        'goal_id': goal_id,
+        'strategies': strategies
+    }
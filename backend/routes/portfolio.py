@@ -1,43 +1,113 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from datetime import date
+from database import get_db, get_read_db, get_async_read_db
 from auth import get_current_user
-from models import User, Investment, InvestmentTransaction, Portfolio, AssetClass
-from schemas import InvestmentCreate, InvestmentResponse, InvestmentWithDetails, TransactionCreate, TransactionResponse
-from services.portfolio_service import PortfolioService
+from models import User, Investment, InvestmentTransaction, Portfolio, AssetClass, TransactionTypeEnum
+from schemas import InvestmentCreate, InvestmentResponse, InvestmentWithDetails, TransactionCreate, TransactionResponse, XirrResponse, XirrRefreshResponse
+from services.portfolio_service import PortfolioService, AsyncPortfolioService
+from services.pagination import KeysetPagination
 
 router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
 
 @router.get("/summary")
-def get_portfolio_summary(
-    db: Session = Depends(get_db)
+async def get_portfolio_summary(
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get overall portfolio summary"""
     user_id = 1
+    portfolio_service = AsyncPortfolioService(db)
+    return await portfolio_service.get_total_portfolio_value(user_id)
+
+@router.get("/xirr", response_model=List[XirrResponse])
+def get_xirr(
+    level: Literal['investment', 'portfolio', 'member', 'asset_class', 'total'] = 'investment',
+    db: Session = Depends(get_read_db)
+):
+    """Get XIRR per investment, or aggregated per portfolio, member, asset class or in total"""
+    user_id = 1
     portfolio_service = PortfolioService(db)
-    return portfolio_service.get_total_portfolio_value(user_id)
+    return portfolio_service.calculate_xirr(user_id, level)
 
-@router.get("/investments", response_model=List[InvestmentWithDetails])
-def get_all_investments(
+@router.get("/metrics")
+def get_portfolio_metrics(
+    years: int = Query(3, ge=1, le=10),
+    db: Session = Depends(get_read_db)
+):
+    """Get return, volatility, Sharpe ratio, beta and alpha of current holdings from local price history"""
+    user_id = 1
+    portfolio_service = PortfolioService(db)
+    return portfolio_service.get_portfolio_metrics(user_id, years)
+
+@router.post("/xirr/refresh", response_model=List[XirrRefreshResponse])
+def refresh_xirr(
     db: Session = Depends(get_db)
 ):
-    """Get all investments with details"""
+    """Recalculate and store XIRR for all investments"""
     user_id = 1
     portfolio_service = PortfolioService(db)
-    return portfolio_service.get_all_investments_detailed(user_id)
+    return portfolio_service.refresh_xirr(user_id)
+
+# Listings are paginated by cursor; the cursor of the next page is sent in this header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+@router.get("/investments", response_model=List[InvestmentWithDetails])
+async def get_all_investments(
+    response: Response,
+    limit: int = Query(KeysetPagination.DEFAULT_LIMIT, ge=1, le=KeysetPagination.MAX_LIMIT),
+    cursor: Optional[str] = None,
+    sort: Literal['investment_id', 'name', 'invested_value', 'current_value', 'gain_loss_percentage'] = 'investment_id',
+    order: Literal['asc', 'desc'] = 'asc',
+    asset_class_id: Optional[int] = None,
+    member_id: Optional[int] = None,
+    min_gain_percentage: Optional[float] = None,
+    max_gain_percentage: Optional[float] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get investments with details, one page at a time
+    
+    Pass the X-Next-Cursor response header as `cursor` to get the next page;
+    the header is absent on the last page.
+    """
+    user_id = 1
+    portfolio_service = AsyncPortfolioService(db)
+    
+    try:
+        page = await portfolio_service.get_investments_page(
+            user_id,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            descending=order == 'desc',
+            asset_class_id=asset_class_id,
+            member_id=member_id,
+            min_gain_percentage=min_gain_percentage,
+            max_gain_percentage=max_gain_percentage
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if page['next_cursor']:
+        response.headers[NEXT_CURSOR_HEADER] = page['next_cursor']
+    
+    return page['items']
 
 @router.get("/investments/{investment_id}", response_model=InvestmentWithDetails)
-def get_investment_details(
+async def get_investment_details(
     investment_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get detailed information about a specific investment"""
     user_id = 1
-    portfolio_service = PortfolioService(db)
-    all_investments = portfolio_service.get_all_investments_detailed(user_id)
-    
-    investment = next((inv for inv in all_investments if inv['investment_id'] == investment_id), None)
+    portfolio_service = AsyncPortfolioService(db)
+    investment = await portfolio_service.get_investment_detailed(user_id, investment_id)
     
     if not investment:
         raise HTTPException(
@@ -79,6 +149,21 @@ def create_investment(
     
     return new_investment
 
+def _refresh_stored_xirr(db: Session, investment: Investment) -> None:
+    """
+    Refresh an investment's stored XIRR after a committed write
+    
+    The write has already succeeded, so a failed refresh is logged and the
+    previous rate kept (its xirr_updated_at shows it is stale) instead of
+    failing the request.
+    """
+    user_id, investment_id = investment.member.user_id, investment.investment_id
+    try:
+        PortfolioService(db).refresh_xirr(user_id, [investment_id])
+    except Exception as e:
+        db.rollback()
+        print(f"Error refreshing XIRR for investment {investment_id}: {e}")
+
 @router.put("/investments/{investment_id}", response_model=InvestmentResponse)
 def update_investment(
     investment_id: int,
@@ -104,6 +189,7 @@ def update_investment(
     investment.asset_class_id = investment_data.asset_class_id
     
     db.commit()
+    _refresh_stored_xirr(db, investment)
     db.refresh(investment)
     
     return investment
@@ -128,13 +214,46 @@ def delete_investment(
     return None
 
 @router.get("/investments/{investment_id}/transactions", response_model=List[TransactionResponse])
-def get_investment_transactions(
+async def get_investment_transactions(
     investment_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: int = Query(KeysetPagination.DEFAULT_LIMIT, ge=1, le=KeysetPagination.MAX_LIMIT),
+    cursor: Optional[str] = None,
+    sort: Literal['date', 'amount'] = 'date',
+    order: Literal['asc', 'desc'] = 'desc',
+    type: Optional[TransactionTypeEnum] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get all transactions for an investment"""
-    portfolio_service = PortfolioService(db)
-    return portfolio_service.get_investment_transactions(investment_id)
+    """
+    Get transactions for an investment, newest first, one page at a time
+    
+    Pass the X-Next-Cursor response header as `cursor` to get the next page.
+    """
+    portfolio_service = AsyncPortfolioService(db)
+    
+    try:
+        page = await portfolio_service.get_investment_transactions_page(
+            investment_id,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            descending=order == 'desc',
+            transaction_type=type,
+            start_date=start_date,
+            end_date=end_date
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if page['next_cursor']:
+        response.headers[NEXT_CURSOR_HEADER] = page['next_cursor']
+    
+    return page['items']
 
 @router.post("/transactions", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 def create_transaction(
@@ -166,10 +285,13 @@ def create_transaction(
     db.commit()
     db.refresh(new_transaction)
     
+    # Update the stored XIRR incrementally, starting from the previous rate
+    _refresh_stored_xirr(db, investment)
+    
     return new_transaction
 
 @router.get("/asset-classes")
-def get_asset_classes(db: Session = Depends(get_db)):
+async def get_asset_classes(db: AsyncSession = Depends(get_async_read_db)):
     """Get all available asset classes"""
-    asset_classes = db.query(AssetClass).all()
+    asset_classes = (await db.execute(select(AssetClass))).scalars().all()
     return [{"asset_class_id": ac.asset_class_id, "name": ac.name} for ac in asset_classes]
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field
+from typing import Optional, List, Dict, Literal
 from datetime import date, datetime
 from decimal import Decimal
 
@@ -83,6 +83,7 @@ class InvestmentResponse(InvestmentBase):
     member_id: int
     asset_class_id: int
     created_at: datetime
+    xirr: Optional[Decimal] = None
     
     class Config:
         from_attributes = True
@@ -100,11 +101,26 @@ class InvestmentWithDetails(BaseModel):
     portfolio_name: Optional[str] = None
     gain_loss: Optional[float] = None
     gain_loss_percentage: Optional[float] = None
+    xirr: Optional[float] = None  # Stored annualized return in percent, see /xirr/refresh
     portfolio_id: Optional[int] = None
     member_id: Optional[int] = None
     asset_class_id: Optional[int] = None
     created_at: Optional[datetime] = None
 
+class XirrResponse(BaseModel):
+    level: str
+    id: Optional[int] = None  # None for the 'total' level
+    name: str
+    xirr: Optional[float] = None  # Percent; None if undefined for the cash flows
+    current_value: float
+    num_cash_flows: int
+
+class XirrRefreshResponse(BaseModel):
+    investment_id: int
+    name: str
+    xirr: Optional[float] = None
+    xirr_updated_at: datetime
+
 # Transaction Schemas
 class TransactionBase(BaseModel):
     date: date
@@ -189,13 +205,82 @@ class GoalSimulationResponse(BaseModel):
     worst_case: Optional[Decimal] = None
     best_case: Optional[Decimal] = None
     success_probability: Optional[Decimal] = None
+    seed: Optional[int] = None
+    num_simulations: Optional[int] = None
+    # Only reported for adaptive-precision runs
+    ci_low: Optional[Decimal] = None
+    ci_high: Optional[Decimal] = None
+    ci_half_width: Optional[Decimal] = None
+    sampling: Optional[str] = None
+    converged: Optional[bool] = None
+    cached: Optional[bool] = None  # Served from the simulation cache
+    model: Optional[str] = None
+    asset_weights: Optional[Dict[str, Decimal]] = None  # Percent per asset class (multi-asset only)
     
     class Config:
         from_attributes = True
 
 class SimulationRequest(BaseModel):
     goal_id: int
-    num_simulations: int = 5000
+    num_simulations: int = Field(5000, ge=1, le=2_000_000)  # Path budget in adaptive mode
+    seed: Optional[int] = Field(None, ge=0, lt=2**63)  # Replays a stored run when set
+    target_precision: Optional[float] = Field(None, gt=0, le=50)  # CI half-width in percentage points
+    sampling: Literal['standard', 'antithetic', 'sobol'] = 'standard'
+    use_cache: bool = True  # Serve an identical earlier run if inputs are unchanged
+    record_cached: bool = False  # Still write a history row when served from cache
+    model: Literal['single_asset', 'multi_asset'] = 'single_asset'
+    rebalance: bool = True  # Multi-asset only: rebalance monthly, or buy and hold
+
+class HouseholdSimulationRequest(BaseModel):
+    num_simulations: int = Field(5000, ge=1, le=200_000)
+    market_correlation: float = Field(1.0, ge=0, le=1)  # 1 = all goals share one market
+    seed: Optional[int] = Field(None, ge=0, lt=2**63)
+    record_history: bool = True  # Store a history row per goal
+
+class HouseholdGoalResult(BaseModel):
+    goal_id: int
+    goal_name: str
+    sim_id: Optional[int] = None
+    monthly_sip: Decimal
+    median_outcome: Decimal
+    worst_case: Decimal
+    best_case: Decimal
+    success_probability: Decimal
+
+class HouseholdSimulationResponse(BaseModel):
+    user_id: int
+    seed: int
+    num_simulations: int
+    market_correlation: float
+    goals: List[HouseholdGoalResult]
+    joint_success_probability: Decimal  # Probability that every goal is met
+    independent_success_probability: Decimal  # Same, if goals were uncorrelated
+    expected_goals_met: Decimal
+
+class ContributionSolveRequest(BaseModel):
+    target_probability: float = Field(80, gt=0, lt=100)
+    solve_for: Literal['monthly_sip', 'lump_sum'] = 'monthly_sip'
+    monthly_sip: Decimal = Decimal(0)  # SIP assumed while solving for a lump sum
+    num_simulations: int = Field(20000, ge=100, le=500_000)
+    seed: Optional[int] = Field(None, ge=0, lt=2**63)
+
+class ContributionSolveResponse(BaseModel):
+    goal_id: int
+    solve_for: str
+    required_amount: Optional[Decimal] = None  # None if the target cannot be reached
+    monthly_sip: Optional[Decimal] = None
+    target_probability: Decimal
+    achieved_probability: Decimal
+    deterministic_monthly_sip: Decimal  # Annuity-formula SIP, ignoring volatility
+    num_simulations: int
+    seed: int
+
+class GoalProjectionResponse(BaseModel):
+    goal_id: int
+    num_paths: int
+    quantiles: List[float]
+    bands: Dict[str, List[float]]  # keyed 'p10', 'p50', ...
+    required_path: List[float]
 
 # Dashboard Schemas
 class DashboardSummary(BaseModel):
@@ -223,6 +308,24 @@ class RescueStrategy(BaseModel):
     success_probability: Decimal
     description: str
 
+class StrategyProfile(BaseModel):
+    strategy_name: Optional[str] = None
+    risk_level: Optional[str] = None
+    expected_return: Decimal  # Annual %, like Goal.expected_return
+    volatility: Decimal  # Annual %
+    monthly_sip: Optional[Decimal] = None  # Defaults to the SIP required at this return
+    description: Optional[str] = None
+
+class StrategyGrid(BaseModel):
+    # Each axis is bounded by the profile limit; the grid size is checked before expansion
+    expected_returns: List[Decimal] = Field(..., min_length=1, max_length=500)
+    volatilities: List[Decimal] = Field(..., min_length=1, max_length=500)
+    monthly_sips: Optional[List[Decimal]] = Field(None, min_length=1, max_length=500)
+
+class RescueStrategyRequest(BaseModel):
+    profiles: List[StrategyProfile] = Field([], max_length=500)
+    grid: Optional[StrategyGrid] = None
+
 class RescueAnalysis(BaseModel):
     goal: GoalWithCalculations
     strategies: List[RescueStrategy]
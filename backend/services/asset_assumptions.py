@@ -0,0 +1,80 @@
+from typing import Dict, List, Sequence, Tuple
+
+
+class AssetAssumptions:
+    """
+    Capital market assumptions per asset class for multi-asset simulations
+
+    Keyed by AssetClass.name. Returns and volatilities are annual percentages,
+    like the Goal fields; correlations are between monthly returns.
+    """
+
+    # (expected_return, volatility) per asset class
+    DEFAULTS: Dict[str, Tuple[float, float]] = {
+        'Equity MF': (12.0, 16.0),
+        'Direct Stock': (13.0, 22.0),
+        'International Equity': (11.0, 18.0),
+        'Hybrid MF': (10.0, 10.0),
+        'NPS': (10.0, 11.0),
+        'Debt MF': (7.0, 3.0),
+        'Bonds': (7.0, 4.0),
+        'FD': (6.5, 0.5),
+        'Gold': (8.0, 15.0),
+    }
+
+    # Row/column order of CORRELATIONS
+    ASSET_CLASSES = (
+        'Equity MF', 'Direct Stock', 'International Equity', 'Hybrid MF', 'NPS',
+        'Debt MF', 'Bonds', 'FD', 'Gold'
+    )
+
+    CORRELATIONS = (
+        (1.00, 0.90, 0.60, 0.85, 0.80, 0.10, 0.05, 0.00, 0.05),
+        (0.90, 1.00, 0.55, 0.75, 0.70, 0.05, 0.00, 0.00, 0.05),
+        (0.60, 0.55, 1.00, 0.55, 0.50, 0.05, 0.05, 0.00, 0.10),
+        (0.85, 0.75, 0.55, 1.00, 0.80, 0.45, 0.40, 0.10, 0.05),
+        (0.80, 0.70, 0.50, 0.80, 1.00, 0.45, 0.40, 0.10, 0.05),
+        (0.10, 0.05, 0.05, 0.45, 0.45, 1.00, 0.80, 0.30, 0.10),
+        (0.05, 0.00, 0.05, 0.40, 0.40, 0.80, 1.00, 0.25, 0.15),
+        (0.00, 0.00, 0.00, 0.10, 0.10, 0.30, 0.25, 1.00, 0.00),
+        (0.05, 0.05, 0.10, 0.05, 0.05, 0.10, 0.15, 0.00, 1.00),
+    )
+
+    # Asset classes without assumptions (added after these defaults) are modelled as this one
+    FALLBACK_ASSET_CLASS = 'Hybrid MF'
+
+    @staticmethod
+    def proxy_for(asset_class: str) -> str:
+        """
+        Name of the asset class whose assumptions apply to the given one
+        """
+        if asset_class in AssetAssumptions.DEFAULTS:
+            return asset_class
+        return AssetAssumptions.FALLBACK_ASSET_CLASS
+
+    @staticmethod
+    def for_asset_classes(
+        asset_classes: Sequence[str]
+    ) -> Tuple[List[float], List[float], Tuple[Tuple[float, ...], ...]]:
+        """
+        Look up assumptions for the given asset classes, in order
+
+        Returns:
+            Tuple of (expected_returns, volatilities, correlation) with returns and
+            volatilities as decimals and correlation as a nested tuple, ready to
+            be used as a cache key for the covariance factor
+        """
+        proxies = [AssetAssumptions.proxy_for(name) for name in asset_classes]
+        index = [AssetAssumptions.ASSET_CLASSES.index(proxy) for proxy in proxies]
+
+        expected_returns = [AssetAssumptions.DEFAULTS[proxy][0] / 100 for proxy in proxies]
+        volatilities = [AssetAssumptions.DEFAULTS[proxy][1] / 100 for proxy in proxies]
+        correlation = tuple(
+            tuple(
+                1.0 if row == column else AssetAssumptions.CORRELATIONS[index[row]][index[column]]
+                for column in range(len(index))
+            )
+            for row in range(len(index))
+        )
+
+        return expected_returns, volatilities, correlation
@@ -1,7 +1,10 @@
 import numpy as np
 from decimal import Decimal
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional, Sequence
+from datetime import date
 import math
+from services.simulation_engine import SimulationEngine
+from services.xirr_solver import XirrSolver
 
 class FinancialCalculator:
     """
@@ -106,15 +109,28 @@ class FinancialCalculator:
         Calculate XIRR (Extended Internal Rate of Return)
         
         Args:
-            cash_flows: List of (amount, date_string) tuples
+            cash_flows: List of (amount, date) tuples, dates as date, datetime or
+                'YYYY-MM-DD' strings; money invested is negative, money received
+                (or current value) positive
             guess: Initial guess for IRR
             
         Returns:
-            XIRR as percentage
+            XIRR as percentage (0.0 if undefined for these cash flows)
         """
-        # Simplified XIRR calculation
-        # In production, use a proper XIRR library
-        return 0.0
+        if not cash_flows:
+            return 0.0
+        
+        amounts = np.array([float(amount) for amount, _ in cash_flows])
+        # Only the calendar day counts; datetimes (and their string form) carry a time of day
+        day_numbers = np.array([
+            date.fromisoformat(str(flow_date)[:10]).toordinal() for _, flow_date in cash_flows
+        ])
+        
+        rate = XirrSolver.solve(
+            amounts, day_numbers, np.zeros(len(cash_flows), dtype=np.intp), 1, np.array([guess])
+        )[0]
+        
+        return round(float(rate) * 100, 2) if np.isfinite(rate) else 0.0
     
     @staticmethod
     def calculate_goal_status(
@@ -176,11 +192,14 @@ class FinancialCalculator:
         expected_return: float,
         volatility: float,
         monthly_sip: float = 0,
-        num_simulations: int = 5000
+        num_simulations: int = 5000,
+        seed: Optional[int] = None
     ) -> Dict[str, float]:
         """
         Run Monte Carlo simulation for goal success probability
         
+        Delegates to the vectorized SimulationEngine.
+        
         Args:
             current_allocation: Current invested amount
             target_amount: Goal target amount
@@ -189,54 +208,195 @@ class FinancialCalculator:
             volatility: Annual volatility/standard deviation (as decimal)
             monthly_sip: Optional monthly SIP contribution
             num_simulations: Number of simulation runs
+            seed: Optional seed; the same seed and inputs reproduce the same result
             
         Returns:
             Dictionary with median_outcome, worst_case, best_case, success_probability
         """
-        if years <= 0:
-            success = 1.0 if current_allocation >= target_amount else 0.0
-            return {
-                'median_outcome': current_allocation,
-                'worst_case': current_allocation,
-                'best_case': current_allocation,
-                'success_probability': success * 100
-            }
-        
-        outcomes = []
-        months = years * 12
-        monthly_return = expected_return / 12
-        monthly_volatility = volatility / math.sqrt(12)
-        
-        for _ in range(num_simulations):
-            portfolio_value = current_allocation
+        return SimulationEngine.run(
+            current_allocation=current_allocation,
+            target_amount=target_amount,
+            years=years,
+            expected_return=expected_return,
+            volatility=volatility,
+            monthly_sip=monthly_sip,
+            num_simulations=num_simulations,
+            seed=seed
+        )
+    
+    @staticmethod
+    def run_adaptive_simulation(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        expected_return: float,
+        volatility: float,
+        monthly_sip: float = 0,
+        target_precision: float = 0.5,
+        sampling: str = 'antithetic',
+        max_simulations: int = 200000,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Run Monte Carlo simulation until success probability reaches a target precision
+        
+        Args:
+            target_precision: Required 95% CI half-width in percentage points
+            sampling: 'standard', 'antithetic' or 'sobol'
+            max_simulations: Maximum number of paths to simulate
             
-            for month in range(months):
-                # Add monthly SIP if applicable
-                portfolio_value += monthly_sip
-                
-                # Generate random return using normal distribution
-                random_return = np.random.normal(monthly_return, monthly_volatility)
-                portfolio_value *= (1 + random_return)
+        Returns:
+            Simulation results plus ci_low, ci_high, ci_half_width, num_simulations
+            (paths actually used) and converged
+        """
+        return SimulationEngine.run_adaptive(
+            current_allocation=current_allocation,
+            target_amount=target_amount,
+            years=years,
+            expected_return=expected_return,
+            volatility=volatility,
+            monthly_sip=monthly_sip,
+            target_precision=target_precision,
+            sampling=sampling,
+            max_simulations=max_simulations,
+            seed=seed
+        )
+    
+    @staticmethod
+    def evaluate_scenarios(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        scenarios: List[Dict],
+        num_simulations: int = 2000,
+        sampling: str = 'standard',
+        seed: Optional[int] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Evaluate many investment scenarios against one shared set of random shocks
+        
+        Args:
+            scenarios: Dicts with 'expected_return', 'volatility' (as decimals) and
+                optional 'monthly_sip'
+            num_simulations: Number of shared simulation paths
+            sampling: 'standard', 'antithetic' or 'sobol'
             
-            outcomes.append(portfolio_value)
+        Returns:
+            One dictionary per scenario with median_outcome, worst_case, best_case,
+            success_probability
+        """
+        return SimulationEngine.evaluate_scenarios(
+            current_allocation=current_allocation,
+            target_amount=target_amount,
+            years=years,
+            scenarios=scenarios,
+            num_simulations=num_simulations,
+            sampling=sampling,
+            seed=seed
+        )
+    
+    @staticmethod
+    def run_multi_asset_simulation(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        weights: List[float],
+        expected_returns: List[float],
+        volatilities: List[float],
+        correlation: List[List[float]],
+        monthly_sip: float = 0,
+        num_simulations: int = 5000,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Run Monte Carlo simulation for a buy-and-hold portfolio of correlated asset classes
         
-        outcomes = np.array(outcomes)
+        Args:
+            weights: Share of the allocation and SIP going to each asset class
+            expected_returns: Annual expected return per asset class (as decimal)
+            volatilities: Annual volatility per asset class (as decimal)
+            correlation: Correlation matrix between asset class returns
+            
+        Returns:
+            Dictionary with median_outcome, worst_case, best_case, success_probability
+        """
+        return SimulationEngine.run_multi_asset(
+            current_allocation=current_allocation,
+            target_amount=target_amount,
+            years=years,
+            weights=weights,
+            expected_returns=expected_returns,
+            volatilities=volatilities,
+            correlation=correlation,
+            monthly_sip=monthly_sip,
+            num_simulations=num_simulations,
+            seed=seed
+        )
+    
+    @staticmethod
+    def run_household_simulation(
+        goals: List[Dict],
+        num_simulations: int = 5000,
+        market_correlation: float = 1.0,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Run one Monte Carlo simulation for several goals with shared market shocks
         
-        # Calculate percentiles
-        median_outcome = np.percentile(outcomes, 50)
-        worst_case = np.percentile(outcomes, 10)  # 10th percentile
-        best_case = np.percentile(outcomes, 90)   # 90th percentile
+        Args:
+            goals: Dicts with current_allocation, target_amount, years,
+                expected_return, volatility (as decimals) and monthly_sip
+            market_correlation: Correlation between goals' monthly shocks (0-1)
+            
+        Returns:
+            Dictionary with per-goal results, joint_success_probability,
+            independent_success_probability and expected_goals_met
+        """
+        return SimulationEngine.simulate_household(
+            goals,
+            num_simulations=num_simulations,
+            market_correlation=market_correlation,
+            seed=seed
+        )
+    
+    @staticmethod
+    def solve_required_contribution(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        expected_return: float,
+        volatility: float,
+        target_probability: float = 80,
+        solve_for: str = 'monthly_sip',
+        monthly_sip: float = 0,
+        num_simulations: int = 20000,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Find the minimum monthly SIP or extra lump sum that reaches a success probability
         
-        # Calculate success probability
-        successes = np.sum(outcomes >= target_amount)
-        success_probability = (successes / num_simulations) * 100
+        Unlike calculate_required_sip, this accounts for volatility.
         
-        return {
-            'median_outcome': round(float(median_outcome), 2),
-            'worst_case': round(float(worst_case), 2),
-            'best_case': round(float(best_case), 2),
-            'success_probability': round(float(success_probability), 2)
-        }
+        Args:
+            target_probability: Required success probability (0-100)
+            solve_for: 'monthly_sip' or 'lump_sum'
+            monthly_sip: SIP assumed while solving for a lump sum
+            
+        Returns:
+            Dictionary with required_amount, achieved_probability and num_simulations
+        """
+        return SimulationEngine.solve_required_contribution(
+            current_allocation=current_allocation,
+            target_amount=target_amount,
+            years=years,
+            expected_return=expected_return,
+            volatility=volatility,
+            target_probability=target_probability,
+            solve_for=solve_for,
+            monthly_sip=monthly_sip,
+            num_simulations=num_simulations,
+            seed=seed
+        )
     
     @staticmethod
     def generate_projection_paths(
@@ -254,44 +414,56 @@ class FinancialCalculator:
         Returns:
             Dictionary with 'median_path', 'worst_path', 'best_path', and 'required_path'
         """
-        months = years * 12
-        monthly_return = expected_return / 12
-        monthly_volatility = volatility / math.sqrt(12)
-        
-        all_paths = []
-        
-        for _ in range(num_paths):
-            path = [current_allocation]
-            portfolio_value = current_allocation
-            
-            for month in range(months):
-                portfolio_value += monthly_sip
-                random_return = np.random.normal(monthly_return, monthly_volatility)
-                portfolio_value *= (1 + random_return)
-                path.append(portfolio_value)
-            
-            all_paths.append(path)
-        
-        all_paths = np.array(all_paths)
-        
-        # Calculate percentile paths
-        median_path = [float(np.percentile(all_paths[:, i], 50)) for i in range(months + 1)]
-        worst_path = [float(np.percentile(all_paths[:, i], 10)) for i in range(months + 1)]
-        best_path = [float(np.percentile(all_paths[:, i], 90)) for i in range(months + 1)]
-        
-        # Calculate required corpus path (linear growth to target)
-        required_path = [
-            current_allocation + (target_amount - current_allocation) * (i / months)
-            for i in range(months + 1)
-        ]
+        projection = FinancialCalculator.generate_projection_bands(
+            current_allocation=current_allocation,
+            target_amount=target_amount,
+            years=years,
+            expected_return=expected_return,
+            volatility=volatility,
+            monthly_sip=monthly_sip,
+            num_paths=num_paths,
+            quantiles=(10, 50, 90)
+        )
+        bands = projection['bands']
         
         return {
-            'median_path': median_path,
-            'worst_path': worst_path,
-            'best_path': best_path,
-            'required_path': required_path
+            'median_path': bands['p50'],
+            'worst_path': bands['p10'],
+            'best_path': bands['p90'],
+            'required_path': projection['required_path']
         }
     
+    @staticmethod
+    def generate_projection_bands(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        expected_return: float,
+        volatility: float,
+        monthly_sip: float = 0,
+        num_paths: int = 1000,
+        quantiles: Sequence[float] = (10, 50, 90)
+    ) -> Dict:
+        """
+        Generate monthly percentile bands for any set of quantiles
+        
+        Args:
+            quantiles: Percentiles (0-100) to report, e.g. (5, 25, 50, 75, 95)
+            
+        Returns:
+            Dictionary with 'quantiles', 'bands' keyed 'p5', 'p50', ... and 'required_path'
+        """
+        return SimulationEngine.projection_bands(
+            current_allocation=current_allocation,
+            target_amount=target_amount,
+            years=years,
+            expected_return=expected_return,
+            volatility=volatility,
+            monthly_sip=monthly_sip,
+            num_paths=num_paths,
+            quantiles=quantiles
+        )
+    
     @staticmethod
     def calculate_portfolio_metrics(
         returns: List[float],
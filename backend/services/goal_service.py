@@ -1,7 +1,13 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from models import Goal, GoalInvestmentMapping, Investment, FamilyMember, GoalHistory, GoalSimulationHistory
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Goal, GoalInvestmentMapping, Investment, FamilyMember, GoalHistory, GoalSimulationHistory, AssetClass
+from services.asset_assumptions import AssetAssumptions
 from services.financial_calculator import FinancialCalculator
-from typing import Dict, List, Optional
+from services.simulation_engine import SimulationEngine
+from services.simulation_cache import simulation_cache
+from services.request_context import RequestContext
+from typing import Dict, List, Optional, Sequence
 from decimal import Decimal
 from datetime import date, datetime
 
@@ -10,13 +16,56 @@ class GoalService:
     Service for goal-related business logic
     """
     
-    def __init__(self, db: Session):
+    # Strategy profiles evaluated when no custom profiles are given
+    # (expected_return and volatility are annual percentages, like Goal fields)
+    DEFAULT_RESCUE_PROFILES = [
+        {
+            'strategy_name': 'Safe Strategy',
+            'risk_level': 'Low',
+            'expected_return': 8.0,
+            'volatility': 6.0,
+            'description': 'Focus on debt funds and FDs with lower volatility'
+        },
+        {
+            'strategy_name': 'Balanced Strategy',
+            'risk_level': 'Medium',
+            'expected_return': 10.0,
+            'volatility': 10.0,
+            'description': 'Mix of equity and debt funds with moderate risk'
+        },
+        {
+            'strategy_name': 'Aggressive Strategy',
+            'risk_level': 'High',
+            'expected_return': 14.0,
+            'volatility': 18.0,
+            'description': 'Focus on equity funds and growth stocks with higher potential'
+        }
+    ]
+    
+    # All rescue profiles are evaluated against one shared antithetic shock matrix
+    RESCUE_SIMULATION_OPTIONS = {
+        'num_simulations': 2000,
+        'sampling': 'antithetic'
+    }
+    
+    def __init__(self, db: Session, context: Optional[RequestContext] = None):
         self.db = db
+        # Shared with the other services of the request when injected, private otherwise
+        self.context = context or RequestContext(db)
         self.calculator = FinancialCalculator()
     
-    def calculate_goal_metrics(self, goal: Goal) -> Dict:
+    def calculate_goal_metrics(
+        self,
+        goal: Goal,
+        current_allocation: Optional[float] = None,
+        latest_success_probabilities: Optional[Dict[int, float]] = None
+    ) -> Dict:
         """
         Calculate all metrics for a goal including PV, shortfall, SIP, status
+        
+        Pass current_allocation and latest_success_probabilities when they were
+        already loaded in bulk (get_goal_allocations,
+        get_latest_success_probabilities) to compute the metrics without queries.
         """
         # Get expected return and convert to decimal
         expected_return = float(goal.expected_return or 10) / 100
@@ -29,7 +78,8 @@ class GoalService:
         )
         
         # Calculate current allocation from mapped investments
-        current_allocation = self.get_goal_current_allocation(goal.goal_id)
+        if current_allocation is None:
+            current_allocation = self.get_goal_current_allocation(goal.goal_id)
         
         # Calculate shortfall
         shortfall = max(0, present_value - current_allocation)
@@ -44,11 +94,9 @@ class GoalService:
             )
         
         # Get latest success probability from simulation history
-        latest_simulation = self.db.query(GoalSimulationHistory).filter(
-            GoalSimulationHistory.goal_id == goal.goal_id
-        ).order_by(GoalSimulationHistory.run_timestamp.desc()).first()
-        
-        success_probability = float(latest_simulation.success_probability) if latest_simulation else None
+        if latest_success_probabilities is None:
+            latest_success_probabilities = self.get_latest_success_probabilities([goal.goal_id])
+        success_probability = latest_success_probabilities.get(goal.goal_id)
         
         # Determine goal status
         status = self.calculator.calculate_goal_status(
@@ -70,22 +118,113 @@ class GoalService:
         """
         Calculate total current value allocated to a goal from mapped investments
         """
-        mappings = self.db.query(GoalInvestmentMapping).filter(
-            GoalInvestmentMapping.goal_id == goal_id
+        return self.get_goal_allocations([goal_id])[goal_id]
+    
+    def get_goal_allocations(self, goal_ids: Sequence[int]) -> Dict[int, float]:
+        """
+        Calculate current value allocated to each of several goals in one query
+        
+        Sums current_value x allocation_percentage over the mapped investments of
+        all given goals with a single JOIN / GROUP BY, so the query count does not
+        grow with the number of goals or mappings. A mapping without a percentage
+        counts in full.
+        
+        Memoized per goal for the rest of the request.
+        
+        Returns:
+            Dictionary of goal_id to allocated value (0 for goals without mappings)
+        """
+        return self.context.get_or_load_many('goal_allocations', goal_ids, self._load_goal_allocations)
+    
+    def _load_goal_allocations(self, goal_ids: Sequence[int]) -> Dict[int, float]:
+        allocations = {goal_id: 0.0 for goal_id in goal_ids}
+        
+        if not allocations:
+            return allocations
+        
+        allocated_value = func.sum(
+            Investment.current_value * func.coalesce(GoalInvestmentMapping.allocation_percentage, 100) / 100
+        )
+        rows = self.db.query(
+            GoalInvestmentMapping.goal_id,
+            allocated_value.label('allocated_value')
+        ).join(
+            Investment, Investment.investment_id == GoalInvestmentMapping.investment_id
+        ).filter(
+            GoalInvestmentMapping.goal_id.in_(list(allocations))
+        ).group_by(
+            GoalInvestmentMapping.goal_id
         ).all()
         
-        total_allocation = 0
+        for row in rows:
+            allocations[row.goal_id] = float(row.allocated_value or 0)
         
-        for mapping in mappings:
-            investment = self.db.query(Investment).filter(
-                Investment.investment_id == mapping.investment_id
-            ).first()
-            
-            if investment and investment.current_value:
-                allocation_pct = float(mapping.allocation_percentage or 100) / 100
-                total_allocation += float(investment.current_value) * allocation_pct
+        return allocations
+    
+    def get_latest_success_probabilities(self, goal_ids: Sequence[int]) -> Dict[int, float]:
+        """
+        Get the success probability of the most recent simulation of each goal in one query
+        
+        Memoized per goal for the rest of the request.
         
-        return total_allocation
+        Returns:
+            Dictionary of goal_id to success probability; goals never simulated are absent
+        """
+        return self.context.get_or_load_many(
+            'latest_success_probabilities', goal_ids, self._load_latest_success_probabilities
+        )
+    
+    def _load_latest_success_probabilities(self, goal_ids: Sequence[int]) -> Dict[int, float]:
+        if not goal_ids:
+            return {}
+        
+        recency = func.row_number().over(
+            partition_by=GoalSimulationHistory.goal_id,
+            order_by=(GoalSimulationHistory.run_timestamp.desc(), GoalSimulationHistory.sim_id.desc())
+        ).label('recency')
+        ranked = self.db.query(
+            GoalSimulationHistory.goal_id,
+            GoalSimulationHistory.success_probability,
+            recency
+        ).filter(
+            GoalSimulationHistory.goal_id.in_(list(goal_ids))
+        ).subquery()
+        
+        rows = self.db.query(
+            ranked.c.goal_id,
+            ranked.c.success_probability
+        ).filter(
+            ranked.c.recency == 1
+        ).all()
+        
+        return {
+            row.goal_id: float(row.success_probability)
+            for row in rows if row.success_probability is not None
+        }
+    
+    def get_goal_asset_weights(self, goal_id: int) -> Dict[str, float]:
+        """
+        Get the value allocated to a goal per asset class, from mapped investments
+        """
+        allocated_value = func.sum(
+            Investment.current_value * func.coalesce(GoalInvestmentMapping.allocation_percentage, 100) / 100
+        )
+        rows = self.db.query(
+            AssetClass.name,
+            allocated_value.label('allocated_value')
+        ).join(
+            Investment, Investment.asset_class_id == AssetClass.asset_class_id
+        ).join(
+            GoalInvestmentMapping, GoalInvestmentMapping.investment_id == Investment.investment_id
+        ).filter(
+            GoalInvestmentMapping.goal_id == goal_id
+        ).group_by(
+            AssetClass.name
+        ).order_by(
+            AssetClass.name
+        ).all()
+        
+        return {row.name: float(row.allocated_value) for row in rows if row.allocated_value and row.allocated_value > 0}
     
     def get_goal_with_details(self, goal_id: int) -> Optional[Dict]:
         """
@@ -104,6 +243,13 @@ class GoalService:
         # Calculate metrics
         metrics = self.calculate_goal_metrics(goal)
         
+        return self._goal_details(goal, beneficiary.name if beneficiary else None, metrics)
+    
+    @staticmethod
+    def _goal_details(goal: Goal, beneficiary_name: Optional[str], metrics: Dict) -> Dict:
+        """
+        Combine a goal's fields, beneficiary name and calculated metrics
+        """
         return {
             'goal_id': goal.goal_id,
             'goal_name': goal.goal_name,
@@ -113,7 +259,7 @@ class GoalService:
             'expected_return': goal.expected_return,
             'volatility': goal.volatility,
             'created_by_user_id': goal.created_by_user_id,
-            'beneficiary_name': beneficiary.name if beneficiary else None,
+            'beneficiary_name': beneficiary_name,
             'beneficiary_member_id': goal.beneficiary_member_id,
             'created_at': goal.created_at,
             **metrics
@@ -122,23 +268,65 @@ class GoalService:
     def get_all_goals_summary(self, user_id: int) -> List[Dict]:
         """
         Get summary of all goals for a user
+        
+        Goals with their beneficiaries, allocations and latest simulations are
+        loaded in three queries however many goals there are; all metrics are
+        then calculated in memory.
         """
-        goals = self.db.query(Goal).filter(
+        goals = self.db.query(
+            Goal,
+            FamilyMember.name.label('beneficiary_name')
+        ).outerjoin(
+            FamilyMember, FamilyMember.member_id == Goal.beneficiary_member_id
+        ).filter(
             Goal.created_by_user_id == user_id
         ).all()
         
-        goals_summary = []
-        
-        for goal in goals:
-            goal_details = self.get_goal_with_details(goal.goal_id)
-            if goal_details:
-                goals_summary.append(goal_details)
+        goal_ids = [goal.goal_id for goal, _ in goals]
+        allocations = self.get_goal_allocations(goal_ids)
+        latest_success_probabilities = self.get_latest_success_probabilities(goal_ids)
         
-        return goals_summary
+        return [
+            self._goal_details(
+                goal,
+                beneficiary_name,
+                self.calculate_goal_metrics(goal, allocations[goal.goal_id], latest_success_probabilities)
+            )
+            for goal, beneficiary_name in goals
+        ]
     
-    def run_goal_simulation(self, goal_id: int, num_simulations: int = 5000) -> Dict:
+    def run_goal_simulation(
+        self,
+        goal_id: int,
+        num_simulations: int = 5000,
+        seed: Optional[int] = None,
+        target_precision: Optional[float] = None,
+        sampling: str = 'standard',
+        use_cache: bool = True,
+        record_cached: bool = False,
+        model: str = 'single_asset',
+        rebalance: bool = True
+    ) -> Dict:
         """
         Run Monte Carlo simulation for a goal and store results
+        
+        The seed is stored with the results so that the run can be replayed exactly
+        by passing it back in. Adaptive and multi-asset runs are not replayable
+        from the stored seed and path count alone, so their history rows get no
+        seed.
+        
+        With a target_precision (CI half-width in percentage points) or a variance
+        reduction sampling scheme, the simulation runs in adaptive mode and
+        num_simulations becomes the path budget rather than a fixed count.
+        
+        When use_cache is set and nothing relevant changed since an identical run,
+        that run is served from the simulation cache. It is returned as stored
+        unless record_cached is set, in which case a new history row is written.
+        An explicit seed always re-simulates.
+        
+        The 'multi_asset' model replaces the goal's return/volatility with
+        per-asset-class assumptions weighted by the mapped holdings: rebalanced
+        to those weights monthly, or held as bought (fixed-size runs only).
         """
         goal = self.db.query(Goal).filter(Goal.goal_id == goal_id).first()
         
@@ -147,26 +335,58 @@ class GoalService:
         
         # Get current metrics
         metrics = self.calculate_goal_metrics(goal)
-        current_allocation = metrics['current_allocation']
-        required_sip = metrics['required_monthly_sip']
-        
-        # Run simulation
-        expected_return = float(goal.expected_return or 10) / 100
-        volatility = float(goal.volatility or 12) / 100
+        simulation_params = {
+            'current_allocation': float(metrics['current_allocation']),
+            'target_amount': float(goal.target_amount),
+            'years': goal.years_until_due,
+            'expected_return': float(goal.expected_return or 10) / 100,
+            'volatility': float(goal.volatility or 12) / 100,
+            'monthly_sip': float(metrics['required_monthly_sip'])
+        }
         
-        simulation_results = self.calculator.run_monte_carlo_simulation(
-            current_allocation=current_allocation,
-            target_amount=float(goal.target_amount),
-            years=goal.years_until_due,
-            expected_return=expected_return,
-            volatility=volatility,
-            monthly_sip=required_sip,
-            num_simulations=num_simulations
+        asset_weights = None
+        if model == 'multi_asset':
+            asset_weights = self.get_goal_asset_weights(goal_id)
+            simulation_params = self._multi_asset_parameters(simulation_params, asset_weights, rebalance)
+        
+        cache_key = simulation_cache.make_key(
+            goal_id,
+            **simulation_params,
+            num_simulations=num_simulations,
+            target_precision=target_precision,
+            sampling=sampling,
+            model=model,
+            rebalance=rebalance
         )
+        cached_result = simulation_cache.get(cache_key) if use_cache and seed is None else None
+        
+        if cached_result is not None and not record_cached:
+            return {**cached_result, 'cached': True}
+        
+        if cached_result is not None:
+            simulation_results = {
+                key: value for key, value in cached_result.items()
+                if key not in ('sim_id', 'goal_id', 'run_timestamp')
+            }
+        else:
+            simulation_results = self._simulate(
+                simulation_params, num_simulations, seed, target_precision, sampling
+            )
+            simulation_results['model'] = model
+            if asset_weights:
+                total = sum(asset_weights.values())
+                simulation_results['asset_weights'] = {
+                    name: round(value / total * 100, 2) for name, value in asset_weights.items()
+                }
+        
+        # Only a fixed-size standard single-asset run is reproduced by its seed and path count
+        replayable = target_precision is None and sampling == 'standard' and model == 'single_asset'
         
         # Store simulation results
         simulation_record = GoalSimulationHistory(
             goal_id=goal_id,
+            seed=simulation_results['seed'] if replayable else None,
+            num_simulations=simulation_results['num_simulations'],
             median_outcome=Decimal(str(simulation_results['median_outcome'])),
             worst_case=Decimal(str(simulation_results['worst_case'])),
             best_case=Decimal(str(simulation_results['best_case'])),
@@ -175,14 +395,256 @@ class GoalService:
         
         self.db.add(simulation_record)
         self.db.commit()
+        self.context.invalidate('latest_success_probabilities')
         self.db.refresh(simulation_record)
         
-        return {
+        result = {
             'sim_id': simulation_record.sim_id,
             'goal_id': goal_id,
             'run_timestamp': simulation_record.run_timestamp,
             **simulation_results
         }
+        
+        if use_cache:
+            simulation_cache.set(cache_key, goal_id, result)
+        
+        return {**result, 'cached': cached_result is not None}
+    
+    def run_household_simulation(
+        self,
+        user_id: int,
+        num_simulations: int = 5000,
+        market_correlation: float = 1.0,
+        seed: Optional[int] = None,
+        record_history: bool = True
+    ) -> Dict:
+        """
+        Simulate all of a user's goals in one run against a shared market
+        
+        Goals draw on the same family portfolio, so their outcomes are correlated;
+        besides per-goal results this reports the probability that every goal is
+        met. Each goal gets the same inputs as run_goal_simulation, and with
+        record_history a history row per goal is stored. The rows get no seed:
+        a goal's draws depend on the whole household, so the shared seed does
+        not replay it on its own.
+        """
+        goals = self.db.query(Goal).filter(
+            Goal.created_by_user_id == user_id
+        ).order_by(Goal.goal_id).all()
+        
+        goal_ids = [goal.goal_id for goal in goals]
+        allocations = self.get_goal_allocations(goal_ids)
+        latest_success_probabilities = self.get_latest_success_probabilities(goal_ids)
+        
+        goal_params = []
+        for goal in goals:
+            metrics = self.calculate_goal_metrics(goal, allocations[goal.goal_id], latest_success_probabilities)
+            goal_params.append({
+                'current_allocation': float(metrics['current_allocation']),
+                'target_amount': float(goal.target_amount),
+                'years': goal.years_until_due,
+                'expected_return': float(goal.expected_return or 10) / 100,
+                'volatility': float(goal.volatility or 12) / 100,
+                'monthly_sip': float(metrics['required_monthly_sip'])
+            })
+        
+        if seed is None:
+            seed = SimulationEngine.new_seed()
+        
+        household_results = self.calculator.run_household_simulation(
+            goal_params,
+            num_simulations=num_simulations,
+            market_correlation=market_correlation,
+            seed=seed
+        )
+        
+        goal_results = []
+        for goal, params, simulation_results in zip(goals, goal_params, household_results['goals']):
+            goal_result = {
+                'goal_id': goal.goal_id,
+                'goal_name': goal.goal_name,
+                'monthly_sip': params['monthly_sip'],
+                **simulation_results
+            }
+            
+            if record_history:
+                simulation_record = GoalSimulationHistory(
+                    goal_id=goal.goal_id,
+                    seed=None,
+                    num_simulations=num_simulations,
+                    median_outcome=Decimal(str(simulation_results['median_outcome'])),
+                    worst_case=Decimal(str(simulation_results['worst_case'])),
+                    best_case=Decimal(str(simulation_results['best_case'])),
+                    success_probability=Decimal(str(simulation_results['success_probability']))
+                )
+                self.db.add(simulation_record)
+                goal_result['record'] = simulation_record
+            
+            goal_results.append(goal_result)
+        
+        if record_history and goal_results:
+            self.db.commit()
+            self.context.invalidate('latest_success_probabilities')
+            for goal_result in goal_results:
+                goal_result['sim_id'] = goal_result.pop('record').sim_id
+        
+        return {
+            'user_id': user_id,
+            'seed': seed,
+            'num_simulations': num_simulations,
+            'market_correlation': market_correlation,
+            **household_results,
+            'goals': goal_results
+        }
+    
+    @staticmethod
+    def _multi_asset_parameters(simulation_params: Dict, asset_weights: Dict[str, float], rebalance: bool) -> Dict:
+        """
+        Swap a goal's scalar return/volatility for assumptions on its actual holdings
+        
+        Goals without mapped holdings keep their own return and volatility.
+        """
+        if not asset_weights:
+            return simulation_params
+        
+        asset_classes = list(asset_weights)
+        weights = [asset_weights[name] for name in asset_classes]
+        expected_returns, volatilities, correlation = AssetAssumptions.for_asset_classes(asset_classes)
+        
+        if rebalance:
+            expected_return, volatility = SimulationEngine.portfolio_parameters(
+                weights, expected_returns, volatilities, correlation
+            )
+            return {**simulation_params, 'expected_return': expected_return, 'volatility': volatility}
+        
+        total = sum(weights)
+        return {
+            **{key: value for key, value in simulation_params.items()
+               if key not in ('expected_return', 'volatility')},
+            'asset_classes': asset_classes,
+            'weights': [weight / total for weight in weights],
+            'expected_returns': expected_returns,
+            'volatilities': volatilities,
+            'correlation': [list(row) for row in correlation]
+        }
+    
+    def _simulate(
+        self,
+        simulation_params: Dict,
+        num_simulations: int,
+        seed: Optional[int],
+        target_precision: Optional[float],
+        sampling: str
+    ) -> Dict:
+        """
+        Run a fixed-size or adaptive simulation and tag it with its seed and path count
+        """
+        if seed is None:
+            seed = SimulationEngine.new_seed()
+        
+        if 'weights' in simulation_params:
+            if target_precision is not None or sampling != 'standard':
+                raise ValueError("Adaptive precision is not available for buy-and-hold multi-asset simulations")
+            
+            simulation_results = self.calculator.run_multi_asset_simulation(
+                **{key: value for key, value in simulation_params.items() if key != 'asset_classes'},
+                num_simulations=num_simulations,
+                seed=seed
+            )
+            simulation_results['num_simulations'] = num_simulations
+        elif target_precision is not None or sampling != 'standard':
+            simulation_results = self.calculator.run_adaptive_simulation(
+                **simulation_params,
+                target_precision=target_precision or 0,
+                sampling=sampling,
+                max_simulations=num_simulations,
+                seed=seed
+            )
+        else:
+            simulation_results = self.calculator.run_monte_carlo_simulation(
+                **simulation_params,
+                num_simulations=num_simulations,
+                seed=seed
+            )
+            simulation_results['num_simulations'] = num_simulations
+        
+        return {**simulation_results, 'seed': seed}
+    
+    def solve_required_contribution(
+        self,
+        goal_id: int,
+        target_probability: float = 80,
+        solve_for: str = 'monthly_sip',
+        monthly_sip: float = 0,
+        num_simulations: int = 20000,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Find the monthly SIP or extra lump sum needed to reach a success probability
+        """
+        goal = self.db.query(Goal).filter(Goal.goal_id == goal_id).first()
+        
+        if not goal:
+            raise ValueError("Goal not found")
+        
+        metrics = self.calculate_goal_metrics(goal)
+        
+        if seed is None:
+            seed = SimulationEngine.new_seed()
+        
+        solution = self.calculator.solve_required_contribution(
+            current_allocation=float(metrics['current_allocation']),
+            target_amount=float(goal.target_amount),
+            years=goal.years_until_due,
+            expected_return=float(goal.expected_return or 10) / 100,
+            volatility=float(goal.volatility or 12) / 100,
+            target_probability=target_probability,
+            solve_for=solve_for,
+            monthly_sip=monthly_sip,
+            num_simulations=num_simulations,
+            seed=seed
+        )
+        
+        return {
+            'goal_id': goal_id,
+            **solution,
+            'monthly_sip': monthly_sip if solve_for == 'lump_sum' else solution['required_amount'],
+            'deterministic_monthly_sip': float(metrics['required_monthly_sip']),
+            'seed': seed
+        }
+    
+    def get_goal_projection(
+        self,
+        goal_id: int,
+        quantiles: Sequence[float] = (10, 50, 90),
+        num_paths: int = 1000
+    ) -> Dict:
+        """
+        Get monthly percentile bands of projected goal value for charting
+        """
+        goal = self.db.query(Goal).filter(Goal.goal_id == goal_id).first()
+        
+        if not goal:
+            raise ValueError("Goal not found")
+        
+        metrics = self.calculate_goal_metrics(goal)
+        
+        projection = self.calculator.generate_projection_bands(
+            current_allocation=float(metrics['current_allocation']),
+            target_amount=float(goal.target_amount),
+            years=goal.years_until_due,
+            expected_return=float(goal.expected_return or 10) / 100,
+            volatility=float(goal.volatility or 12) / 100,
+            monthly_sip=float(metrics['required_monthly_sip']),
+            num_paths=num_paths,
+            quantiles=quantiles
+        )
+        
+        return {
+            'goal_id': goal_id,
+            'num_paths': num_paths,
+            **projection
+        }
     
     def get_goal_history(self, goal_id: int) -> List[Dict]:
         """
@@ -204,9 +666,55 @@ class GoalService:
             for h in history
         ]
     
-    def generate_rescue_strategies(self, goal_id: int) -> List[Dict]:
+    @staticmethod
+    def expand_strategy_grid(
+        expected_returns: List[float],
+        volatilities: List[float],
+        monthly_sips: Optional[List[float]] = None
+    ) -> List[Dict]:
+        """
+        Expand a grid of returns x volatilities (x SIPs) into strategy profiles
+        """
+        profiles = []
+        
+        for expected_return in expected_returns:
+            for volatility in volatilities:
+                for monthly_sip in (monthly_sips or [None]):
+                    name = f"{float(expected_return):g}% return / {float(volatility):g}% volatility"
+                    if monthly_sip is not None:
+                        name += f" / SIP {float(monthly_sip):,.0f}"
+                    profiles.append({
+                        'strategy_name': name,
+                        'expected_return': expected_return,
+                        'volatility': volatility,
+                        'monthly_sip': monthly_sip
+                    })
+        
+        return profiles
+    
+    @staticmethod
+    def risk_level_for(volatility: float) -> str:
+        """
+        Classify a strategy by annual volatility (in percent)
+        """
+        if volatility < 8:
+            return 'Low'
+        elif volatility < 14:
+            return 'Medium'
+        return 'High'
+    
+    def generate_rescue_strategies(
+        self,
+        goal_id: int,
+        profiles: Optional[List[Dict]] = None
+    ) -> List[Dict]:
         """
         Generate rescue strategies for underperforming goals
+        
+        Evaluates the default Safe/Balanced/Aggressive profiles, or any list of
+        custom profiles, in a single pass over shared random shocks so that the
+        strategies are directly comparable. Profiles without a monthly_sip use
+        the SIP required to close the shortfall at their expected return.
         """
         goal = self.db.query(Goal).filter(Goal.goal_id == goal_id).first()
         
@@ -215,96 +723,96 @@ class GoalService:
         
         metrics = self.calculate_goal_metrics(goal)
         
-        if metrics['status'] == 'green':
-            return []  # No rescue needed
-        
-        strategies = []
-        
-        # Strategy 1: Safe (lower risk, lower return)
-        safe_return = 0.08
-        safe_volatility = 0.06
-        safe_sip = self.calculator.calculate_required_sip(
-            shortfall=metrics['shortfall'],
-            rate=safe_return,
-            years=goal.years_until_due
-        )
-        
-        safe_simulation = self.calculator.run_monte_carlo_simulation(
-            current_allocation=metrics['current_allocation'],
-            target_amount=float(goal.target_amount),
-            years=goal.years_until_due,
-            expected_return=safe_return,
-            volatility=safe_volatility,
-            monthly_sip=safe_sip,
-            num_simulations=1000
-        )
-        
-        strategies.append({
-            'strategy_name': 'Safe Strategy',
-            'risk_level': 'Low',
-            'new_expected_return': 8.0,
-            'new_volatility': 6.0,
-            'required_monthly_sip': round(safe_sip, 2),
-            'success_probability': safe_simulation['success_probability'],
-            'description': 'Focus on debt funds and FDs with lower volatility'
-        })
-        
-        # Strategy 2: Balanced
-        balanced_return = 0.10
-        balanced_volatility = 0.10
-        balanced_sip = self.calculator.calculate_required_sip(
-            shortfall=metrics['shortfall'],
-            rate=balanced_return,
-            years=goal.years_until_due
-        )
-        
-        balanced_simulation = self.calculator.run_monte_carlo_simulation(
-            current_allocation=metrics['current_allocation'],
+        if profiles is None:
+            if metrics['status'] == 'green':
+                return []  # No rescue needed
+            profiles = self.DEFAULT_RESCUE_PROFILES
+        
+        current_allocation = float(metrics['current_allocation'])
+        shortfall = float(metrics['shortfall'])
+        
+        scenarios = []
+        for profile in profiles:
+            expected_return = float(profile['expected_return']) / 100
+            monthly_sip = profile.get('monthly_sip')
+            if monthly_sip is None:
+                monthly_sip = self.calculator.calculate_required_sip(
+                    shortfall=shortfall,
+                    rate=expected_return,
+                    years=goal.years_until_due
+                )
+            
+            scenarios.append({
+                'expected_return': expected_return,
+                'volatility': float(profile['volatility']) / 100,
+                'monthly_sip': round(float(monthly_sip), 2)
+            })
+        
+        simulations = self._cached_rescue_evaluation(
+            goal_id,
+            current_allocation=current_allocation,
             target_amount=float(goal.target_amount),
             years=goal.years_until_due,
-            expected_return=balanced_return,
-            volatility=balanced_volatility,
-            monthly_sip=balanced_sip,
-            num_simulations=1000
-        )
-        
-        strategies.append({
-            'strategy_name': 'Balanced Strategy',
-            'risk_level': 'Medium',
-            'new_expected_return': 10.0,
-            'new_volatility': 10.0,
-            'required_monthly_sip': round(balanced_sip, 2),
-            'success_probability': balanced_simulation['success_probability'],
-            'description': 'Mix of equity and debt funds with moderate risk'
-        })
-        
-        # Strategy 3: Aggressive
-        aggressive_return = 0.14
-        aggressive_volatility = 0.18
-        aggressive_sip = self.calculator.calculate_required_sip(
-            shortfall=metrics['shortfall'],
-            rate=aggressive_return,
-            years=goal.years_until_due
+            scenarios=scenarios
         )
         
-        aggressive_simulation = self.calculator.run_monte_carlo_simulation(
-            current_allocation=metrics['current_allocation'],
-            target_amount=float(goal.target_amount),
-            years=goal.years_until_due,
-            expected_return=aggressive_return,
-            volatility=aggressive_volatility,
-            monthly_sip=aggressive_sip,
-            num_simulations=1000
+        return [
+            {
+                'strategy_name': profile.get('strategy_name') or f"Strategy {index + 1}",
+                'risk_level': profile.get('risk_level') or self.risk_level_for(float(profile['volatility'])),
+                'new_expected_return': float(profile['expected_return']),
+                'new_volatility': float(profile['volatility']),
+                'required_monthly_sip': scenario['monthly_sip'],
+                'success_probability': simulation['success_probability'],
+                'description': profile.get('description') or ''
+            }
+            for index, (profile, scenario, simulation) in enumerate(zip(profiles, scenarios, simulations))
+        ]
+    
+    def _cached_rescue_evaluation(self, goal_id: int, **simulation_params) -> List[Dict]:
+        """
+        Evaluate rescue scenarios in one batch, reusing the cached result for unchanged inputs
+        """
+        options = self.RESCUE_SIMULATION_OPTIONS
+        cache_key = simulation_cache.make_key(goal_id, kind='rescue', **simulation_params, **options)
+        
+        result, _ = simulation_cache.get_or_compute(
+            cache_key,
+            goal_id,
+            lambda: {
+                'scenarios': self.calculator.evaluate_scenarios(**simulation_params, **options)
+            }
         )
-        
-        strategies.append({
-            'strategy_name': 'Aggressive Strategy',
-            'risk_level': 'High',
-            'new_expected_return': 14.0,
-            'new_volatility': 18.0,
-            'required_monthly_sip': round(aggressive_sip, 2),
-            'success_probability': aggressive_simulation['success_probability'],
-            'description': 'Focus on equity funds and growth stocks with higher potential'
-        })
-        
-        return strategies
+        return result['scenarios']
+
+
+class AsyncGoalService:
+    """
+    Async read paths of GoalService, for async routes
+    
+    Like AsyncPortfolioService, each method runs the GoalService method of the
+    same name through AsyncSession.run_sync. Simulations stay on the sync
+    service: they are CPU-bound and belong in the threadpool.
+    """
+    
+    def __init__(self, db: AsyncSession, context: Optional[RequestContext] = None):
+        self.db = db
+        self.service = GoalService(db.sync_session, context)
+    
+    async def _run(self, method, *args, **kwargs):
+        return await self.db.run_sync(lambda _session: method(*args, **kwargs))
+    
+    async def get_all_goals_summary(self, user_id: int) -> List[Dict]:
+        return await self._run(self.service.get_all_goals_summary, user_id)
+    
+    async def get_goal_with_details(self, goal_id: int) -> Optional[Dict]:
+        return await self._run(self.service.get_goal_with_details, goal_id)
+    
+    async def get_goal_history(self, goal_id: int) -> List[Dict]:
+        return await self._run(self.service.get_goal_history, goal_id)
+    
+    async def get_goal_allocations(self, goal_ids: Sequence[int]) -> Dict[int, float]:
+        return await self._run(self.service.get_goal_allocations, goal_ids)
+    
+    async def get_latest_success_probabilities(self, goal_ids: Sequence[int]) -> Dict[int, float]:
+        return await self._run(self.service.get_latest_success_probabilities, goal_ids)
@@ -1,7 +1,54 @@
 import yfinance as yf
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
 from datetime import datetime
+from config import get_settings
+from services.quote_cache import quote_cache
+import asyncio
+import httpx
+import pandas as pd
 import requests
+import time
+
+settings = get_settings()
+
+# Bounded pool shared by every batch quote fetch, so a large batch (or several
+# at once) cannot open an unbounded number of connections to the provider
+_quote_executor = ThreadPoolExecutor(max_workers=settings.quote_fetch_workers, thread_name_prefix="quote-fetch")
+
+# Blocking provider calls made for async routes; kept apart from FastAPI's
+# threadpool so slow quotes cannot starve the routes that need it
+_blocking_executor = ThreadPoolExecutor(
+    max_workers=settings.market_blocking_workers, thread_name_prefix="market-blocking"
+)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Shared async HTTP client for JSON market data sources, with pooled keep-alive connections
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=settings.market_http_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.market_http_max_connections,
+                max_keepalive_connections=settings.market_http_max_connections
+            )
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (application shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class MarketDataService:
     """Service to fetch real-time market data"""
@@ -16,9 +63,16 @@ class MarketDataService:
         "NIFTYIT": "^CNXIT"
     }
     
+    MFAPI_LATEST_URL = "https://api.mfapi.in/mf/{scheme_code}/latest"
+    
     @staticmethod
     def get_index_data(index_name: str = "NIFTY50") -> Dict:
-        """Get real-time index data"""
+        """Get real-time index data (cached for a few seconds)"""
+        return quote_cache.get_or_fetch('index', index_name, lambda: MarketDataService._fetch_index_data(index_name))
+    
+    @staticmethod
+    def _fetch_index_data(index_name: str) -> Optional[Dict]:
+        """Fetch index data from the provider"""
         try:
             ticker_symbol = MarketDataService.INDICES.get(index_name, "^NSEI")
             ticker = yf.Ticker(ticker_symbol)
@@ -29,33 +83,46 @@ class MarketDataService:
             if hist.empty:
                 return None
             
-            current_price = hist['Close'].iloc[-1]
-            previous_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-            
-            change = current_price - previous_close
-            change_percent = (change / previous_close) * 100
-            
-            return {
-                "index_name": index_name,
-                "current_value": round(float(current_price), 2),
-                "previous_close": round(float(previous_close), 2),
-                "change": round(float(change), 2),
-                "change_percent": round(float(change_percent), 2),
-                "day_high": round(float(hist['High'].iloc[-1]), 2),
-                "day_low": round(float(hist['Low'].iloc[-1]), 2),
-                "timestamp": datetime.now().isoformat()
-            }
+            return MarketDataService._index_quote(index_name, hist)
         except Exception as e:
             print(f"Error fetching index data: {e}")
             return None
     
+    @staticmethod
+    def _index_quote(index_name: str, hist: pd.DataFrame) -> Dict:
+        """Build an index quote from its recent daily history"""
+        current_price = hist['Close'].iloc[-1]
+        previous_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
+        
+        change = current_price - previous_close
+        change_percent = (change / previous_close) * 100
+        
+        return {
+            "index_name": index_name,
+            "current_value": round(float(current_price), 2),
+            "previous_close": round(float(previous_close), 2),
+            "change": round(float(change), 2),
+            "change_percent": round(float(change_percent), 2),
+            "day_high": round(float(hist['High'].iloc[-1]), 2),
+            "day_low": round(float(hist['Low'].iloc[-1]), 2),
+            "timestamp": datetime.now().isoformat()
+        }
+    
     @staticmethod
     def get_stock_price(symbol: str, exchange: str = "NS") -> Optional[Dict]:
         """
         Get real-time stock price
         symbol: Stock symbol (e.g., 'RELIANCE', 'TCS', 'INFY', 'CDSL', 'MCX')
         exchange: NS for NSE, BO for BSE
+        Quotes are cached for a few tens of seconds
         """
+        return quote_cache.get_or_fetch(
+            'stock', (symbol, exchange), lambda: MarketDataService._fetch_stock_price(symbol, exchange)
+        )
+    
+    @staticmethod
+    def _fetch_stock_price(symbol: str, exchange: str) -> Optional[Dict]:
+        """Fetch a stock price from the provider"""
         try:
             # Format symbol for yfinance (e.g., RELIANCE.NS)
             ticker_symbol = f"{symbol}.{exchange}"
@@ -67,149 +134,467 @@ class MarketDataService:
             if hist.empty:
                 return None
             
-            current_price = hist['Close'].iloc[-1]
-            
-            # Find the previous trading day's close (not today's open)
-            if len(hist) >= 2:
-                # Get yesterday's closing price
-                previous_close = hist['Close'].iloc[-2]
-            else:
-                previous_close = current_price
-            
-            change = current_price - previous_close
-            change_percent = (change / previous_close) * 100 if previous_close != 0 else 0
-            
-            return {
-                "symbol": symbol,
-                "exchange": exchange,
-                "current_price": round(float(current_price), 2),
-                "previous_close": round(float(previous_close), 2),
-                "change": round(float(change), 2),
-                "change_percent": round(float(change_percent), 2),
-                "day_high": round(float(hist['High'].iloc[-1]), 2),
-                "day_low": round(float(hist['Low'].iloc[-1]), 2),
-                "volume": int(hist['Volume'].iloc[-1]),
-                "timestamp": datetime.now().isoformat()
-            }
+            return MarketDataService._stock_quote(symbol, exchange, hist)
         except Exception as e:
             print(f"Error fetching stock price for {symbol}: {e}")
             return None
     
+    @staticmethod
+    def _stock_quote(symbol: str, exchange: str, hist: pd.DataFrame) -> Dict:
+        """Build a stock quote from its recent daily history"""
+        current_price = hist['Close'].iloc[-1]
+        
+        # Find the previous trading day's close (not today's open)
+        if len(hist) >= 2:
+            # Get yesterday's closing price
+            previous_close = hist['Close'].iloc[-2]
+        else:
+            previous_close = current_price
+        
+        change = current_price - previous_close
+        change_percent = (change / previous_close) * 100 if previous_close != 0 else 0
+        
+        return {
+            "symbol": symbol,
+            "exchange": exchange,
+            "current_price": round(float(current_price), 2),
+            "previous_close": round(float(previous_close), 2),
+            "change": round(float(change), 2),
+            "change_percent": round(float(change_percent), 2),
+            "day_high": round(float(hist['High'].iloc[-1]), 2),
+            "day_low": round(float(hist['Low'].iloc[-1]), 2),
+            "volume": int(hist['Volume'].iloc[-1]),
+            "timestamp": datetime.now().isoformat()
+        }
+    
     @staticmethod
     def get_mutual_fund_nav(scheme_code: str) -> Optional[Dict]:
         """
         Get latest NAV for mutual fund - try as stock symbol first, then MFAPI
         scheme_code: Can be stock-like symbol or AMFi scheme code
+        NAVs are cached for hours since they change once a day
         """
+        return quote_cache.get_or_fetch('mf', scheme_code, lambda: MarketDataService._fetch_mutual_fund_nav(scheme_code))
+    
+    @staticmethod
+    def _fetch_mutual_fund_nav(scheme_code: str) -> Optional[Dict]:
+        """Fetch the latest NAV from Yahoo Finance or MFAPI"""
         try:
-            # Try as a stock symbol with .NS or .BO suffix (some MFs trade as symbols)
-            for suffix in ['.NS', '.BO', '']:
-                try:
-                    ticker_symbol = f"{scheme_code}{suffix}" if suffix else scheme_code
-                    ticker = yf.Ticker(ticker_symbol)
-                    hist = ticker.history(period="5d")
-                    
-                    if not hist.empty:
-                        current_nav = hist['Close'].iloc[-1]
-                        previous_nav = hist['Close'].iloc[-2] if len(hist) > 1 else current_nav
-                        
-                        change = current_nav - previous_nav
-                        change_percent = (change / previous_nav) * 100 if previous_nav != 0 else 0
-                        
-                        return {
-                            "scheme_code": scheme_code,
-                            "nav": round(float(current_nav), 2),
-                            "previous_nav": round(float(previous_nav), 2),
-                            "change": round(float(change), 2),
-                            "change_percent": round(float(change_percent), 2),
-                            "timestamp": datetime.now().isoformat()
-                        }
-                except:
-                    continue
+            nav = MarketDataService._fetch_yahoo_nav(scheme_code)
+            if nav:
+                return nav
             
             # Fallback: Try MFAPI if Yahoo Finance fails
-            url = f"https://api.mfapi.in/mf/{scheme_code}/latest"
-            response = requests.get(url, timeout=5)
+            response = requests.get(MarketDataService.MFAPI_LATEST_URL.format(scheme_code=scheme_code), timeout=5)
             
             if response.status_code == 200:
-                data = response.json()
-                if data and 'data' in data and len(data['data']) > 0:
-                    latest = data['data'][0]
-                    # Get previous NAV for change calculation
-                    prev_nav = data['data'][1]['nav'] if len(data['data']) > 1 else latest['nav']
-                    change = float(latest['nav']) - float(prev_nav)
-                    change_percent = (change / float(prev_nav)) * 100 if float(prev_nav) != 0 else 0
+                return MarketDataService._nav_from_mfapi(scheme_code, response.json())
+            return None
+        except Exception as e:
+            print(f"Error fetching MF NAV for {scheme_code}: {e}")
+            return None
+    
+    @staticmethod
+    def _fetch_yahoo_nav(scheme_code: str) -> Optional[Dict]:
+        """NAV of a fund listed on Yahoo Finance, None if it is not"""
+        # Try as a stock symbol with .NS or .BO suffix (some MFs trade as symbols)
+        for suffix in ['.NS', '.BO', '']:
+            try:
+                ticker_symbol = f"{scheme_code}{suffix}" if suffix else scheme_code
+                ticker = yf.Ticker(ticker_symbol)
+                hist = ticker.history(period="5d")
+                
+                if not hist.empty:
+                    current_nav = hist['Close'].iloc[-1]
+                    previous_nav = hist['Close'].iloc[-2] if len(hist) > 1 else current_nav
+                    
+                    change = current_nav - previous_nav
+                    change_percent = (change / previous_nav) * 100 if previous_nav != 0 else 0
                     
                     return {
                         "scheme_code": scheme_code,
-                        "nav": float(latest['nav']),
-                        "previous_nav": float(prev_nav),
-                        "change": round(change, 2),
-                        "change_percent": round(change_percent, 2),
-                        "date": latest['date'],
+                        "nav": round(float(current_nav), 2),
+                        "previous_nav": round(float(previous_nav), 2),
+                        "change": round(float(change), 2),
+                        "change_percent": round(float(change_percent), 2),
                         "timestamp": datetime.now().isoformat()
                     }
-            return None
-        except Exception as e:
-            print(f"Error fetching MF NAV for {scheme_code}: {e}")
-            return None
+            except:
+                continue
+        return None
+    
+    @staticmethod
+    def _nav_from_mfapi(scheme_code: str, data: Dict) -> Optional[Dict]:
+        """Build a NAV quote from an MFAPI response"""
+        if data and 'data' in data and len(data['data']) > 0:
+            latest = data['data'][0]
+            # Get previous NAV for change calculation
+            prev_nav = data['data'][1]['nav'] if len(data['data']) > 1 else latest['nav']
+            change = float(latest['nav']) - float(prev_nav)
+            change_percent = (change / float(prev_nav)) * 100 if float(prev_nav) != 0 else 0
+            
+            return {
+                "scheme_code": scheme_code,
+                "nav": float(latest['nav']),
+                "previous_nav": float(prev_nav),
+                "change": round(change, 2),
+                "change_percent": round(change_percent, 2),
+                "date": latest['date'],
+                "timestamp": datetime.now().isoformat()
+            }
+        return None
     
     @staticmethod
-    def get_multiple_stocks(symbols: List[str], exchange: str = "NS") -> Dict[str, Dict]:
-        """Get prices for multiple stocks"""
+    def get_multiple_stocks(
+        symbols: List[str],
+        exchange: str = "NS",
+        timeout: Optional[float] = None
+    ) -> Dict[str, Dict]:
+        """
+        Get prices for multiple stocks within one deadline
+        
+        Cached quotes are served as they are. The other symbols are requested in
+        one bulk download; any the download did not return are fetched one by
+        one on the shared pool with the time left.
+        Symbols still pending at the deadline are left out of the result.
+        
+        Args:
+            symbols: Stock symbols
+            exchange: NS for NSE, BO for BSE
+            timeout: Deadline for the whole batch in seconds (default from settings)
+            
+        Returns:
+            Dict of symbol to quote for the symbols fetched in time
+        """
+        symbols = list(dict.fromkeys(symbol.strip() for symbol in symbols if symbol.strip()))
+        deadline = time.monotonic() + (timeout if timeout is not None else settings.quote_batch_timeout_seconds)
+        
         results = {}
         for symbol in symbols:
-            data = MarketDataService.get_stock_price(symbol, exchange)
+            cached = quote_cache.get('stock', (symbol, exchange))
+            if cached is not None:
+                results[symbol] = cached
+        
+        tickers = {symbol: f"{symbol}.{exchange}" for symbol in symbols if symbol not in results}
+        histories = MarketDataService._download_histories(tickers.values(), deadline)
+        for symbol, ticker in tickers.items():
+            if ticker in histories:
+                results[symbol] = MarketDataService._stock_quote(symbol, exchange, histories[ticker])
+                quote_cache.set('stock', (symbol, exchange), results[symbol])
+        
+        missing = [symbol for symbol in symbols if symbol not in results]
+        results.update(MarketDataService.fetch_concurrently(
+            lambda symbol: MarketDataService.get_stock_price(symbol, exchange), missing, deadline
+        ))
+        return results
+    
+    @staticmethod
+    def get_multiple_indices(index_names: List[str], timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Get data for multiple indices within one deadline, as get_multiple_stocks does for stocks
+        """
+        index_names = list(dict.fromkeys(name.strip() for name in index_names if name.strip()))
+        deadline = time.monotonic() + (timeout if timeout is not None else settings.quote_batch_timeout_seconds)
+        
+        results = {}
+        for name in index_names:
+            cached = quote_cache.get('index', name)
+            if cached is not None:
+                results[name] = cached
+        
+        tickers = {
+            name: MarketDataService.INDICES.get(name, "^NSEI") for name in index_names if name not in results
+        }
+        histories = MarketDataService._download_histories(set(tickers.values()), deadline)
+        for name, ticker in tickers.items():
+            if ticker in histories:
+                results[name] = MarketDataService._index_quote(name, histories[ticker])
+                quote_cache.set('index', name, results[name])
+        
+        missing = [name for name in index_names if name not in results]
+        results.update(MarketDataService.fetch_concurrently(MarketDataService.get_index_data, missing, deadline))
+        return results
+    
+    @staticmethod
+    def fetch_concurrently(
+        fetch: Callable[[Hashable], Optional[Dict]],
+        keys: Iterable[Hashable],
+        deadline: float
+    ) -> Dict[Hashable, Dict]:
+        """
+        Run fetch(key) for every key on the shared quote pool until a deadline
+        
+        Args:
+            fetch: Single-key fetch returning a quote or None
+            keys: Keys to fetch
+            deadline: time.monotonic() value by which results must be in
+            
+        Returns:
+            Dict of key to quote for the fetches that finished in time with a result
+        """
+        return MarketDataService._collect_fetches(MarketDataService._submit_fetches(fetch, keys), deadline)
+    
+    @staticmethod
+    def _submit_fetches(fetch: Callable[[Hashable], Optional[Dict]], keys: Iterable[Hashable]) -> Dict:
+        """Start fetch(key) for every key on the shared quote pool; returns futures by key"""
+        return {_quote_executor.submit(fetch, key): key for key in keys}
+    
+    @staticmethod
+    def _collect_fetches(futures: Dict, deadline: float) -> Dict[Hashable, Dict]:
+        """Results of _submit_fetches futures that finish by the deadline"""
+        if not futures:
+            return {}
+        
+        done, pending = wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        for future in pending:
+            # Queued fetches are dropped; running ones finish in the background
+            future.cancel()
+        if pending:
+            print(f"Quote fetch timed out for: {', '.join(str(futures[future]) for future in pending)}")
+        
+        results = {}
+        for future in done:
+            data = future.result()
             if data:
-                results[symbol] = data
+                results[futures[future]] = data
         return results
     
+    @staticmethod
+    def _download_histories(ticker_symbols: Iterable[str], deadline: float) -> Dict[str, pd.DataFrame]:
+        """
+        Recent daily history of several tickers in one bulk download
+        
+        Returns:
+            Dict of ticker to its non-empty history; tickers the download failed for are left out
+        """
+        ticker_symbols = list(ticker_symbols)
+        remaining = deadline - time.monotonic()
+        if not ticker_symbols or remaining <= 0:
+            return {}
+        
+        try:
+            data = yf.download(
+                ticker_symbols, period="5d", group_by="ticker", threads=True,
+                progress=False, timeout=remaining
+            )
+        except Exception as e:
+            print(f"Error in bulk quote download: {e}")
+            return {}
+        
+        if data is None or data.empty:
+            return {}
+        
+        histories = {}
+        for ticker in ticker_symbols:
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            # The bulk frame has one row per date of any ticker; drop the dates this one did not trade
+            hist = data[ticker].dropna(subset=['Close'])
+            if not hist.empty:
+                histories[ticker] = hist
+        return histories
+    
+    @staticmethod
+    def quote_source(asset_class_name: Optional[str]) -> Optional[str]:
+        """
+        Provider to price an asset class with: 'mf' (NAV), 'stock' (exchange price) or None (book value)
+        """
+        asset_class = (asset_class_name or '').strip()
+        # Matched by name rather than substring: 'International Equity' has no
+        # NSE symbol and NPS, bonds, FDs and gold are carried at book value
+        if asset_class == 'Direct Stock':
+            return 'stock'
+        if asset_class.endswith(' MF'):
+            return 'mf'
+        return None
+    
+    @staticmethod
+    def revalue_investments(investments: List[Dict], timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Revalue holdings at live prices, fetching every distinct instrument once under one deadline
+        
+        Holdings are routed to a provider by asset class. NAV fetches start on
+        the shared pool, stock prices are fetched as one batch meanwhile, and
+        the holdings are then valued from the collected quotes. Holdings whose
+        quote is unavailable or late keep their stored value.
+        
+        Args:
+            investments: Dicts with symbol (or scheme_code), asset_class_name, units and values
+            timeout: Deadline for all quotes in seconds (default from settings)
+            
+        Returns:
+            Updated copies of the investments, in the same order
+        """
+        deadline = time.monotonic() + (timeout if timeout is not None else settings.quote_batch_timeout_seconds)
+        
+        instruments = [MarketDataService._instrument(investment) for investment in investments]
+        stock_symbols = list(dict.fromkeys(code for source, code in instruments if source == 'stock'))
+        scheme_codes = list(dict.fromkeys(code for source, code in instruments if source == 'mf'))
+        
+        nav_futures = MarketDataService._submit_fetches(MarketDataService.get_mutual_fund_nav, scheme_codes)
+        quotes = {
+            'stock': MarketDataService.get_multiple_stocks(stock_symbols, timeout=deadline - time.monotonic()),
+            'mf': MarketDataService._collect_fetches(nav_futures, deadline)
+        }
+        
+        return [
+            MarketDataService._apply_quote(investment, source, quotes[source].get(code) if source else None)
+            for investment, (source, code) in zip(investments, instruments)
+        ]
+    
+    @staticmethod
+    def _instrument(investment: Dict) -> tuple:
+        """(provider, symbol or scheme code) of an investment; (None, None) if it is not market-priced"""
+        source = MarketDataService.quote_source(investment.get('asset_class_name'))
+        code = investment.get('symbol')
+        if source == 'mf':
+            code = investment.get('scheme_code') or code
+        return (source, code) if source and code else (None, None)
+    
+    @staticmethod
+    def _apply_quote(investment: Dict, source: Optional[str], quote: Optional[Dict]) -> Dict:
+        """Copy of an investment valued at a stock quote or NAV"""
+        updated_inv = investment.copy()
+        if not quote or not investment.get('units'):
+            return updated_inv
+        
+        if source == 'stock':
+            price = quote['current_price']
+            updated_inv['market_price'] = price
+            updated_inv['price_change_percent'] = quote['change_percent']
+        else:
+            price = quote['nav']
+            updated_inv['current_nav'] = price
+        
+        new_current_value = price * float(investment['units'])
+        updated_inv['current_value'] = round(new_current_value, 2)
+        
+        # Recalculate gains
+        invested = float(investment.get('invested_value', 0))
+        if invested > 0:
+            gain = new_current_value - invested
+            updated_inv['gain_loss'] = round(gain, 2)
+            updated_inv['gain_loss_percentage'] = round((gain / invested) * 100, 2)
+        return updated_inv
+    
     @staticmethod
     def update_investment_current_value(investment: Dict, db_update_callback=None) -> Dict:
         """
         Update current value for a single investment based on real-time data
         Returns updated investment dict
         """
-        updated_inv = investment.copy()
+        try:
+            source, code = MarketDataService._instrument(investment)
+            if source == 'stock':
+                return MarketDataService._apply_quote(investment, source, MarketDataService.get_stock_price(code))
+            if source == 'mf':
+                return MarketDataService._apply_quote(investment, source, MarketDataService.get_mutual_fund_nav(code))
+        except Exception as e:
+            print(f"Error updating investment value: {e}")
         
+        return investment.copy()
+
+
+class AsyncMarketDataService:
+    """
+    Non-blocking market data for async routes
+    
+    Mutual fund NAVs missing from Yahoo Finance come from MFAPI through the
+    shared async HTTP client. yfinance has no async API, so its calls (and the
+    batch methods built on them) run on a dedicated bounded executor. Either
+    way the event loop keeps serving other requests while quotes are slow.
+    Results go through the same quote cache as MarketDataService.
+    """
+    
+    @staticmethod
+    async def _run_blocking(function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_blocking_executor, partial(function, *args, **kwargs))
+    
+    @staticmethod
+    async def get_index_data(index_name: str = "NIFTY50") -> Optional[Dict]:
+        return await AsyncMarketDataService._run_blocking(MarketDataService.get_index_data, index_name)
+    
+    @staticmethod
+    async def get_stock_price(symbol: str, exchange: str = "NS") -> Optional[Dict]:
+        return await AsyncMarketDataService._run_blocking(MarketDataService.get_stock_price, symbol, exchange)
+    
+    @staticmethod
+    async def get_multiple_stocks(
+        symbols: List[str],
+        exchange: str = "NS",
+        timeout: Optional[float] = None
+    ) -> Dict[str, Dict]:
+        return await AsyncMarketDataService._run_blocking(
+            MarketDataService.get_multiple_stocks, symbols, exchange, timeout=timeout
+        )
+    
+    @staticmethod
+    async def get_multiple_indices(index_names: List[str], timeout: Optional[float] = None) -> Dict[str, Dict]:
+        return await AsyncMarketDataService._run_blocking(
+            MarketDataService.get_multiple_indices, index_names, timeout=timeout
+        )
+    
+    @staticmethod
+    async def get_mutual_fund_nav(scheme_code: str) -> Optional[Dict]:
+        """
+        Latest NAV - Yahoo Finance first, then MFAPI over the shared HTTP client
+        """
+        return await quote_cache.get_or_fetch_async(
+            'mf', scheme_code, lambda: AsyncMarketDataService._fetch_mutual_fund_nav(scheme_code)
+        )
+    
+    @staticmethod
+    async def _fetch_mutual_fund_nav(scheme_code: str) -> Optional[Dict]:
         try:
-            # Check asset class and get real-time data
-            asset_class = investment.get('asset_class_name', '').lower()
-            
-            if 'stock' in asset_class or 'equity' in asset_class:
-                symbol = investment.get('symbol')
-                if symbol:
-                    stock_data = MarketDataService.get_stock_price(symbol)
-                    if stock_data and investment.get('units'):
-                        new_current_value = stock_data['current_price'] * float(investment['units'])
-                        updated_inv['current_value'] = round(new_current_value, 2)
-                        updated_inv['market_price'] = stock_data['current_price']
-                        updated_inv['price_change_percent'] = stock_data['change_percent']
-                        
-                        # Recalculate gains
-                        invested = float(investment.get('invested_value', 0))
-                        if invested > 0:
-                            gain = new_current_value - invested
-                            updated_inv['gain_loss'] = round(gain, 2)
-                            updated_inv['gain_loss_percentage'] = round((gain / invested) * 100, 2)
+            nav = await AsyncMarketDataService._run_blocking(MarketDataService._fetch_yahoo_nav, scheme_code)
+            if nav:
+                return nav
             
-            elif 'mf' in asset_class or 'mutual' in asset_class:
-                scheme_code = investment.get('scheme_code')
-                if scheme_code:
-                    nav_data = MarketDataService.get_mutual_fund_nav(scheme_code)
-                    if nav_data and investment.get('units'):
-                        new_current_value = nav_data['nav'] * float(investment['units'])
-                        updated_inv['current_value'] = round(new_current_value, 2)
-                        updated_inv['current_nav'] = nav_data['nav']
-                        
-                        # Recalculate gains
-                        invested = float(investment.get('invested_value', 0))
-                        if invested > 0:
-                            gain = new_current_value - invested
-                            updated_inv['gain_loss'] = round(gain, 2)
-                            updated_inv['gain_loss_percentage'] = round((gain / invested) * 100, 2)
-        
+            response = await get_http_client().get(MarketDataService.MFAPI_LATEST_URL.format(scheme_code=scheme_code))
+            if response.status_code == 200:
+                return MarketDataService._nav_from_mfapi(scheme_code, response.json())
+            return None
         except Exception as e:
-            print(f"Error updating investment value: {e}")
+            print(f"Error fetching MF NAV for {scheme_code}: {e}")
+            return None
+    
+    @staticmethod
+    async def revalue_investments(investments: List[Dict], timeout: Optional[float] = None) -> List[Dict]:
+        """
+        MarketDataService.revalue_investments without blocking the event loop
         
-        return updated_inv
+        Stock prices come from one batch on the blocking executor while the NAVs
+        are fetched concurrently on the loop, all under one deadline. Fetches
+        still running at the deadline finish in the background and fill the cache.
+        """
+        timeout = timeout if timeout is not None else settings.quote_batch_timeout_seconds
+        
+        instruments = [MarketDataService._instrument(investment) for investment in investments]
+        stock_symbols = list(dict.fromkeys(code for source, code in instruments if source == 'stock'))
+        scheme_codes = list(dict.fromkeys(code for source, code in instruments if source == 'mf'))
+        
+        stock_task = asyncio.ensure_future(AsyncMarketDataService.get_multiple_stocks(stock_symbols, timeout=timeout))
+        nav_tasks = {
+            asyncio.ensure_future(AsyncMarketDataService.get_mutual_fund_nav(code)): code for code in scheme_codes
+        }
+        done, pending = await asyncio.wait([stock_task, *nav_tasks], timeout=timeout)
+        for task in pending:
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        
+        quotes = {
+            'stock': stock_task.result() if stock_task in done else {},
+            'mf': {
+                code: task.result() for task, code in nav_tasks.items() if task in done and task.result()
+            }
+        }
+        
+        return [
+            MarketDataService._apply_quote(investment, source, quotes[source].get(code) if source else None)
+            for investment, (source, code) in zip(investments, instruments)
+        ]
+
+
+# Fetches left running past a deadline; referenced here until they finish
+_background_tasks = set()
@@ -0,0 +1,82 @@
+import base64
+import binascii
+import json
+from decimal import Decimal
+from sqlalchemy import and_, or_
+from typing import Any, Callable, Optional, Tuple
+
+
+class KeysetPagination:
+    """
+    Helpers for keyset (cursor) pagination
+
+    A page is ordered by a sort key plus the primary key as tie-breaker, and the
+    cursor holds both values of the last row served. The next page then starts
+    with a WHERE on those values instead of an OFFSET, so every page costs an
+    index range scan however deep the client has paged.
+
+    Cursors are opaque to clients: URL-safe base64 of a small JSON array.
+    """
+
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 500
+
+    @staticmethod
+    def encode_cursor(sort_value: Any, row_id: int) -> str:
+        """
+        Encode the position after a row as a cursor
+        """
+        # Decimals are kept as strings so that the cursor round-trips them exactly
+        if isinstance(sort_value, Decimal):
+            sort_value = str(sort_value)
+        elif hasattr(sort_value, 'isoformat'):
+            sort_value = sort_value.isoformat()
+
+        payload = json.dumps([sort_value, row_id], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str, parse_sort_value: Callable[[Any], Any]) -> Tuple[Any, int]:
+        """
+        Decode a cursor into (sort value, row id)
+
+        Args:
+            cursor: Cursor returned with the previous page
+            parse_sort_value: Converts the stored sort value back to the column's type
+
+        Raises:
+            ValueError: If the cursor is malformed or was issued for another sort
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return parse_sort_value(sort_value), int(row_id)
+        except (binascii.Error, ValueError, TypeError, ArithmeticError):
+            raise ValueError("Invalid pagination cursor")
+
+    @staticmethod
+    def after(sort_key, id_column, sort_value: Any, row_id: int, descending: bool = False):
+        """
+        WHERE clause selecting the rows after (sort_value, row_id) in (sort_key, id_column) order
+        """
+        if descending:
+            return or_(sort_key < sort_value, and_(sort_key == sort_value, id_column < row_id))
+        return or_(sort_key > sort_value, and_(sort_key == sort_value, id_column > row_id))
+
+    @staticmethod
+    def order_by(sort_key, id_column, descending: bool = False) -> tuple:
+        """
+        ORDER BY matching after()
+        """
+        if descending:
+            return sort_key.desc(), id_column.desc()
+        return sort_key.asc(), id_column.asc()
+
+    @staticmethod
+    def clamp_limit(limit: Optional[int]) -> int:
+        """
+        Page size within [1, MAX_LIMIT], DEFAULT_LIMIT if not given
+        """
+        if limit is None:
+            return KeysetPagination.DEFAULT_LIMIT
+        return max(1, min(int(limit), KeysetPagination.MAX_LIMIT))
@@ -1,42 +1,78 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from models import Investment, Portfolio, AssetClass, FamilyMember, InvestmentTransaction
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, case, select, type_coerce, Float
+from models import Investment, Portfolio, AssetClass, FamilyMember, InvestmentTransaction, TransactionTypeEnum
+from services.xirr_solver import XirrSolver
+from services.request_context import RequestContext
+from services.pagination import KeysetPagination
+from services.financial_calculator import FinancialCalculator
+from services.market_data_service import MarketDataService
+from services.price_history import PriceHistoryStore, price_history
 from typing import Dict, List, Optional
 from decimal import Decimal
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+import numpy as np
 
 class PortfolioService:
     """
     Service for portfolio-related business logic
     """
     
-    def __init__(self, db: Session):
+    # Direction of cash for the investor per transaction type (splits and bonuses move no cash)
+    CASH_FLOW_SIGNS = {
+        TransactionTypeEnum.buy: -1,
+        TransactionTypeEnum.sip: -1,
+        TransactionTypeEnum.sell: 1,
+        TransactionTypeEnum.dividend: 1
+    }
+    
+    # Levels at which XIRR can be aggregated, with the investment field that groups them
+    XIRR_LEVELS = {
+        'investment': 'investment_id',
+        'portfolio': 'portfolio_id',
+        'member': 'member_id',
+        'asset_class': 'asset_class_id',
+        'total': None
+    }
+    
+    # Sort keys of the paginated listings, with the parser for values stored in cursors
+    INVESTMENT_SORT_KEYS = ('investment_id', 'name', 'invested_value', 'current_value', 'gain_loss_percentage')
+    TRANSACTION_SORT_KEYS = ('date', 'amount')
+    
+    def __init__(self, db: Session, context: Optional[RequestContext] = None):
         self.db = db
+        # Shared with the other services of the request when injected, private otherwise
+        self.context = context or RequestContext(db)
     
-    def get_total_portfolio_value(self, user_id: int) -> Dict:
+    @staticmethod
+    def member_ids_subquery(user_id: int):
         """
-        Calculate total portfolio value and gains for a user across all family members
+        Subquery selecting the member IDs of a user's family, to filter investments in SQL
         """
-        # Get all family members for this user
-        members = self.db.query(FamilyMember).filter(
+        return select(FamilyMember.member_id).where(
             FamilyMember.user_id == user_id
-        ).all()
-        
-        member_ids = [m.member_id for m in members]
-        
-        # Get all investments for these members
-        investments = self.db.query(Investment).filter(
-            Investment.member_id.in_(member_ids)
-        ).all()
+        )
+    
+    def get_total_portfolio_value(self, user_id: int) -> Dict:
+        """
+        Calculate total portfolio value and gains for a user across all family members
         
-        total_current_value = 0
-        total_invested_value = 0
+        Memoized for the rest of the request.
+        """
+        return self.context.get_or_load(
+            'portfolio_totals', user_id, loader=lambda: self._load_total_portfolio_value(user_id)
+        )
+    
+    def _load_total_portfolio_value(self, user_id: int) -> Dict:
+        totals = self.db.query(
+            func.coalesce(func.sum(Investment.current_value), 0).label('total_current'),
+            func.coalesce(func.sum(Investment.invested_value), 0).label('total_invested')
+        ).filter(
+            Investment.member_id.in_(self.member_ids_subquery(user_id))
+        ).one()
         
-        for inv in investments:
-            if inv.current_value:
-                total_current_value += float(inv.current_value)
-            if inv.invested_value:
-                total_invested_value += float(inv.invested_value)
+        total_current_value = float(totals.total_current)
+        total_invested_value = float(totals.total_invested)
         
         total_gain_loss = total_current_value - total_invested_value
         gain_loss_percentage = (total_gain_loss / total_invested_value * 100) if total_invested_value > 0 else 0
@@ -52,13 +88,6 @@ class PortfolioService:
         """
         Get asset class wise allocation breakdown
         """
-        # Get all family members for this user
-        members = self.db.query(FamilyMember).filter(
-            FamilyMember.user_id == user_id
-        ).all()
-        
-        member_ids = [m.member_id for m in members]
-        
         # Query asset allocation
         allocation = self.db.query(
             AssetClass.name,
@@ -67,7 +96,7 @@ class PortfolioService:
         ).join(
             Investment, Investment.asset_class_id == AssetClass.asset_class_id
         ).filter(
-            Investment.member_id.in_(member_ids)
+            Investment.member_id.in_(self.member_ids_subquery(user_id))
         ).group_by(
             AssetClass.asset_class_id, AssetClass.name
         ).all()
@@ -95,19 +124,28 @@ class PortfolioService:
         """
         Get member-wise portfolio breakdown
         """
-        members = self.db.query(FamilyMember).filter(
+        members = self.db.query(
+            FamilyMember.member_id,
+            FamilyMember.name,
+            FamilyMember.relation,
+            func.coalesce(func.sum(Investment.current_value), 0).label('total_current'),
+            func.coalesce(func.sum(Investment.invested_value), 0).label('total_invested'),
+            func.count(Investment.investment_id).label('num_investments')
+        ).outerjoin(
+            Investment, Investment.member_id == FamilyMember.member_id
+        ).filter(
             FamilyMember.user_id == user_id
+        ).group_by(
+            FamilyMember.member_id, FamilyMember.name, FamilyMember.relation
+        ).order_by(
+            FamilyMember.member_id
         ).all()
         
         result = []
         
         for member in members:
-            investments = self.db.query(Investment).filter(
-                Investment.member_id == member.member_id
-            ).all()
-            
-            total_current = sum(float(inv.current_value or 0) for inv in investments)
-            total_invested = sum(float(inv.invested_value or 0) for inv in investments)
+            total_current = float(member.total_current)
+            total_invested = float(member.total_invested)
             gain_loss = total_current - total_invested
             
             result.append({
@@ -117,7 +155,7 @@ class PortfolioService:
                 'current_value': round(total_current, 2),
                 'invested_value': round(total_invested, 2),
                 'gain_loss': round(gain_loss, 2),
-                'num_investments': len(investments)
+                'num_investments': member.num_investments
             })
         
         return result
@@ -125,18 +163,26 @@ class PortfolioService:
     def get_all_investments_detailed(self, user_id: int) -> List[Dict]:
         """
         Get detailed list of all investments with calculated metrics
-        """
-        members = self.db.query(FamilyMember).filter(
-            FamilyMember.user_id == user_id
-        ).all()
         
-        member_ids = [m.member_id for m in members]
-        
-        investments = self.db.query(
+        Memoized for the rest of the request; callers must not modify the result.
+        """
+        return self.context.get_or_load(
+            'investments_detailed', user_id, loader=lambda: self._load_investments_detailed(user_id)
+        )
+    
+    def _load_investments_detailed(self, user_id: int) -> List[Dict]:
+        return [self._investment_details(row) for row in self._investments_detailed_query(user_id).all()]
+    
+    def _investments_detailed_query(self, user_id: int, *columns):
+        """
+        Query of a user's investments joined with the names shown in listings
+        """
+        return self.db.query(
             Investment,
             AssetClass.name.label('asset_class_name'),
             FamilyMember.name.label('member_name'),
-            Portfolio.portfolio_name
+            Portfolio.portfolio_name,
+            *columns
         ).join(
             AssetClass, Investment.asset_class_id == AssetClass.asset_class_id
         ).join(
@@ -144,34 +190,135 @@ class PortfolioService:
         ).join(
             Portfolio, Investment.portfolio_id == Portfolio.portfolio_id
         ).filter(
-            Investment.member_id.in_(member_ids)
-        ).all()
+            FamilyMember.user_id == user_id
+        )
+    
+    @staticmethod
+    def _investment_details(inv_data) -> Dict:
+        """
+        Format a row of _investments_detailed_query with calculated metrics
+        """
+        inv = inv_data[0]
+        current_val = float(inv.current_value or 0)
+        invested_val = float(inv.invested_value or 0)
+        gain_loss = current_val - invested_val
+        gain_loss_pct = (gain_loss / invested_val * 100) if invested_val > 0 else 0
         
-        result = []
+        return {
+            'investment_id': inv.investment_id,
+            'name': inv.name,
+            'symbol': inv.symbol,
+            'folio_number': inv.folio_number,
+            'asset_class_name': inv_data.asset_class_name,
+            'member_name': inv_data.member_name,
+            'portfolio_name': inv_data.portfolio_name,
+            'invested_value': round(invested_val, 2),
+            'current_value': round(current_val, 2),
+            'units': float(inv.units) if inv.units else None,
+            'gain_loss': round(gain_loss, 2),
+            'gain_loss_percentage': round(gain_loss_pct, 2),
+            'xirr': float(inv.xirr) if inv.xirr is not None else None
+        }
+    
+    @staticmethod
+    def gain_loss_percentage_expression():
+        """
+        SQL expression for an investment's gain/loss percentage, 0 without invested value
+        """
+        invested = func.coalesce(Investment.invested_value, 0)
+        current = func.coalesce(Investment.current_value, 0)
+        return type_coerce(
+            case((invested > 0, (current - invested) * 100 / invested), else_=0),
+            Float
+        )
+    
+    def get_investment_detailed(self, user_id: int, investment_id: int) -> Optional[Dict]:
+        """
+        Get one investment with calculated metrics by primary key
         
-        for inv_data in investments:
-            inv = inv_data[0]
-            current_val = float(inv.current_value or 0)
-            invested_val = float(inv.invested_value or 0)
-            gain_loss = current_val - invested_val
-            gain_loss_pct = (gain_loss / invested_val * 100) if invested_val > 0 else 0
-            
-            result.append({
-                'investment_id': inv.investment_id,
-                'name': inv.name,
-                'symbol': inv.symbol,
-                'folio_number': inv.folio_number,
-                'asset_class_name': inv_data.asset_class_name,
-                'member_name': inv_data.member_name,
-                'portfolio_name': inv_data.portfolio_name,
-                'invested_value': round(invested_val, 2),
-                'current_value': round(current_val, 2),
-                'units': float(inv.units) if inv.units else None,
-                'gain_loss': round(gain_loss, 2),
-                'gain_loss_percentage': round(gain_loss_pct, 2)
-            })
+        Returns:
+            Investment details, or None if it does not exist or belongs to another user
+        """
+        row = self._investments_detailed_query(user_id).filter(
+            Investment.investment_id == investment_id
+        ).first()
         
-        return result
+        return self._investment_details(row) if row else None
+    
+    def get_investments_page(
+        self,
+        user_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = 'investment_id',
+        descending: bool = False,
+        asset_class_id: Optional[int] = None,
+        member_id: Optional[int] = None,
+        min_gain_percentage: Optional[float] = None,
+        max_gain_percentage: Optional[float] = None
+    ) -> Dict:
+        """
+        Get one page of a user's investments, sorted and filtered in SQL
+        
+        Args:
+            user_id: User whose family's investments are listed
+            limit: Page size (capped at KeysetPagination.MAX_LIMIT)
+            cursor: next_cursor of the previous page; None for the first page
+            sort: One of INVESTMENT_SORT_KEYS; ties are broken by investment_id
+            descending: Sort order
+            asset_class_id, member_id: Optional equality filters
+            min_gain_percentage, max_gain_percentage: Optional inclusive gain/loss % range
+        
+        Returns:
+            Dictionary with 'items' (investment details) and 'next_cursor' (None on the last page)
+        
+        Raises:
+            ValueError: If the sort key or cursor is invalid
+        """
+        if sort not in self.INVESTMENT_SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        
+        gain_loss_percentage = self.gain_loss_percentage_expression()
+        sort_keys = {
+            'investment_id': (Investment.investment_id, int),
+            'name': (Investment.name, str),
+            'invested_value': (func.coalesce(Investment.invested_value, 0), Decimal),
+            'current_value': (func.coalesce(Investment.current_value, 0), Decimal),
+            'gain_loss_percentage': (gain_loss_percentage, float)
+        }
+        sort_key, parse_sort_value = sort_keys[sort]
+        limit = KeysetPagination.clamp_limit(limit)
+        
+        query = self._investments_detailed_query(user_id, sort_key.label('sort_key'))
+        
+        if asset_class_id is not None:
+            query = query.filter(Investment.asset_class_id == asset_class_id)
+        if member_id is not None:
+            query = query.filter(Investment.member_id == member_id)
+        if min_gain_percentage is not None:
+            query = query.filter(gain_loss_percentage >= min_gain_percentage)
+        if max_gain_percentage is not None:
+            query = query.filter(gain_loss_percentage <= max_gain_percentage)
+        if cursor:
+            sort_value, last_id = KeysetPagination.decode_cursor(cursor, parse_sort_value)
+            query = query.filter(KeysetPagination.after(
+                sort_key, Investment.investment_id, sort_value, last_id, descending
+            ))
+        
+        # One extra row tells whether there is a next page
+        rows = query.order_by(
+            *KeysetPagination.order_by(sort_key, Investment.investment_id, descending)
+        ).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = KeysetPagination.encode_cursor(rows[-1].sort_key, rows[-1][0].investment_id)
+        
+        return {
+            'items': [self._investment_details(row) for row in rows],
+            'next_cursor': next_cursor
+        }
     
     def get_investment_transactions(self, investment_id: int) -> List[Dict]:
         """
@@ -181,17 +328,89 @@ class PortfolioService:
             InvestmentTransaction.investment_id == investment_id
         ).order_by(InvestmentTransaction.date.desc()).all()
         
-        return [
-            {
-                'transaction_id': t.transaction_id,
-                'date': t.date,
-                'type': t.type.value,
-                'units': float(t.units) if t.units else None,
-                'price_per_unit': float(t.price_per_unit) if t.price_per_unit else None,
-                'amount': float(t.amount) if t.amount else None
-            }
-            for t in transactions
-        ]
+        return [self._transaction_details(t) for t in transactions]
+    
+    def get_investment_transactions_page(
+        self,
+        investment_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = 'date',
+        descending: bool = True,
+        transaction_type: Optional[TransactionTypeEnum] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict:
+        """
+        Get one page of an investment's transactions, sorted and filtered in SQL
+        
+        Args:
+            investment_id: Investment whose transactions are listed
+            limit: Page size (capped at KeysetPagination.MAX_LIMIT)
+            cursor: next_cursor of the previous page; None for the first page
+            sort: One of TRANSACTION_SORT_KEYS; ties are broken by transaction_id
+            descending: Sort order (newest first by default)
+            transaction_type: Optional type filter
+            start_date, end_date: Optional inclusive date range
+        
+        Returns:
+            Dictionary with 'items' (transactions) and 'next_cursor' (None on the last page)
+        
+        Raises:
+            ValueError: If the sort key or cursor is invalid
+        """
+        if sort not in self.TRANSACTION_SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        
+        sort_keys = {
+            'date': (InvestmentTransaction.date, date.fromisoformat),
+            'amount': (func.coalesce(InvestmentTransaction.amount, 0), Decimal)
+        }
+        sort_key, parse_sort_value = sort_keys[sort]
+        limit = KeysetPagination.clamp_limit(limit)
+        
+        query = self.db.query(InvestmentTransaction, sort_key.label('sort_key')).filter(
+            InvestmentTransaction.investment_id == investment_id
+        )
+        
+        if transaction_type is not None:
+            query = query.filter(InvestmentTransaction.type == transaction_type)
+        if start_date is not None:
+            query = query.filter(InvestmentTransaction.date >= start_date)
+        if end_date is not None:
+            query = query.filter(InvestmentTransaction.date <= end_date)
+        if cursor:
+            sort_value, last_id = KeysetPagination.decode_cursor(cursor, parse_sort_value)
+            query = query.filter(KeysetPagination.after(
+                sort_key, InvestmentTransaction.transaction_id, sort_value, last_id, descending
+            ))
+        
+        rows = query.order_by(
+            *KeysetPagination.order_by(sort_key, InvestmentTransaction.transaction_id, descending)
+        ).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = KeysetPagination.encode_cursor(rows[-1].sort_key, rows[-1][0].transaction_id)
+        
+        return {
+            'items': [self._transaction_details(row[0]) for row in rows],
+            'next_cursor': next_cursor
+        }
+    
+    @staticmethod
+    def _transaction_details(t: InvestmentTransaction) -> Dict:
+        return {
+            'transaction_id': t.transaction_id,
+            'investment_id': t.investment_id,
+            'date': t.date,
+            'type': t.type.value,
+            'units': float(t.units) if t.units else None,
+            'price_per_unit': float(t.price_per_unit) if t.price_per_unit else None,
+            'amount': float(t.amount) if t.amount else None,
+            'created_at': t.created_at
+        }
     
     def calculate_daily_change(self, user_id: int) -> Dict:
         """
@@ -205,6 +424,7 @@ class PortfolioService:
         # For now, return mock data
         # In production, query from a portfolio_value_history table
         
+        # Memoized, so callers that already fetched the totals do not pay a second query
         current_portfolio = self.get_total_portfolio_value(user_id)
         
         # Mock: assume 1.5% daily gain
@@ -221,27 +441,426 @@ class PortfolioService:
         """
         Get top performing investments by gain percentage
         """
-        investments = self.get_all_investments_detailed(user_id)
+        return self.get_performers(user_id, limit)['top']
+    
+    def get_worst_performers(self, user_id: int, limit: int = 5) -> List[Dict]:
+        """
+        Get worst performing investments by gain percentage
+        """
+        return self.get_performers(user_id, limit)['worst']
+    
+    def get_performers(self, user_id: int, limit: int = 5) -> Dict[str, List[Dict]]:
+        """
+        Get the top and worst performing investments by gain percentage in one query
+        
+        Ranks the user's investments both ways with ROW_NUMBER() over the gain
+        percentage computed in SQL, and joins names and formats only the rows
+        ranked within the limit, so the Python-side work grows with the limit
+        rather than with the number of holdings. Ties keep investment_id order.
+        Memoized for the rest of the request, so the top and worst lists of one
+        request share the query.
+        
+        Returns:
+            Dictionary with 'top' (best first) and 'worst' (worst first) lists
+            of investment details
+        """
+        return self.context.get_or_load(
+            'performers', user_id, limit, loader=lambda: self._load_performers(user_id, limit)
+        )
+    
+    def _load_performers(self, user_id: int, limit: int) -> Dict[str, List[Dict]]:
+        if limit <= 0:
+            return {'top': [], 'worst': []}
+        
+        gain_loss_percentage = self.gain_loss_percentage_expression()
+        ranked = select(
+            Investment.investment_id,
+            func.row_number().over(
+                order_by=(gain_loss_percentage.desc(), Investment.investment_id)
+            ).label('top_rank'),
+            func.row_number().over(
+                order_by=(gain_loss_percentage.asc(), Investment.investment_id)
+            ).label('worst_rank')
+        ).where(
+            Investment.member_id.in_(self.member_ids_subquery(user_id))
+        ).subquery()
+        
+        rows = self._investments_detailed_query(
+            user_id, ranked.c.top_rank, ranked.c.worst_rank
+        ).join(
+            ranked, ranked.c.investment_id == Investment.investment_id
+        ).filter(
+            (ranked.c.top_rank <= limit) | (ranked.c.worst_rank <= limit)
+        ).all()
+        
+        top = sorted((row for row in rows if row.top_rank <= limit), key=lambda row: row.top_rank)
+        worst = sorted((row for row in rows if row.worst_rank <= limit), key=lambda row: row.worst_rank)
+        
+        return {
+            'top': [self._investment_details(row) for row in top],
+            'worst': [self._investment_details(row) for row in worst]
+        }
+    
+    def _load_cash_flows(self, user_id: int, investment_ids: Optional[List[int]] = None) -> Dict:
+        """
+        Load the cash flow ledger of a user's investments as flat arrays
+        
+        Buys and SIPs are outflows, sells and dividends inflows, and the current
+        value is an inflow as of today. When the ledger records less money in than
+        invested_value (holdings carried over from before the ledger), the gap is
+        treated as an opening purchase on the first transaction date, or on the
+        creation date for investments without transactions.
+        
+        Returns:
+            Dictionary with 'investments' (one row per investment, in group order)
+            and the flat 'amounts', 'day_numbers' and 'group_index' arrays
+        """
+        query = self.db.query(
+            Investment.investment_id,
+            Investment.name,
+            Investment.portfolio_id,
+            Investment.member_id,
+            Investment.asset_class_id,
+            Investment.invested_value,
+            Investment.current_value,
+            Investment.created_at,
+            Investment.xirr,
+            Portfolio.portfolio_name,
+            FamilyMember.name.label('member_name'),
+            AssetClass.name.label('asset_class_name')
+        ).join(
+            FamilyMember, Investment.member_id == FamilyMember.member_id
+        ).join(
+            Portfolio, Investment.portfolio_id == Portfolio.portfolio_id
+        ).join(
+            AssetClass, Investment.asset_class_id == AssetClass.asset_class_id
+        ).filter(
+            FamilyMember.user_id == user_id
+        )
+        if investment_ids is not None:
+            query = query.filter(Investment.investment_id.in_(investment_ids))
+        investments = query.order_by(Investment.investment_id).all()
+        
+        # Signed cash amounts are computed in SQL so that rows come back as plain numbers
+        outflow_types = [t for t, sign in self.CASH_FLOW_SIGNS.items() if sign < 0]
+        cash_amount = func.coalesce(
+            InvestmentTransaction.amount,
+            InvestmentTransaction.units * InvestmentTransaction.price_per_unit
+        )
+        signed_amount = type_coerce(
+            case((InvestmentTransaction.type.in_(outflow_types), -cash_amount), else_=cash_amount),
+            Float
+        )
+        transaction_query = self.db.query(
+            InvestmentTransaction.investment_id,
+            InvestmentTransaction.date,
+            signed_amount.label('amount')
+        ).join(
+            Investment, InvestmentTransaction.investment_id == Investment.investment_id
+        ).join(
+            FamilyMember, Investment.member_id == FamilyMember.member_id
+        ).filter(
+            FamilyMember.user_id == user_id,
+            InvestmentTransaction.type.in_(list(self.CASH_FLOW_SIGNS)),
+            cash_amount.isnot(None)
+        )
+        if investment_ids is not None:
+            transaction_query = transaction_query.filter(
+                InvestmentTransaction.investment_id.in_(investment_ids)
+            )
+        transactions = transaction_query.all() if investments else []
+        
+        num_investments = len(investments)
+        sorted_ids = np.array([inv.investment_id for inv in investments], dtype=np.int64)
         
-        # Sort by gain_loss_percentage descending
-        sorted_investments = sorted(
-            investments,
-            key=lambda x: x['gain_loss_percentage'],
-            reverse=True
+        if transactions:
+            transaction_ids, transaction_dates, transaction_amounts = zip(*transactions)
+            ledger_index = np.searchsorted(sorted_ids, np.array(transaction_ids, dtype=np.int64))
+            ledger_days = np.array([d.toordinal() for d in transaction_dates], dtype=np.int64)
+            ledger_amounts = np.array(transaction_amounts, dtype=float)
+        else:
+            ledger_index = np.empty(0, dtype=np.intp)
+            ledger_days = np.empty(0, dtype=np.int64)
+            ledger_amounts = np.empty(0)
+        
+        paid_in = -np.bincount(
+            ledger_index, weights=np.minimum(ledger_amounts, 0), minlength=num_investments
         )
+        no_transactions = np.iinfo(np.int64).max
+        first_day = np.full(num_investments, no_transactions, dtype=np.int64)
+        np.minimum.at(first_day, ledger_index, ledger_days)
+        
+        today = date.today().toordinal()
+        created_days = np.array([
+            inv.created_at.date().toordinal() if inv.created_at else today for inv in investments
+        ], dtype=np.int64)
+        invested_values = np.array([float(inv.invested_value or 0) for inv in investments])
+        current_values = np.array([float(inv.current_value or 0) for inv in investments])
         
-        return sorted_investments[:limit]
+        opening = invested_values - paid_in
+        has_opening = opening > 0.005
+        opening_days = np.where(first_day == no_transactions, created_days, first_day)
+        has_value = current_values != 0
+        
+        return {
+            'investments': investments,
+            'amounts': np.concatenate([ledger_amounts, -opening[has_opening], current_values[has_value]]),
+            'day_numbers': np.concatenate([
+                ledger_days, opening_days[has_opening], np.full(int(has_value.sum()), today, dtype=np.int64)
+            ]),
+            'group_index': np.concatenate([
+                ledger_index, np.flatnonzero(has_opening), np.flatnonzero(has_value)
+            ]).astype(np.intp)
+        }
     
-    def get_worst_performers(self, user_id: int, limit: int = 5) -> List[Dict]:
+    def calculate_xirr(self, user_id: int, level: str = 'investment') -> List[Dict]:
         """
-        Get worst performing investments by gain percentage
+        Calculate XIRR for all of a user's investments, or aggregated by level
+        
+        All series are solved in one batched call. Each investment's solve starts
+        from its stored XIRR; aggregates start from the value-weighted average of
+        their investments' stored rates.
+        
+        Args:
+            level: 'investment', 'portfolio', 'member', 'asset_class' or 'total'
+            
+        Returns:
+            One dict per group with its id, name, xirr (percent, None if undefined),
+            current_value and num_cash_flows
         """
-        investments = self.get_all_investments_detailed(user_id)
+        if level not in self.XIRR_LEVELS:
+            raise ValueError(f"Unknown XIRR level: {level}")
+        
+        ledger = self._load_cash_flows(user_id)
+        investments = ledger['investments']
+        
+        if not investments:
+            return []
+        
+        # Map every investment to its group at the requested level
+        key_field = self.XIRR_LEVELS[level]
+        name_field = {
+            'investment': 'name',
+            'portfolio': 'portfolio_name',
+            'member': 'member_name',
+            'asset_class': 'asset_class_name'
+        }.get(level)
+        keys = [getattr(inv, key_field) if key_field else None for inv in investments]
+        group_keys = list(dict.fromkeys(keys))
+        group_position = {key: group for group, key in enumerate(group_keys)}
+        group_of_investment = np.array([group_position[key] for key in keys])
+        num_groups = len(group_keys)
         
-        # Sort by gain_loss_percentage ascending
-        sorted_investments = sorted(
-            investments,
-            key=lambda x: x['gain_loss_percentage']
+        current_values = np.array([float(inv.current_value or 0) for inv in investments])
+        stored_rates = np.array([
+            float(inv.xirr) / 100 if inv.xirr is not None else np.nan for inv in investments
+        ])
+        guesses = self._weighted_guesses(stored_rates, current_values, group_of_investment, num_groups)
+        
+        group_index = group_of_investment[ledger['group_index']]
+        rates = XirrSolver.solve(
+            ledger['amounts'], ledger['day_numbers'], group_index, num_groups, guesses
         )
         
-        return sorted_investments[:limit]
+        group_values = np.bincount(group_of_investment, weights=current_values, minlength=num_groups)
+        flow_counts = np.bincount(group_index, minlength=num_groups)
+        names = {}
+        for inv, group in zip(investments, group_of_investment):
+            names.setdefault(group, getattr(inv, name_field) if name_field else 'Total')
+        
+        return [
+            {
+                'level': level,
+                'id': group_keys[group],
+                'name': names[group],
+                'xirr': round(float(rates[group]) * 100, 2) if np.isfinite(rates[group]) else None,
+                'current_value': round(float(group_values[group]), 2),
+                'num_cash_flows': int(flow_counts[group])
+            }
+            for group in range(num_groups)
+        ]
+    
+    @staticmethod
+    def _weighted_guesses(
+        stored_rates: np.ndarray,
+        current_values: np.ndarray,
+        group_of_investment: np.ndarray,
+        num_groups: int
+    ) -> np.ndarray:
+        """
+        Starting XIRR per group: value-weighted mean of stored rates (NaN if none stored)
+        """
+        known = np.isfinite(stored_rates)
+        weights = np.where(known, np.maximum(current_values, 0) + 1e-9, 0)
+        weighted = np.bincount(
+            group_of_investment, weights=np.where(known, stored_rates, 0) * weights, minlength=num_groups
+        )
+        total = np.bincount(group_of_investment, weights=weights, minlength=num_groups)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, weighted / total, np.nan)
+    
+    def refresh_xirr(self, user_id: int, investment_ids: Optional[List[int]] = None) -> List[Dict]:
+        """
+        Recalculate and store XIRR for a user's investments
+        
+        Warm-started from the stored rates, so after a new transaction or price
+        update Newton typically converges in a couple of steps. Pass
+        investment_ids to refresh only those investments.
+        """
+        ledger = self._load_cash_flows(user_id, investment_ids)
+        investments = ledger['investments']
+        
+        if not investments:
+            return []
+        
+        guesses = np.array([
+            float(inv.xirr) / 100 if inv.xirr is not None else np.nan for inv in investments
+        ])
+        rates = XirrSolver.solve(
+            ledger['amounts'], ledger['day_numbers'], ledger['group_index'], len(investments), guesses
+        )
+        
+        updated_at = datetime.utcnow()
+        # Rates beyond the column's range (e.g. a huge gain within days) are not stored
+        stored = [
+            round(float(rate) * 100, 4) if np.isfinite(rate) and abs(rate) < 1e4 else None
+            for rate in rates
+        ]
+        self.db.bulk_update_mappings(Investment, [
+            {
+                'investment_id': inv.investment_id,
+                'xirr': Decimal(str(xirr)) if xirr is not None else None,
+                'xirr_updated_at': updated_at
+            }
+            for inv, xirr in zip(investments, stored)
+        ])
+        self.db.commit()
+        self.context.invalidate('investments_detailed')
+        
+        return [
+            {
+                'investment_id': inv.investment_id,
+                'name': inv.name,
+                'xirr': round(xirr, 2) if xirr is not None else None,
+                'xirr_updated_at': updated_at
+            }
+            for inv, xirr in zip(investments, stored)
+        ]
+    
+    def get_portfolio_metrics(self, user_id: int, years: int = 3) -> Dict:
+        """
+        Risk and return metrics of the current holdings from local price history
+        
+        Monthly returns of every market-priced holding come from the price
+        history store (no network calls) and are weighted by current value;
+        each month uses the holdings with a return for it. NIFTY 50 is the
+        benchmark for beta and alpha, which only use the months it has a
+        return for and are left out when it has fewer than two.
+        
+        Args:
+            user_id: User ID
+            years: Months of history to use, in years
+            
+        Returns:
+            Dict with the FinancialCalculator portfolio metrics, the number of
+            months used, the number of those with a benchmark return and the
+            share of portfolio value that has history
+        """
+        investments = self.get_all_investments_detailed(user_id)
+        holdings = [
+            (PriceHistoryStore.instrument(inv['asset_class_name'], inv['symbol']), inv['current_value'])
+            for inv in investments
+        ]
+        holdings = [(instrument, value) for instrument, value in holdings if instrument and value > 0]
+        total_value = sum(inv['current_value'] for inv in investments)
+        
+        if not holdings:
+            return {'months': 0, 'benchmark_months': 0, 'coverage_percentage': 0.0}
+        
+        instruments = list(dict.fromkeys(instrument for instrument, _ in holdings))
+        weights = np.zeros(len(instruments))
+        for instrument, value in holdings:
+            weights[instruments.index(instrument)] += value
+        
+        start = date.today() - timedelta(days=365 * years + 31)
+        benchmark = ('index', MarketDataService.INDICES['NIFTY50'])
+        _, returns = price_history.return_matrix([*instruments, benchmark], start=start, frequency='M')
+        holding_returns, benchmark_returns = returns[:, :-1], returns[:, -1]
+        
+        # Weight each month over the holdings that have a return for it
+        available = ~np.isnan(holding_returns)
+        month_weights = np.where(available, weights, 0.0)
+        weight_sums = month_weights.sum(axis=1)
+        months = weight_sums > 0
+        portfolio_returns = (
+            np.nan_to_num(holding_returns[months]) * month_weights[months]
+        ).sum(axis=1) / weight_sums[months]
+        metrics = FinancialCalculator.calculate_portfolio_metrics(portfolio_returns.tolist())
+        
+        # A missing benchmark month only drops that month from beta and alpha
+        benchmarked = ~np.isnan(benchmark_returns[months])
+        if benchmarked.sum() >= 2:
+            relative = FinancialCalculator.calculate_portfolio_metrics(
+                portfolio_returns[benchmarked].tolist(), benchmark_returns[months][benchmarked].tolist()
+            )
+            metrics.update({'beta': relative['beta'], 'alpha': relative['alpha']})
+        
+        covered_value = weights[available.any(axis=0)].sum() if len(holding_returns) else 0.0
+        metrics.update({
+            'months': int(months.sum()),
+            'benchmark_months': int(benchmarked.sum()),
+            'coverage_percentage': round(covered_value / total_value * 100, 2) if total_value > 0 else 0.0
+        })
+        return metrics
+
+
+class AsyncPortfolioService:
+    """
+    Async read paths of PortfolioService, for async routes
+    
+    Each method runs the PortfolioService method of the same name through
+    AsyncSession.run_sync. The SQL goes through the async driver, so while a
+    request waits on the database the event loop serves others instead of the
+    request holding a threadpool slot; the query code is shared with the sync
+    service.
+    """
+    
+    def __init__(self, db: AsyncSession, context: Optional[RequestContext] = None):
+        self.db = db
+        self.service = PortfolioService(db.sync_session, context)
+    
+    async def _run(self, method, *args, **kwargs):
+        return await self.db.run_sync(lambda _session: method(*args, **kwargs))
+    
+    async def get_total_portfolio_value(self, user_id: int) -> Dict:
+        return await self._run(self.service.get_total_portfolio_value, user_id)
+    
+    async def calculate_daily_change(self, user_id: int) -> Dict:
+        return await self._run(self.service.calculate_daily_change, user_id)
+    
+    async def get_asset_allocation(self, user_id: int) -> List[Dict]:
+        return await self._run(self.service.get_asset_allocation, user_id)
+    
+    async def get_member_wise_allocation(self, user_id: int) -> List[Dict]:
+        return await self._run(self.service.get_member_wise_allocation, user_id)
+    
+    async def get_all_investments_detailed(self, user_id: int) -> List[Dict]:
+        return await self._run(self.service.get_all_investments_detailed, user_id)
+    
+    async def get_investment_detailed(self, user_id: int, investment_id: int) -> Optional[Dict]:
+        return await self._run(self.service.get_investment_detailed, user_id, investment_id)
+    
+    async def get_investments_page(self, user_id: int, **kwargs) -> Dict:
+        return await self._run(self.service.get_investments_page, user_id, **kwargs)
+    
+    async def get_investment_transactions_page(self, investment_id: int, **kwargs) -> Dict:
+        return await self._run(self.service.get_investment_transactions_page, investment_id, **kwargs)
+    
+    async def get_performers(self, user_id: int, limit: int = 5) -> Dict[str, List[Dict]]:
+        return await self._run(self.service.get_performers, user_id, limit)
+    
+    async def get_top_performers(self, user_id: int, limit: int = 5) -> List[Dict]:
+        return await self._run(self.service.get_top_performers, user_id, limit)
+    
+    async def get_worst_performers(self, user_id: int, limit: int = 5) -> List[Dict]:
+        return await self._run(self.service.get_worst_performers, user_id, limit)
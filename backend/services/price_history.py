@@ -0,0 +1,286 @@
+import yfinance as yf
+from config import get_settings
+from services.market_data_service import MarketDataService
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+import requests
+import threading
+import time
+import os
+
+class PriceHistoryStore:
+    """
+    Local, append-only daily price history per instrument
+
+    Each instrument is a directory with one flat binary file per column
+    (date, open, high, low, close, volume), read back as numpy memmaps, so a
+    slice costs a binary search on the dates and no parsing or copying.
+    Instruments are (kind, symbol) pairs: 'stock' and 'index' use the Yahoo
+    Finance ticker (e.g. 'RELIANCE.NS', '^NSEI'), 'mf' the AMFI scheme code.
+    NAV series store the NAV as close and NaN for the other columns.
+
+    Rows are only ever appended after the last stored date, so backfill()
+    downloads just the missing dates and repeated runs are no-ops.
+    """
+
+    COLUMNS = {
+        'date': np.dtype('datetime64[D]'),
+        'open': np.dtype('float64'),
+        'high': np.dtype('float64'),
+        'low': np.dtype('float64'),
+        'close': np.dtype('float64'),
+        'volume': np.dtype('float64')
+    }
+
+    MFAPI_HISTORY_URL = "https://api.mfapi.in/mf/{scheme_code}"
+
+    def __init__(self, root: str, history_years: int = 5):
+        self.root = root
+        self.history_years = history_years
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def instrument(
+        asset_class_name: Optional[str],
+        symbol: Optional[str],
+        exchange: str = "NS"
+    ) -> Optional[Tuple[str, str]]:
+        """(kind, symbol) under which a holding's history is stored, None if it is not market-priced"""
+        source = MarketDataService.quote_source(asset_class_name)
+        if not source or not symbol:
+            return None
+        return ('mf', symbol) if source == 'mf' else ('stock', f"{symbol}.{exchange}")
+
+    # Storage
+
+    def _path(self, kind: str, symbol: str, column: str) -> str:
+        return os.path.join(self.root, kind, quote(symbol, safe=''), f"{column}.bin")
+
+    def _length(self, kind: str, symbol: str) -> int:
+        """Rows written to every column; a partly written append is ignored"""
+        lengths = []
+        for column, dtype in self.COLUMNS.items():
+            path = self._path(kind, symbol, column)
+            lengths.append(os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0)
+        return min(lengths)
+
+    def _column(self, kind: str, symbol: str, column: str, length: int) -> np.ndarray:
+        if length == 0:
+            return np.empty(0, dtype=self.COLUMNS[column])
+        return np.memmap(self._path(kind, symbol, column), dtype=self.COLUMNS[column], mode='r', shape=(length,))
+
+    def last_date(self, kind: str, symbol: str) -> Optional[date]:
+        length = self._length(kind, symbol)
+        if length == 0:
+            return None
+        return self._column(kind, symbol, 'date', length)[-1].astype(date)
+
+    def append(self, kind: str, symbol: str, history: pd.DataFrame) -> int:
+        """
+        Append the rows of a daily history dated after the last stored date
+
+        Args:
+            history: DataFrame indexed by date with Close and optionally Open, High, Low, Volume
+
+        Returns:
+            Number of rows appended
+        """
+        if history is None or history.empty:
+            return 0
+
+        dates = pd.DatetimeIndex(history.index).tz_localize(None).values.astype('datetime64[D]')
+        order = np.argsort(dates, kind='stable')
+        dates = dates[order]
+        # One row per date, keeping the last
+        keep = np.append(dates[1:] != dates[:-1], True)
+
+        with self._lock:
+            length = self._length(kind, symbol)
+            if length:
+                keep &= dates > self._column(kind, symbol, 'date', length)[-1]
+            if not keep.any():
+                return 0
+
+            columns = {'date': dates[keep]}
+            for column in ('open', 'high', 'low', 'close', 'volume'):
+                values = history[column.capitalize()].to_numpy(dtype='float64') if column.capitalize() in history \
+                    else np.full(len(history), np.nan)
+                columns[column] = values[order][keep]
+
+            os.makedirs(os.path.dirname(self._path(kind, symbol, 'date')), exist_ok=True)
+            # Drop the tail of an interrupted append, then write the dates last so
+            # that the row count only moves once every column has the new rows
+            for column in ('open', 'high', 'low', 'close', 'volume', 'date'):
+                path = self._path(kind, symbol, column)
+                with open(path, 'ab') as f:
+                    f.truncate(length * self.COLUMNS[column].itemsize)
+                    f.write(columns[column].astype(self.COLUMNS[column]).tobytes())
+            return int(keep.sum())
+
+    def series(
+        self,
+        kind: str,
+        symbol: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Iterable[str] = ('date', 'close')
+    ) -> Dict[str, np.ndarray]:
+        """
+        Stored columns of an instrument between two dates (inclusive), as read-only memmap slices
+        """
+        length = self._length(kind, symbol)
+        dates = self._column(kind, symbol, 'date', length)
+        lo = np.searchsorted(dates, np.datetime64(start, 'D'), 'left') if start else 0
+        hi = np.searchsorted(dates, np.datetime64(end, 'D'), 'right') if end else length
+        return {column: self._column(kind, symbol, column, length)[lo:hi] for column in columns}
+
+    # Analytics
+
+    def price_matrix(
+        self,
+        instruments: List[Tuple[str, str]],
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Closing prices of several instruments aligned on the union of their dates
+
+        Each instrument carries its last known price forward over dates it has no
+        row for (holidays of its exchange, NAVs not yet published); dates before
+        its first row are NaN.
+
+        Returns:
+            (dates, prices) with prices of shape (len(dates), len(instruments))
+        """
+        series = [self.series(kind, symbol, start, end) for kind, symbol in instruments]
+        if not series:
+            return np.empty(0, dtype='datetime64[D]'), np.empty((0, 0))
+
+        dates = np.unique(np.concatenate([s['date'] for s in series]))
+        prices = np.full((len(dates), len(series)), np.nan)
+        for i, s in enumerate(series):
+            if len(s['date']):
+                last = np.searchsorted(s['date'], dates, 'right') - 1
+                observed = last >= 0
+                prices[observed, i] = s['close'][last[observed]]
+        return dates, prices
+
+    def return_matrix(
+        self,
+        instruments: List[Tuple[str, str]],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        frequency: str = 'D'
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simple returns of several instruments on a common calendar
+
+        Args:
+            instruments: (kind, symbol) pairs
+            frequency: 'D' for daily returns or 'M' for month-end to month-end returns
+
+        Returns:
+            (period end dates, returns) with returns of shape (periods, len(instruments));
+            NaN where an instrument has no price at the start of the period
+        """
+        if frequency not in ('D', 'M'):
+            raise ValueError("frequency must be 'D' or 'M'")
+
+        dates, prices = self.price_matrix(instruments, start, end)
+        if frequency == 'M' and len(dates):
+            months = dates.astype('datetime64[M]')
+            month_ends = np.append(np.flatnonzero(months[1:] != months[:-1]), len(dates) - 1)
+            dates, prices = dates[month_ends], prices[month_ends]
+
+        if len(dates) < 2:
+            return dates[:0], np.empty((0, len(instruments)))
+        return dates[1:], prices[1:] / prices[:-1] - 1
+
+    # Backfill
+
+    def backfill(self, instruments: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """
+        Download and append the dates missing for each instrument
+
+        Yahoo Finance instruments are downloaded in bulk, one request per
+        distinct start date; NAV histories come from MFAPI concurrently.
+
+        Returns:
+            Rows appended per instrument
+        """
+        today = date.today()
+        default_start = today - timedelta(days=365 * self.history_years)
+        instruments = list(dict.fromkeys(instruments))
+
+        starts = {}
+        for kind, symbol in instruments:
+            last = self.last_date(kind, symbol)
+            start = last + timedelta(days=1) if last else default_start
+            if start <= today:
+                starts[(kind, symbol)] = start
+
+        appended = {instrument: 0 for instrument in instruments}
+
+        by_start: Dict[date, List[Tuple[str, str]]] = {}
+        for instrument, start in starts.items():
+            if instrument[0] != 'mf':
+                by_start.setdefault(start, []).append(instrument)
+        for start, group in by_start.items():
+            for (kind, symbol), history in self._download(group, start).items():
+                appended[(kind, symbol)] = self.append(kind, symbol, history)
+
+        scheme_codes = [symbol for kind, symbol in starts if kind == 'mf']
+        deadline = time.monotonic() + settings.quote_batch_timeout_seconds
+        for scheme_code, history in MarketDataService.fetch_concurrently(
+            self._fetch_nav_history, scheme_codes, deadline
+        ).items():
+            appended[('mf', scheme_code)] = self.append('mf', scheme_code, history['history'])
+
+        return appended
+
+    @staticmethod
+    def _download(instruments: List[Tuple[str, str]], start: date) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """Daily OHLCV from start of several Yahoo Finance instruments in one bulk request"""
+        tickers = [symbol for _, symbol in instruments]
+        try:
+            data = yf.download(tickers, start=start.isoformat(), group_by="ticker", progress=False)
+        except Exception as e:
+            print(f"Error downloading price history: {e}")
+            return {}
+
+        if data is None or data.empty:
+            return {}
+
+        histories = {}
+        for kind, symbol in instruments:
+            if symbol in data.columns.get_level_values(0):
+                histories[(kind, symbol)] = data[symbol].dropna(subset=['Close'])
+        return histories
+
+    @staticmethod
+    def _fetch_nav_history(scheme_code: str) -> Optional[Dict]:
+        """Full NAV history of a scheme from MFAPI (wrapped in a dict for fetch_concurrently)"""
+        try:
+            response = requests.get(
+                PriceHistoryStore.MFAPI_HISTORY_URL.format(scheme_code=scheme_code),
+                timeout=settings.market_http_timeout_seconds
+            )
+            if response.status_code != 200:
+                return None
+            rows = response.json().get('data') or []
+            if not rows:
+                return None
+            history = pd.DataFrame({
+                'Close': [float(row['nav']) for row in rows]
+            }, index=pd.to_datetime([row['date'] for row in rows], format='%d-%m-%Y'))
+            return {'history': history}
+        except Exception as e:
+            print(f"Error fetching NAV history for {scheme_code}: {e}")
+            return None
+
+
+settings = get_settings()
+price_history = PriceHistoryStore(settings.price_history_dir, settings.price_history_years)
@@ -0,0 +1,181 @@
+from sqlalchemy import select
+from database import SessionLocal
+from models import AssetClass, GoalInvestmentMapping, Investment
+from config import get_settings
+from services.market_data_service import MarketDataService
+from services.simulation_cache import simulation_cache
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional
+import threading
+import time
+
+class PriceRefresher:
+    """
+    Background thread keeping Investment.current_value at market prices
+
+    Each cycle collects the distinct stock symbols and fund scheme codes of all
+    market-priced holdings, fetches their quotes in batches (one bulk download
+    per batch of stocks, concurrent NAV fetches per batch of funds) and writes
+    the new values and last_priced_at in one bulk UPDATE. Read paths then use
+    stored values and never wait on market data.
+
+    The bulk UPDATE bypasses the ORM events that invalidate cached simulations,
+    so the cycle drops the cached results of goals mapped to repriced holdings
+    itself.
+    """
+
+    def __init__(self, session_factory=SessionLocal, interval_seconds: float = 300, batch_size: int = 50):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.cycles = 0
+        self.failures = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_result: Dict = {}
+        self.last_error: Optional[str] = None
+
+    def start(self) -> None:
+        """Start refreshing in a daemon thread; the first cycle runs immediately"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="price-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh_once()
+            except Exception as e:
+                with self._lock:
+                    self.failures += 1
+                    self.last_error = str(e)
+                print(f"Error refreshing investment prices: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def refresh_once(self) -> Dict:
+        """
+        Run one refresh cycle
+
+        Returns:
+            Dict with the number of instruments requested, quotes received,
+            investments repriced and goals whose cached simulations were dropped
+        """
+        start = time.perf_counter()
+
+        with self.session_factory() as db:
+            holdings = db.query(
+                Investment.investment_id,
+                Investment.symbol,
+                Investment.units,
+                Investment.current_value,
+                AssetClass.name.label('asset_class_name')
+            ).join(
+                AssetClass, Investment.asset_class_id == AssetClass.asset_class_id
+            ).filter(
+                Investment.symbol.isnot(None),
+                Investment.units > 0
+            ).all()
+
+            sources = [MarketDataService.quote_source(holding.asset_class_name) for holding in holdings]
+            stock_symbols = list(dict.fromkeys(
+                holding.symbol for holding, source in zip(holdings, sources) if source == 'stock'
+            ))
+            scheme_codes = list(dict.fromkeys(
+                holding.symbol for holding, source in zip(holdings, sources) if source == 'mf'
+            ))
+            prices = {
+                'stock': self._fetch_stock_prices(stock_symbols),
+                'mf': self._fetch_navs(scheme_codes)
+            }
+
+            priced_at = datetime.utcnow()
+            updates = []
+            changed_ids = []
+            for holding, source in zip(holdings, sources):
+                price = prices[source].get(holding.symbol) if source else None
+                if price is None:
+                    continue
+                current_value = (Decimal(str(price)) * holding.units).quantize(Decimal('0.01'), ROUND_HALF_UP)
+                updates.append({
+                    'investment_id': holding.investment_id,
+                    'current_value': current_value,
+                    'last_priced_at': priced_at
+                })
+                if current_value != holding.current_value:
+                    changed_ids.append(holding.investment_id)
+
+            goal_ids = []
+            if updates:
+                db.bulk_update_mappings(Investment, updates)
+                if changed_ids:
+                    goal_ids = list(db.execute(
+                        select(GoalInvestmentMapping.goal_id).where(
+                            GoalInvestmentMapping.investment_id.in_(changed_ids)
+                        ).distinct()
+                    ).scalars())
+                db.commit()
+                simulation_cache.invalidate_goals(goal_ids)
+
+        result = {
+            'instruments': len(stock_symbols) + len(scheme_codes),
+            'quotes': len(prices['stock']) + len(prices['mf']),
+            'investments_priced': len(updates),
+            'investments_changed': len(changed_ids),
+            'goals_invalidated': len(goal_ids),
+            'duration_ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+        with self._lock:
+            self.cycles += 1
+            self.last_run_at = priced_at
+            self.last_result = result
+            self.last_error = None
+        return result
+
+    def _fetch_stock_prices(self, symbols: List[str]) -> Dict[str, float]:
+        prices = {}
+        for batch in self._batches(symbols):
+            quotes = MarketDataService.get_multiple_stocks(batch)
+            prices.update({symbol: quote['current_price'] for symbol, quote in quotes.items()})
+        return prices
+
+    def _fetch_navs(self, scheme_codes: List[str]) -> Dict[str, float]:
+        navs = {}
+        for batch in self._batches(scheme_codes):
+            deadline = time.monotonic() + settings.quote_batch_timeout_seconds
+            quotes = MarketDataService.fetch_concurrently(MarketDataService.get_mutual_fund_nav, batch, deadline)
+            navs.update({code: quote['nav'] for code, quote in quotes.items()})
+        return navs
+
+    def _batches(self, items: List[str]) -> List[List[str]]:
+        return [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'interval_seconds': self.interval_seconds,
+                'batch_size': self.batch_size,
+                'cycles': self.cycles,
+                'failures': self.failures,
+                'last_run_at': self.last_run_at.isoformat() if self.last_run_at else None,
+                'last_result': dict(self.last_result),
+                'last_error': self.last_error
+            }
+
+
+settings = get_settings()
+price_refresher = PriceRefresher(
+    interval_seconds=settings.price_refresh_interval_seconds,
+    batch_size=settings.price_refresh_batch_size
+)
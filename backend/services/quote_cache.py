@@ -0,0 +1,190 @@
+from concurrent.futures import Future
+import asyncio
+from config import get_settings
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+class QuoteCache:
+    """
+    Bounded LRU + TTL cache of market quotes with single-flight fetching
+
+    Entries are keyed by instrument kind ('index', 'stock', 'mf') and symbol,
+    and expire after the TTL of their kind: index levels move by the second,
+    stock prices are fine for tens of seconds and a mutual fund NAV changes
+    once a day. Concurrent misses for the same instrument wait on one upstream
+    fetch instead of each making their own, so upstream traffic follows the
+    number of distinct instruments rather than the number of requests; this
+    holds across threads and async callers alike. Failed fetches (None) are
+    not cached.
+    """
+
+    def __init__(self, ttl_seconds: Dict[str, float], max_entries: int = 4096):
+        self.ttl_seconds = dict(ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Dict]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, Hashable], Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fetches = 0
+        self.fetch_failures = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, kind: str, key: Hashable) -> Optional[Dict]:
+        """
+        Cached quote if fresh; counts a hit or a miss
+        """
+        with self._lock:
+            value = self._fresh((kind, key))
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(value)
+
+    def set(self, kind: str, key: Hashable, value: Dict) -> None:
+        with self._lock:
+            self._store((kind, key), value)
+
+    def get_or_fetch(self, kind: str, key: Hashable, fetch: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Cached quote, or the result of fetch() shared with every concurrent caller for the same instrument
+        """
+        cache_key = (kind, key)
+        value, in_flight, owner = self._begin(cache_key)
+        if in_flight is None:
+            return value
+        if not owner:
+            return self._copy(in_flight.result())
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            self._fail(cache_key, in_flight, e)
+            raise
+        return self._finish(cache_key, in_flight, value)
+
+    async def get_or_fetch_async(
+        self,
+        kind: str,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Optional[Dict]]]
+    ) -> Optional[Dict]:
+        """
+        get_or_fetch for coroutines; waits for an in-flight fetch without blocking the event loop
+        """
+        cache_key = (kind, key)
+        value, in_flight, owner = self._begin(cache_key)
+        if in_flight is None:
+            return value
+        if not owner:
+            # Shielded so that a cancelled waiter does not cancel the shared fetch
+            return self._copy(await asyncio.shield(asyncio.wrap_future(in_flight)))
+
+        try:
+            value = await fetch()
+        except BaseException as e:
+            self._fail(cache_key, in_flight, e)
+            raise
+        return self._finish(cache_key, in_flight, value)
+
+    def _begin(self, cache_key: Tuple[str, Hashable]) -> Tuple[Optional[Dict], Optional[Future], bool]:
+        """
+        (cached value, None, False) on a hit; otherwise (None, in-flight future, whether the caller must fetch)
+        """
+        with self._lock:
+            value = self._fresh(cache_key)
+            if value is not None:
+                self.hits += 1
+                return dict(value), None, False
+
+            self.misses += 1
+            in_flight = self._in_flight.get(cache_key)
+            if in_flight is not None:
+                self.coalesced += 1
+                return None, in_flight, False
+
+            in_flight = self._in_flight[cache_key] = Future()
+            # Running futures cannot be cancelled by their waiters
+            in_flight.set_running_or_notify_cancel()
+            self.fetches += 1
+            return None, in_flight, True
+
+    def _finish(self, cache_key: Tuple[str, Hashable], in_flight: Future, value: Optional[Dict]) -> Optional[Dict]:
+        with self._lock:
+            if value is None:
+                self.fetch_failures += 1
+            else:
+                self._store(cache_key, value)
+            del self._in_flight[cache_key]
+        in_flight.set_result(value)
+        return self._copy(value)
+
+    def _fail(self, cache_key: Tuple[str, Hashable], in_flight: Future, error: BaseException) -> None:
+        with self._lock:
+            self.fetch_failures += 1
+            del self._in_flight[cache_key]
+        in_flight.set_exception(error)
+
+    @staticmethod
+    def _copy(value: Optional[Dict]) -> Optional[Dict]:
+        return dict(value) if value is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': dict(self.ttl_seconds),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0.0,
+                'coalesced': self.coalesced,
+                'fetches': self.fetches,
+                'fetch_failures': self.fetch_failures,
+                'in_flight': len(self._in_flight),
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def _fresh(self, cache_key: Tuple[str, Hashable]) -> Optional[Dict]:
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[cache_key]
+            self.expirations += 1
+            return None
+
+        self._entries.move_to_end(cache_key)
+        return value
+
+    def _store(self, cache_key: Tuple[str, Hashable], value: Dict) -> None:
+        self._entries.pop(cache_key, None)
+        self._entries[cache_key] = (time.monotonic() + self.ttl_seconds[cache_key[0]], dict(value))
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+settings = get_settings()
+quote_cache = QuoteCache(
+    ttl_seconds={
+        'index': settings.quote_cache_index_ttl_seconds,
+        'stock': settings.quote_cache_stock_ttl_seconds,
+        'mf': settings.quote_cache_nav_ttl_seconds
+    },
+    max_entries=settings.quote_cache_size
+)
@@ -0,0 +1,85 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from database import get_db, get_async_read_db
+from typing import Any, Callable, Dict, Hashable, Iterable, Sequence
+
+
+class RequestContext:
+    """
+    Unit-of-work cache shared by the services handling one request
+
+    Facts that several services (or several calls of one service) need - the
+    portfolio totals, the detailed investment set, goal allocations, latest
+    simulation results - are loaded once and reused for the rest of the request.
+    The context lives only as long as the request, so there is no cross-request
+    staleness; services that write call invalidate() for the facts they change.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._values: Dict[tuple, Any] = {}
+        self._keyed_values: Dict[str, Dict[Hashable, Any]] = {}
+
+    def get_or_load(self, namespace: str, *args: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Get a memoized value, loading it on first use
+        """
+        key = (namespace, *args)
+        if key not in self._values:
+            self._values[key] = loader()
+        return self._values[key]
+
+    def get_or_load_many(
+        self,
+        namespace: str,
+        ids: Iterable[Hashable],
+        loader: Callable[[Sequence[Hashable]], Dict[Hashable, Any]]
+    ) -> Dict[Hashable, Any]:
+        """
+        Get memoized values for several ids, loading only the missing ones in one call
+
+        The loader receives the missing ids and returns a dict for them; ids it
+        leaves out are remembered as absent and omitted from the result.
+        """
+        known = self._keyed_values.setdefault(namespace, {})
+        ids = list(dict.fromkeys(ids))
+        missing = [id_ for id_ in ids if id_ not in known]
+
+        if missing:
+            loaded = loader(missing)
+            for id_ in missing:
+                known[id_] = loaded.get(id_, _ABSENT)
+
+        return {id_: known[id_] for id_ in ids if known[id_] is not _ABSENT}
+
+    def invalidate(self, *namespaces: str) -> None:
+        """
+        Forget memoized values in the given namespaces, or everything if none are given
+        """
+        if not namespaces:
+            self._values.clear()
+            self._keyed_values.clear()
+            return
+
+        for namespace in namespaces:
+            self._keyed_values.pop(namespace, None)
+        self._values = {key: value for key, value in self._values.items() if key[0] not in namespaces}
+
+
+# Marks ids the loader was asked for but returned nothing for
+_ABSENT = object()
+
+
+def get_request_context(db: Session = Depends(get_db)) -> RequestContext:
+    """
+    FastAPI dependency: one RequestContext per request, shared by every service using it
+    """
+    return RequestContext(db)
+
+
+def get_async_request_context(db: AsyncSession = Depends(get_async_read_db)) -> RequestContext:
+    """
+    FastAPI dependency: the RequestContext of an async read-only request, shared by its async services
+    """
+    return RequestContext(db.sync_session)
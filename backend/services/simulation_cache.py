@@ -0,0 +1,164 @@
+from sqlalchemy import event, inspect, select
+from models import Goal, GoalInvestmentMapping, Investment
+from config import get_settings
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import threading
+import hashlib
+import json
+import time
+
+class SimulationCache:
+    """
+    Bounded LRU + TTL cache of simulation results
+
+    Entries are keyed by a canonical hash of the goal and every simulation input
+    (allocation, target, horizon, return, volatility, SIP and run settings) and
+    tagged with their goal, so that changes to the goal, its mappings or the
+    value of a mapped investment can drop all of the goal's entries at once.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict]]" = OrderedDict()
+        self._keys_by_goal: Dict[int, set] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(goal_id: int, **params) -> str:
+        """
+        Build a canonical key; floats are rounded so equal inputs hash equally
+        """
+        canonical = {
+            name: round(float(value), 6) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+            for name, value in params.items()
+        }
+        payload = json.dumps({'goal_id': goal_id, **canonical}, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, goal_id, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key, goal_id)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def set(self, key: str, goal_id: int, value: Dict) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, self._entries[key][1])
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, goal_id, dict(value))
+            self._keys_by_goal.setdefault(goal_id, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest_key, (_, oldest_goal, _) = next(iter(self._entries.items()))
+                self._remove(oldest_key, oldest_goal)
+                self.evictions += 1
+
+    def get_or_compute(self, key: str, goal_id: int, compute: Callable[[], Dict]) -> Tuple[Dict, bool]:
+        """
+        Return (result, cached); computes and stores the result on a miss
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        value = compute()
+        self.set(key, goal_id, value)
+        return value, False
+
+    def invalidate_goals(self, goal_ids: Iterable[int]) -> None:
+        with self._lock:
+            for goal_id in set(goal_ids):
+                for key in self._keys_by_goal.pop(goal_id, set()):
+                    if self._entries.pop(key, None) is not None:
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_goal.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+    def _remove(self, key: str, goal_id: int) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_goal.get(goal_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_goal[goal_id]
+
+
+settings = get_settings()
+simulation_cache = SimulationCache(
+    max_entries=settings.simulation_cache_size,
+    ttl_seconds=settings.simulation_cache_ttl_seconds
+)
+
+
+# Invalidation hooks - fire on flush for any session that changes simulation inputs
+
+def _goals_for_investment(connection, investment_id: int) -> list:
+    return list(connection.execute(
+        select(GoalInvestmentMapping.goal_id).where(
+            GoalInvestmentMapping.investment_id == investment_id
+        )
+    ).scalars())
+
+
+@event.listens_for(Investment, "after_update")
+def _investment_updated(mapper, connection, target):
+    if inspect(target).attrs.current_value.history.has_changes():
+        simulation_cache.invalidate_goals(_goals_for_investment(connection, target.investment_id))
+
+
+@event.listens_for(Investment, "after_delete")
+def _investment_deleted(mapper, connection, target):
+    simulation_cache.invalidate_goals(_goals_for_investment(connection, target.investment_id))
+
+
+@event.listens_for(GoalInvestmentMapping, "after_insert")
+@event.listens_for(GoalInvestmentMapping, "after_update")
+@event.listens_for(GoalInvestmentMapping, "after_delete")
+def _mapping_changed(mapper, connection, target):
+    goal_history = inspect(target).attrs.goal_id.history
+    simulation_cache.invalidate_goals([target.goal_id, *goal_history.deleted])
+
+
+@event.listens_for(Goal, "after_update")
+@event.listens_for(Goal, "after_delete")
+def _goal_changed(mapper, connection, target):
+    simulation_cache.invalidate_goals([target.goal_id])
@@ -0,0 +1,1069 @@
+import numpy as np
+from scipy.stats import norm, qmc, t as student_t
+from scipy.special import ndtri
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import multiprocessing
+import threading
+import secrets
+import math
+import os
+
+# Process pools for large runs, keyed by worker count and created on first use
+_process_pools: Dict[int, ProcessPoolExecutor] = {}
+_process_pools_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Get (or lazily start) the shared process pool with the given number of workers
+    """
+    with _process_pools_lock:
+        pool = _process_pools.get(workers)
+        if pool is None:
+            # Spawned workers avoid forking a multi-threaded server process
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _process_pools[workers] = pool
+        return pool
+
+
+def _discard_process_pool(workers: int) -> None:
+    """
+    Forget a broken pool so that the next large run starts a fresh one
+    """
+    with _process_pools_lock:
+        pool = _process_pools.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _simulate_chunk(
+    seed_sequence: np.random.SeedSequence,
+    num_paths: int,
+    months: int,
+    current_allocation: float,
+    monthly_sip: float,
+    monthly_return: float,
+    monthly_volatility: float
+) -> np.ndarray:
+    """
+    Simulate terminal values for one chunk of paths from its own random stream
+
+    Shocks are drawn month by month for all paths, a block of months at a time
+    into one reused buffer, and folded into the per-path factors with Horner's
+    scheme. This skips the full paths x months cumulative product and keeps the
+    working set in cache. Module-level so that it can be sent to pool workers.
+    """
+    rng = SimulationEngine.make_generator(seed_sequence)
+    lump_factor = np.ones(num_paths)
+    sip_factor = np.zeros(num_paths)
+    buffer = np.empty((min(months, SimulationEngine.SHOCK_BLOCK_MONTHS), num_paths))
+
+    for start in range(0, months, len(buffer)):
+        growth = buffer[:min(len(buffer), months - start)]
+        rng.standard_normal(out=growth)
+        growth *= monthly_volatility
+        growth += 1 + monthly_return
+        for month_growth in growth:
+            # Add the SIP, then compound, as in the per-path recursion
+            sip_factor += 1
+            sip_factor *= month_growth
+            lump_factor *= month_growth
+
+    return current_allocation * lump_factor + monthly_sip * sip_factor
+
+
+@lru_cache(maxsize=256)
+def _correlation_factor(correlation: Tuple[Tuple[float, ...], ...]) -> np.ndarray:
+    """
+    Factor a correlation matrix as L @ L.T, cached per assumption set
+
+    Uses Cholesky where possible and falls back to an eigendecomposition for
+    positive semi-definite matrices (e.g. two holdings sharing one proxy asset).
+    """
+    matrix = np.array(correlation, dtype=float)
+
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Correlation matrix must be square")
+    if not np.allclose(matrix, matrix.T) or not np.allclose(np.diag(matrix), 1):
+        raise ValueError("Correlation matrix must be symmetric with a unit diagonal")
+
+    try:
+        factor = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+        if eigenvalues.min() < -1e-8:
+            raise ValueError("Correlation matrix must be positive semi-definite")
+        factor = eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+    # Shared between requests through the cache, so it must never be modified
+    factor.setflags(write=False)
+    return factor
+
+
+class SimulationEngine:
+    """
+    Vectorized Monte Carlo engine for goal projections
+
+    Each path follows the same monthly recursion as before - add the SIP, then
+    compound by (1 + r) - but the whole shock matrix is drawn in one call and the
+    recursion is solved with cumulative products instead of Python loops:
+
+        V_T = V_0 * P_0 + SIP * (P_0 + P_1 + ... + P_{T-1})
+        P_k = (1 + r_k) * (1 + r_{k+1}) * ... * (1 + r_{T-1})
+
+    Runs are reproducible: paths are split into fixed-size chunks, and chunk i
+    always draws from child i of SeedSequence(seed). Chunking depends only on the
+    horizon, so a seed gives bit-identical results whether the chunks run inline
+    or on a process pool of any size. Fixed-size runs fold the shocks in month
+    by month instead (see _simulate_chunk), which gives the same V_T.
+    """
+
+    # Upper bound on shock matrix cells held in memory at once (~16 MB of float64)
+    MAX_CHUNK_CELLS = 2_000_000
+
+    # Months of shocks drawn at once by fixed-size runs (~1 MB per 5,000 paths)
+    SHOCK_BLOCK_MONTHS = 24
+
+    # Projection bands keep every path in memory (paths x months float64), so
+    # their path count is capped; 10,000 paths over 30 years is ~29 MB
+    MAX_PROJECTION_PATHS = 10_000
+    MAX_PROJECTION_QUANTILES = 21
+
+    # Runs with at least this many paths are spread over a process pool
+    PARALLEL_MIN_PATHS = 100_000
+
+    # Seeds are kept below 2**63 so they fit a signed BIGINT column
+    SEED_BITS = 63
+
+    # Percentiles reported as worst / median / best outcome
+    PERCENTILES = (10, 50, 90)
+
+    # Default percentile bands for projection charts
+    PROJECTION_QUANTILES = (10, 50, 90)
+
+    # Sampling schemes for adaptive-precision runs
+    SAMPLING_METHODS = ('standard', 'antithetic', 'sobol')
+
+    # Paths per adaptive batch; a power of two keeps Sobol points balanced
+    ADAPTIVE_BATCH_SIZE = 512
+
+    # Independently scrambled Sobol batches needed before a CI is trusted
+    MIN_QMC_REPLICATES = 4
+
+    @staticmethod
+    def new_seed() -> int:
+        """
+        Draw a fresh seed from OS entropy for a run that was not given one
+        """
+        return secrets.randbits(SimulationEngine.SEED_BITS)
+
+    @staticmethod
+    def make_generator(seed: Optional[Union[int, np.random.SeedSequence]] = None) -> np.random.Generator:
+        """
+        Create an independent random generator for one simulation run or chunk
+
+        SFC64 is the fastest bit generator numpy ships; a private generator per run
+        keeps concurrent requests from sharing the global np.random state.
+        """
+        return np.random.Generator(np.random.SFC64(seed))
+
+    @staticmethod
+    def chunk_sizes(num_paths: int, months: int) -> List[int]:
+        """
+        Split a run into chunks of paths; depends only on run size and horizon
+        """
+        chunk_size = max(1, SimulationEngine.MAX_CHUNK_CELLS // months)
+        full_chunks, remainder = divmod(num_paths, chunk_size)
+        return [chunk_size] * full_chunks + ([remainder] if remainder else [])
+
+    @staticmethod
+    def monthly_parameters(expected_return: float, volatility: float) -> Tuple[float, float]:
+        """
+        Convert annual return/volatility (as decimals) to monthly drift and volatility
+        """
+        return float(expected_return) / 12, float(volatility) / math.sqrt(12)
+
+    @staticmethod
+    def growth_factors(
+        shocks: np.ndarray,
+        monthly_return: float,
+        monthly_volatility: float,
+        out: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reduce a (paths, months) matrix of standard normal shocks to per-path factors
+
+        Without an out buffer the shock matrix is overwritten to avoid allocating
+        a second matrix; pass one to keep the shocks for further scenarios.
+
+        Returns:
+            Tuple of (lump_factor, sip_factor) arrays such that the terminal value of
+            a path is current_allocation * lump_factor + monthly_sip * sip_factor
+        """
+        # Shocks are i.i.d. across months, so columns are read as months counted back
+        # from the horizon. A forward cumulative product then yields the compounding
+        # from each month to the horizon without reversing the matrix. Works in place.
+        growth = np.multiply(shocks, monthly_volatility, out=shocks if out is None else out)
+        growth += 1 + monthly_return
+        np.cumprod(growth, axis=1, out=growth)
+
+        return growth[:, -1].copy(), growth.sum(axis=1)
+
+    @staticmethod
+    def simulate_terminal_values(
+        current_allocation: float,
+        years: int,
+        expected_return: float,
+        volatility: float,
+        monthly_sip: float = 0,
+        num_simulations: int = 5000,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Simulate terminal portfolio values for every path
+
+        Paths are processed in chunks so that memory stays bounded for large runs.
+
+        Args:
+            seed: Seed for a reproducible run; a fresh one is drawn if omitted
+            workers: Number of worker processes; by default runs of at least
+                PARALLEL_MIN_PATHS paths use every CPU and smaller runs stay inline
+        """
+        months = years * 12
+        monthly_return, monthly_volatility = SimulationEngine.monthly_parameters(
+            expected_return, volatility
+        )
+
+        if seed is None:
+            seed = SimulationEngine.new_seed()
+
+        sizes = SimulationEngine.chunk_sizes(num_simulations, months)
+        chunk_seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        chunk_args = [
+            (chunk_seed, size, months, float(current_allocation), float(monthly_sip),
+             monthly_return, monthly_volatility)
+            for chunk_seed, size in zip(chunk_seeds, sizes)
+        ]
+
+        if workers is None:
+            parallel = num_simulations >= SimulationEngine.PARALLEL_MIN_PATHS
+            workers = (os.cpu_count() or 1) if parallel else 1
+        workers = min(workers, len(chunk_args))
+
+        chunks = None
+        if workers > 1:
+            try:
+                pool = _get_process_pool(workers)
+                chunks = list(pool.map(_simulate_chunk, *zip(*chunk_args)))
+            except BrokenProcessPool as e:
+                # Drop the dead pool and finish inline; chunk streams make the
+                # result identical either way
+                print(f"Simulation process pool failed, running inline: {e}")
+                _discard_process_pool(workers)
+
+        if chunks is None:
+            chunks = [_simulate_chunk(*args) for args in chunk_args]
+
+        return np.concatenate(chunks) if chunks else np.empty(0)
+
+    @staticmethod
+    def summarize_outcomes(outcomes: np.ndarray, target_amount: float) -> Dict[str, float]:
+        """
+        Summarize terminal values into median/worst/best outcome and success probability
+        """
+        worst_case, median_outcome, best_case = np.percentile(
+            outcomes, SimulationEngine.PERCENTILES
+        )
+        success_probability = np.mean(outcomes >= float(target_amount)) * 100
+
+        return {
+            'median_outcome': round(float(median_outcome), 2),
+            'worst_case': round(float(worst_case), 2),
+            'best_case': round(float(best_case), 2),
+            'success_probability': round(float(success_probability), 2)
+        }
+
+    @staticmethod
+    def run(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        expected_return: float,
+        volatility: float,
+        monthly_sip: float = 0,
+        num_simulations: int = 5000,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, float]:
+        """
+        Run a full Monte Carlo simulation for a goal
+
+        The same seed and inputs always reproduce the same result.
+
+        Returns:
+            Dictionary with median_outcome, worst_case, best_case, success_probability
+        """
+        current_allocation = float(current_allocation)
+
+        if years <= 0:
+            success = 1.0 if current_allocation >= float(target_amount) else 0.0
+            return {
+                'median_outcome': current_allocation,
+                'worst_case': current_allocation,
+                'best_case': current_allocation,
+                'success_probability': success * 100
+            }
+
+        outcomes = SimulationEngine.simulate_terminal_values(
+            current_allocation=current_allocation,
+            years=years,
+            expected_return=expected_return,
+            volatility=volatility,
+            monthly_sip=monthly_sip,
+            num_simulations=num_simulations,
+            seed=seed,
+            workers=workers
+        )
+
+        return SimulationEngine.summarize_outcomes(outcomes, target_amount)
+
+    @staticmethod
+    def draw_shocks(
+        seed_sequence: np.random.SeedSequence,
+        num_paths: int,
+        months: int,
+        sampling: str = 'standard'
+    ) -> np.ndarray:
+        """
+        Draw a (num_paths, months) matrix of standard normal shocks
+
+        'antithetic' pairs every path with its mirror image (row i and row
+        i + num_paths / 2, for an even num_paths); 'sobol' maps a scrambled Sobol point set through the
+        inverse normal CDF, one dimension per month.
+        """
+        if sampling == 'sobol':
+            sobol = qmc.Sobol(
+                d=months,
+                scramble=True,
+                seed=SimulationEngine.make_generator(seed_sequence)
+            )
+            uniforms = sobol.random(num_paths)
+            # Scrambled points are never exactly 0 or 1, but guard the tails anyway
+            np.clip(uniforms, 1e-12, 1 - 1e-12, out=uniforms)
+            return ndtri(uniforms)
+
+        rng = SimulationEngine.make_generator(seed_sequence)
+
+        if sampling == 'antithetic':
+            half = rng.standard_normal(((num_paths + 1) // 2, months))
+            return np.concatenate([half, -half])[:num_paths]
+
+        return rng.standard_normal((num_paths, months))
+
+    @staticmethod
+    def run_adaptive(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        expected_return: float,
+        volatility: float,
+        monthly_sip: float = 0,
+        target_precision: float = 0.5,
+        confidence: float = 0.95,
+        sampling: str = 'antithetic',
+        max_simulations: int = 200_000,
+        batch_size: int = ADAPTIVE_BATCH_SIZE,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Run a Monte Carlo simulation until success probability is known to a target precision
+
+        Paths are simulated in batches; after each batch the confidence interval
+        of the success probability is recomputed and the run stops as soon as
+        its half-width is within target_precision. Clearly red or clearly green
+        goals therefore stop after one or two batches.
+
+        The interval is built from the variance of independent units: single
+        paths for 'standard', mirrored pairs for 'antithetic' and whole batches
+        (independent scrambles) for 'sobol'. Its half-width never drops below
+        -ln(1 - confidence) / paths (the "rule of three"), so a run with no
+        failures yet cannot claim more precision than its path count supports.
+
+        Args:
+            target_precision: Required CI half-width in percentage points;
+                0 simply runs the full max_simulations budget
+            confidence: Confidence level of the interval
+            sampling: One of SAMPLING_METHODS
+            max_simulations: Path budget; the run stops here even if not converged
+            batch_size: Paths per batch (rounded to a power of two for Sobol)
+            seed: Seed for a reproducible run; a fresh one is drawn if omitted
+
+        Returns:
+            Dictionary with median_outcome, worst_case, best_case,
+            success_probability, ci_low, ci_high, ci_half_width, confidence,
+            num_simulations (paths used), sampling and converged
+        """
+        if sampling not in SimulationEngine.SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method: {sampling}")
+
+        current_allocation = float(current_allocation)
+        target_amount = float(target_amount)
+
+        if years <= 0:
+            result = SimulationEngine.run(current_allocation, target_amount, years,
+                                          expected_return, volatility, monthly_sip)
+            return {
+                **result,
+                'ci_low': result['success_probability'],
+                'ci_high': result['success_probability'],
+                'ci_half_width': 0.0,
+                'confidence': confidence,
+                'num_simulations': 0,
+                'sampling': sampling,
+                'converged': True
+            }
+
+        months = years * 12
+        monthly_return, monthly_volatility = SimulationEngine.monthly_parameters(
+            expected_return, volatility
+        )
+
+        if sampling == 'sobol':
+            batch_size = 1 << max(1, int(batch_size) - 1).bit_length()
+            min_batches = SimulationEngine.MIN_QMC_REPLICATES
+        else:
+            batch_size = max(2, int(batch_size) // 2 * 2)
+            min_batches = 1
+        max_batches = max(min_batches, max_simulations // batch_size)
+
+        if seed is None:
+            seed = SimulationEngine.new_seed()
+        root_seed = np.random.SeedSequence(seed)
+
+        z_score = norm.ppf(0.5 + confidence / 2)
+        resolution = -math.log(1 - confidence)
+
+        outcome_batches = []
+        unit_batches = []
+        success_probability = 0.0
+        half_width = 1.0
+        converged = False
+
+        for batch in range(max_batches):
+            shocks = SimulationEngine.draw_shocks(
+                root_seed.spawn(1)[0], batch_size, months, sampling
+            )
+            lump_factor, sip_factor = SimulationEngine.growth_factors(
+                shocks, monthly_return, monthly_volatility
+            )
+            outcomes = current_allocation * lump_factor + monthly_sip * sip_factor
+            hits = (outcomes >= target_amount).astype(float)
+
+            outcome_batches.append(outcomes)
+            if sampling == 'antithetic':
+                half = batch_size // 2
+                unit_batches.append((hits[:half] + hits[half:]) / 2)
+            elif sampling == 'sobol':
+                unit_batches.append(np.array([hits.mean()]))
+            else:
+                unit_batches.append(hits)
+
+            num_batches = batch + 1
+            if num_batches < min_batches:
+                continue
+
+            units = np.concatenate(unit_batches)
+            paths = num_batches * batch_size
+            success_probability = float(units.mean())
+
+            if len(units) > 1:
+                critical = student_t.ppf(0.5 + confidence / 2, len(units) - 1) \
+                    if sampling == 'sobol' else z_score
+                half_width = critical * float(units.std(ddof=1)) / math.sqrt(len(units))
+            half_width = max(half_width, resolution / paths)
+
+            if half_width * 100 <= target_precision:
+                converged = True
+                break
+
+        all_outcomes = np.concatenate(outcome_batches)
+        result = SimulationEngine.summarize_outcomes(all_outcomes, target_amount)
+
+        return {
+            **result,
+            'success_probability': round(success_probability * 100, 2),
+            'ci_low': round(max(0.0, success_probability - half_width) * 100, 2),
+            'ci_high': round(min(1.0, success_probability + half_width) * 100, 2),
+            'ci_half_width': round(half_width * 100, 2),
+            'confidence': confidence,
+            'num_simulations': len(all_outcomes),
+            'sampling': sampling,
+            'converged': converged
+        }
+
+    @staticmethod
+    def evaluate_scenarios(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        scenarios: Sequence[Dict],
+        num_simulations: int = 2000,
+        sampling: str = 'standard',
+        seed: Optional[int] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Evaluate many (return, volatility, SIP) scenarios against shared shocks
+
+        Every scenario is driven by the same standard normal shock matrix (common
+        random numbers), so differences between scenarios reflect the scenarios
+        and not sampling noise. Because the SIP enters terminal value linearly,
+        scenarios that differ only in SIP share one set of growth factors; the
+        cost grows with the number of distinct (return, volatility) pairs.
+
+        Args:
+            scenarios: Dicts with 'expected_return' and 'volatility' (as decimals)
+                and an optional 'monthly_sip'
+            sampling: One of SAMPLING_METHODS for the shared shock matrix
+            seed: Seed for a reproducible run; a fresh one is drawn if omitted
+
+        Returns:
+            One result dict per scenario, in order, with median_outcome,
+            worst_case, best_case and success_probability
+        """
+        if sampling not in SimulationEngine.SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method: {sampling}")
+
+        current_allocation = float(current_allocation)
+        target_amount = float(target_amount)
+
+        if not scenarios:
+            return []
+
+        if years <= 0:
+            return [
+                SimulationEngine.run(current_allocation, target_amount, years,
+                                     scenario['expected_return'], scenario['volatility'])
+                for scenario in scenarios
+            ]
+
+        months = years * 12
+        scenario_markets = [
+            SimulationEngine.monthly_parameters(scenario['expected_return'], scenario['volatility'])
+            for scenario in scenarios
+        ]
+        markets = sorted(set(scenario_markets))
+        market_index = np.array([markets.index(market) for market in scenario_markets])
+        monthly_sips = np.array([float(scenario.get('monthly_sip') or 0) for scenario in scenarios])
+
+        if seed is None:
+            seed = SimulationEngine.new_seed()
+
+        sizes = SimulationEngine.chunk_sizes(num_simulations, months)
+        chunk_seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        outcomes = np.empty((len(scenarios), num_simulations))
+        start = 0
+
+        for chunk_seed, size in zip(chunk_seeds, sizes):
+            shocks = SimulationEngine.draw_shocks(chunk_seed, size, months, sampling)
+            buffer = np.empty_like(shocks)
+
+            for index, (monthly_return, monthly_volatility) in enumerate(markets):
+                lump_factor, sip_factor = SimulationEngine.growth_factors(
+                    shocks, monthly_return, monthly_volatility, out=buffer
+                )
+                rows = market_index == index
+                outcomes[rows, start:start + size] = (
+                    current_allocation * lump_factor + monthly_sips[rows, None] * sip_factor
+                )
+
+            start += size
+
+        worst_cases, median_outcomes, best_cases = np.percentile(
+            outcomes, SimulationEngine.PERCENTILES, axis=1
+        )
+        success_probabilities = np.mean(outcomes >= target_amount, axis=1) * 100
+
+        return [
+            {
+                'median_outcome': round(float(median_outcomes[i]), 2),
+                'worst_case': round(float(worst_cases[i]), 2),
+                'best_case': round(float(best_cases[i]), 2),
+                'success_probability': round(float(success_probabilities[i]), 2)
+            }
+            for i in range(len(scenarios))
+        ]
+
+    @staticmethod
+    def correlation_factor(correlation: Sequence[Sequence[float]]) -> np.ndarray:
+        """
+        Get the cached factor L of a correlation matrix (correlation = L @ L.T)
+        """
+        return _correlation_factor(tuple(tuple(float(value) for value in row) for row in correlation))
+
+    @staticmethod
+    def portfolio_parameters(
+        weights: Sequence[float],
+        expected_returns: Sequence[float],
+        volatilities: Sequence[float],
+        correlation: Sequence[Sequence[float]]
+    ) -> Tuple[float, float]:
+        """
+        Annual expected return and volatility of a portfolio rebalanced to fixed weights
+
+        With normal monthly returns a rebalanced portfolio is itself a single
+        normal asset, so these feed the single-asset engine unchanged.
+        """
+        weights = np.asarray(weights, dtype=float)
+        weights = weights / weights.sum()
+        factor = SimulationEngine.correlation_factor(correlation)
+
+        expected_return = float(weights @ np.asarray(expected_returns, dtype=float))
+        volatility = float(np.linalg.norm(factor.T @ (weights * np.asarray(volatilities, dtype=float))))
+        return expected_return, volatility
+
+    @staticmethod
+    def simulate_multi_asset_terminal_values(
+        current_allocation: float,
+        years: int,
+        weights: Sequence[float],
+        expected_returns: Sequence[float],
+        volatilities: Sequence[float],
+        correlation: Sequence[Sequence[float]],
+        monthly_sip: float = 0,
+        num_simulations: int = 5000,
+        seed: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Simulate terminal values of a buy-and-hold portfolio of correlated assets
+
+        The starting amount and every SIP instalment are split by weight and each
+        asset then compounds on its own path, so weights drift with performance.
+        Correlated monthly shocks are drawn for all assets at once as L @ z, with
+        L the cached factor of the correlation matrix.
+
+        Returns:
+            Array of num_simulations terminal portfolio values
+        """
+        weights = np.asarray(weights, dtype=float)
+        weights = weights / weights.sum()
+        factor = SimulationEngine.correlation_factor(correlation)
+        asset_markets = [
+            SimulationEngine.monthly_parameters(expected_return, volatility)
+            for expected_return, volatility in zip(expected_returns, volatilities)
+        ]
+        current_allocation = float(current_allocation)
+        monthly_sip = float(monthly_sip)
+
+        months = years * 12
+        num_assets = len(weights)
+
+        if seed is None:
+            seed = SimulationEngine.new_seed()
+
+        sizes = SimulationEngine.chunk_sizes(num_simulations, months * num_assets)
+        chunk_seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        outcomes = np.zeros(num_simulations)
+        start = 0
+
+        for chunk_seed, size in zip(chunk_seeds, sizes):
+            rng = SimulationEngine.make_generator(chunk_seed)
+            independent = rng.standard_normal((num_assets, size, months))
+            # (assets, paths, months): each asset's shocks stay contiguous
+            correlated = np.tensordot(factor, independent, axes=(1, 0))
+
+            for asset, (monthly_return, monthly_volatility) in enumerate(asset_markets):
+                lump_factor, sip_factor = SimulationEngine.growth_factors(
+                    correlated[asset], monthly_return, monthly_volatility
+                )
+                outcomes[start:start + size] += weights[asset] * (
+                    current_allocation * lump_factor + monthly_sip * sip_factor
+                )
+
+            start += size
+
+        return outcomes
+
+    @staticmethod
+    def run_multi_asset(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        weights: Sequence[float],
+        expected_returns: Sequence[float],
+        volatilities: Sequence[float],
+        correlation: Sequence[Sequence[float]],
+        monthly_sip: float = 0,
+        num_simulations: int = 5000,
+        seed: Optional[int] = None
+    ) -> Dict[str, float]:
+        """
+        Run a buy-and-hold multi-asset Monte Carlo simulation for a goal
+
+        Returns:
+            Dictionary with median_outcome, worst_case, best_case, success_probability
+        """
+        if years <= 0:
+            return SimulationEngine.run(current_allocation, target_amount, years, 0, 0)
+
+        outcomes = SimulationEngine.simulate_multi_asset_terminal_values(
+            current_allocation=current_allocation,
+            years=years,
+            weights=weights,
+            expected_returns=expected_returns,
+            volatilities=volatilities,
+            correlation=correlation,
+            monthly_sip=monthly_sip,
+            num_simulations=num_simulations,
+            seed=seed
+        )
+
+        return SimulationEngine.summarize_outcomes(outcomes, target_amount)
+
+    @staticmethod
+    def simulate_household(
+        goals: Sequence[Dict],
+        num_simulations: int = 5000,
+        market_correlation: float = 1.0,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Simulate several goals jointly against one shared market
+
+        All goals read the same calendar-ordered market shock matrix, so a bad
+        year hits every goal that is still running at the time. Each goal's monthly
+        shock is market_correlation * market + sqrt(1 - market_correlation^2) *
+        own noise; at 1.0 all goals ride exactly the same market. Goals keep
+        their own return, volatility, SIP and horizon, so per-goal results follow
+        the same distribution as separate runs.
+
+        Args:
+            goals: Dicts with current_allocation, target_amount, years,
+                expected_return and volatility (as decimals) and an optional monthly_sip
+            market_correlation: Correlation between goals' monthly shocks (0-1)
+            seed: Seed for a reproducible run; a fresh one is drawn if omitted
+
+        Returns:
+            Dictionary with one result per goal (in order), the joint probability
+            that every goal is met, the probability if goals were independent, and
+            the expected number of goals met
+        """
+        if not 0 <= market_correlation <= 1:
+            raise ValueError("Market correlation must be between 0 and 1")
+
+        if not goals:
+            return {'goals': [], 'joint_success_probability': 100.0,
+                    'independent_success_probability': 100.0, 'expected_goals_met': 0.0}
+
+        goal_months = [max(int(goal['years']), 0) * 12 for goal in goals]
+        horizon = max(goal_months)
+        markets = [
+            SimulationEngine.monthly_parameters(goal['expected_return'], goal['volatility'])
+            for goal in goals
+        ]
+        current_allocations = [float(goal['current_allocation']) for goal in goals]
+        monthly_sips = [float(goal.get('monthly_sip') or 0) for goal in goals]
+        idiosyncratic_weight = math.sqrt(1 - market_correlation ** 2)
+
+        if seed is None:
+            seed = SimulationEngine.new_seed()
+
+        # Chunking depends only on the longest horizon, as for single-goal runs
+        sizes = SimulationEngine.chunk_sizes(num_simulations, max(horizon, 1))
+        chunk_seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        outcomes = np.empty((len(goals), num_simulations))
+        start = 0
+
+        for chunk_seed, size in zip(chunk_seeds, sizes):
+            rng = SimulationEngine.make_generator(chunk_seed)
+            market = rng.standard_normal((size, horizon))
+            buffer = np.empty_like(market)
+
+            for index, months in enumerate(goal_months):
+                if months == 0:
+                    outcomes[index, start:start + size] = current_allocations[index]
+                    continue
+
+                # Months counted back from this goal's own due date, in calendar order
+                shocks = np.multiply(market[:, months - 1::-1], market_correlation,
+                                     out=buffer[:, :months])
+                if idiosyncratic_weight:
+                    shocks += idiosyncratic_weight * rng.standard_normal((size, months))
+
+                monthly_return, monthly_volatility = markets[index]
+                lump_factor, sip_factor = SimulationEngine.growth_factors(
+                    shocks, monthly_return, monthly_volatility
+                )
+                outcomes[index, start:start + size] = (
+                    current_allocations[index] * lump_factor + monthly_sips[index] * sip_factor
+                )
+
+            start += size
+
+        targets = np.array([float(goal['target_amount']) for goal in goals])
+        successes = outcomes >= targets[:, None]
+        goal_probabilities = successes.mean(axis=1)
+
+        return {
+            'goals': [
+                SimulationEngine.summarize_outcomes(goal_outcomes, target)
+                for goal_outcomes, target in zip(outcomes, targets)
+            ],
+            'joint_success_probability': round(float(successes.all(axis=0).mean()) * 100, 2),
+            'independent_success_probability': round(float(np.prod(goal_probabilities)) * 100, 2),
+            'expected_goals_met': round(float(goal_probabilities.sum()), 2)
+        }
+
+    @staticmethod
+    def simulate_factors(
+        years: int,
+        expected_return: float,
+        volatility: float,
+        num_simulations: int = 20000,
+        sampling: str = 'standard',
+        seed: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simulate per-path (lump_factor, sip_factor) arrays without fixing the contributions
+
+        Terminal value is linear in both the starting amount and the SIP, so one
+        set of factors answers any number of "what if I invest X" questions with
+        common random numbers and no further simulation.
+        """
+        if sampling not in SimulationEngine.SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method: {sampling}")
+
+        months = years * 12
+        monthly_return, monthly_volatility = SimulationEngine.monthly_parameters(
+            expected_return, volatility
+        )
+
+        if seed is None:
+            seed = SimulationEngine.new_seed()
+
+        sizes = SimulationEngine.chunk_sizes(num_simulations, months)
+        chunk_seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        lump_factors = np.empty(num_simulations)
+        sip_factors = np.empty(num_simulations)
+        start = 0
+
+        for chunk_seed, size in zip(chunk_seeds, sizes):
+            shocks = SimulationEngine.draw_shocks(chunk_seed, size, months, sampling)
+            lump_factors[start:start + size], sip_factors[start:start + size] = \
+                SimulationEngine.growth_factors(shocks, monthly_return, monthly_volatility)
+            start += size
+
+        return lump_factors, sip_factors
+
+    @staticmethod
+    def solve_required_contribution(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        expected_return: float,
+        volatility: float,
+        target_probability: float = 80,
+        solve_for: str = 'monthly_sip',
+        monthly_sip: float = 0,
+        num_simulations: int = 20000,
+        sampling: str = 'antithetic',
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Find the minimum monthly SIP or extra lump sum that reaches a success probability
+
+        With common random numbers, path i succeeds exactly when the contribution
+        is at least its own break-even amount:
+
+            SIP:      (target - V_0 * lump_i) / sip_i
+            Lump sum: (target - SIP * sip_i) / lump_i - V_0
+
+        Success probability is a step function of the contribution, so the
+        minimum contribution for probability p is the ceil(p * n)-th smallest
+        break-even amount - the exact limit of a bisection over the shared paths,
+        found with a single partial sort.
+
+        Args:
+            target_probability: Required success probability (0-100)
+            solve_for: 'monthly_sip' or 'lump_sum'
+            monthly_sip: SIP assumed while solving for a lump sum
+
+        Returns:
+            Dictionary with the required amount (None if no amount can reach the
+            target), the achieved success probability and the paths used
+        """
+        if solve_for not in ('monthly_sip', 'lump_sum'):
+            raise ValueError(f"Unknown contribution type: {solve_for}")
+        if not 0 < target_probability < 100:
+            raise ValueError("Target probability must be between 0 and 100")
+
+        current_allocation = float(current_allocation)
+        target_amount = float(target_amount)
+        monthly_sip = float(monthly_sip)
+
+        if years <= 0:
+            shortfall = max(0.0, target_amount - current_allocation)
+            return {
+                'solve_for': solve_for,
+                'required_amount': round(shortfall, 2) if solve_for == 'lump_sum' else (0.0 if shortfall == 0 else None),
+                'target_probability': target_probability,
+                'achieved_probability': 100.0 if shortfall == 0 or solve_for == 'lump_sum' else 0.0,
+                'num_simulations': 0
+            }
+
+        lump_factors, sip_factors = SimulationEngine.simulate_factors(
+            years, expected_return, volatility, num_simulations, sampling, seed
+        )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if solve_for == 'monthly_sip':
+                break_even = (target_amount - current_allocation * lump_factors) / sip_factors
+                unreachable = sip_factors <= 0
+            else:
+                break_even = (target_amount - monthly_sip * sip_factors) / lump_factors - current_allocation
+                unreachable = lump_factors <= 0
+
+        break_even = np.where(unreachable, np.inf, np.maximum(break_even, 0))
+
+        rank = math.ceil(target_probability / 100 * num_simulations) - 1
+        required = float(np.partition(break_even, rank)[rank])
+
+        if not math.isfinite(required):
+            return {
+                'solve_for': solve_for,
+                'required_amount': None,
+                'target_probability': target_probability,
+                'achieved_probability': round(float(np.mean(np.isfinite(break_even))) * 100, 2),
+                'num_simulations': num_simulations
+            }
+
+        # Round up to the paisa so that rounding never drops below the target
+        required = math.ceil(required * 100) / 100
+        achieved = np.mean(break_even <= required) * 100
+
+        return {
+            'solve_for': solve_for,
+            'required_amount': required,
+            'target_probability': target_probability,
+            'achieved_probability': round(float(achieved), 2),
+            'num_simulations': num_simulations
+        }
+
+    @staticmethod
+    def simulate_paths(
+        current_allocation: float,
+        years: int,
+        expected_return: float,
+        volatility: float,
+        monthly_sip: float = 0,
+        num_paths: int = 100,
+        seed: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Simulate full month-by-month portfolio paths as a single array
+
+        With C_t the cumulative growth up to month t, the recursion unrolls to
+        V_t = C_t * (V_0 + SIP * (1/C_0 + ... + 1/C_{t-1})), so every path is built
+        with one cumulative product and one cumulative sum.
+
+        Returns:
+            Array of shape (num_paths, months + 1); column 0 is today's value
+        """
+        months = years * 12
+        monthly_return, monthly_volatility = SimulationEngine.monthly_parameters(
+            expected_return, volatility
+        )
+
+        rng = SimulationEngine.make_generator(seed)
+        growth = rng.standard_normal((num_paths, months))
+        growth *= monthly_volatility
+        growth += 1 + monthly_return
+
+        paths = np.empty((num_paths, months + 1))
+        paths[:, 0] = 1.0
+        np.cumprod(growth, axis=1, out=paths[:, 1:])
+
+        if monthly_sip:
+            contributions = np.cumsum(1 / paths[:, :-1], axis=1)
+            contributions *= float(monthly_sip)
+            contributions += float(current_allocation)
+            paths[:, 1:] *= contributions
+            paths[:, 0] = float(current_allocation)
+        else:
+            paths *= float(current_allocation)
+
+        return paths
+
+    @staticmethod
+    def projection_bands(
+        current_allocation: float,
+        target_amount: float,
+        years: int,
+        expected_return: float,
+        volatility: float,
+        monthly_sip: float = 0,
+        num_paths: int = 100,
+        quantiles: Sequence[float] = PROJECTION_QUANTILES,
+        seed: Optional[int] = None
+    ) -> Dict:
+        """
+        Compute percentile bands of simulated portfolio value for every month
+
+        All requested quantiles are evaluated along the path axis in one call.
+
+        Args:
+            quantiles: Percentiles (0-100) to report, e.g. (5, 25, 50, 75, 95)
+
+        Returns:
+            Dictionary with 'quantiles', 'bands' (one path per quantile, keyed
+            'p5', 'p50', ...) and the linear 'required_path' to the target
+        """
+        current_allocation = float(current_allocation)
+        months = max(years, 0) * 12
+        quantiles = sorted(set(float(q) for q in quantiles))
+
+        if num_paths > SimulationEngine.MAX_PROJECTION_PATHS:
+            raise ValueError(f"num_paths must be at most {SimulationEngine.MAX_PROJECTION_PATHS}")
+        if len(quantiles) > SimulationEngine.MAX_PROJECTION_QUANTILES:
+            raise ValueError(f"At most {SimulationEngine.MAX_PROJECTION_QUANTILES} quantiles can be requested")
+        if not all(math.isfinite(q) and 0 <= q <= 100 for q in quantiles):
+            raise ValueError("Quantiles must be percentiles between 0 and 100")
+
+        if months == 0:
+            band_values = np.full((len(quantiles), 1), current_allocation)
+        else:
+            paths = SimulationEngine.simulate_paths(
+                current_allocation=current_allocation,
+                years=years,
+                expected_return=expected_return,
+                volatility=volatility,
+                monthly_sip=monthly_sip,
+                num_paths=num_paths,
+                seed=seed
+            )
+            band_values = np.percentile(paths, quantiles, axis=0)
+
+        # Linear growth from today's value to the target
+        required_path = np.linspace(current_allocation, float(target_amount), months + 1)
+
+        return {
+            'quantiles': quantiles,
+            'bands': {
+                SimulationEngine.band_key(q): values.tolist()
+                for q, values in zip(quantiles, band_values)
+            },
+            'required_path': required_path.tolist()
+        }
+
+    @staticmethod
+    def band_key(quantile: float) -> str:
+        """
+        Response key for a percentile band, e.g. 10 -> 'p10', 2.5 -> 'p2.5'
+        """
+        return f"p{quantile:g}"
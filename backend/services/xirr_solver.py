@@ -0,0 +1,188 @@
+import numpy as np
+from scipy.optimize import brentq
+from typing import Optional, Tuple
+
+
+class XirrSolver:
+    """
+    Batched XIRR solver for many independent cash flow series at once
+
+    Cash flows of all series are stored flat, each tagged with the index of its
+    series (group). The net value and its derivative for every series come from
+    weighted bincounts per Newton step, so the cost grows with the total number
+    of cash flows rather than with the number of Python-level solves.
+
+    Flows are valued at the last cash flow date rather than discounted to the
+    first: the root is the same, but for the usual ledger (money paid in, value
+    received at the end) the function is concave and decreasing, so Newton
+    converges from any starting rate instead of running off for losing
+    investments.
+
+    Convention: money paid in is negative, money received (including the
+    current value as of today) is positive. Rates are annual, as decimals,
+    using actual/365 year fractions like spreadsheet XIRR.
+    """
+
+    # Newton stops once every step is below this (in rate units)
+    TOLERANCE = 1e-10
+
+    MAX_NEWTON_ITERATIONS = 50
+
+    # Rates at or below -100% are undefined
+    MIN_RATE = -0.999999
+
+    # Candidate rates scanned for a sign change before falling back to Brent's method
+    BRACKET_GRID = (
+        -0.999999, -0.9999, -0.99, -0.9, -0.75, -0.5, -0.25, -0.1, 0.0, 0.05, 0.1, 0.2,
+        0.35, 0.5, 1.0, 2.0, 5.0, 10.0, 100.0, 1000.0
+    )
+
+    DEFAULT_GUESS = 0.1
+
+    @staticmethod
+    def years_to_last_flow(day_numbers: np.ndarray, group_index: np.ndarray, num_groups: int) -> np.ndarray:
+        """
+        Years from every cash flow to the last cash flow of its series
+        """
+        last_day = np.full(num_groups, np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(last_day, group_index, day_numbers)
+        return (last_day[group_index] - day_numbers) / 365.0
+
+    @staticmethod
+    def net_future_value(
+        rates: np.ndarray,
+        amounts: np.ndarray,
+        times: np.ndarray,
+        group_index: np.ndarray,
+        num_groups: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Net value of every series at its last cash flow date, at its own rate
+
+        Args:
+            times: Years from each cash flow to the last one of its series
+
+        Returns:
+            Tuple of (net value, derivative with respect to the rate, sum of
+            absolute compounded values used to judge convergence)
+        """
+        growth = np.exp(times * np.log1p(rates)[group_index])
+        future_values = amounts * growth
+
+        value = np.bincount(group_index, weights=future_values, minlength=num_groups)
+        derivative = np.bincount(
+            group_index, weights=times * future_values, minlength=num_groups
+        ) / (1 + rates)
+        scale = np.bincount(group_index, weights=np.abs(future_values), minlength=num_groups)
+        return value, derivative, scale
+
+    @staticmethod
+    def solve(
+        amounts: np.ndarray,
+        day_numbers: np.ndarray,
+        group_index: np.ndarray,
+        num_groups: int,
+        guesses: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Solve XIRR for every series
+
+        Newton's method runs on all series together, each starting from its own
+        guess (e.g. a previously stored rate). Series where Newton fails to
+        converge fall back to Brent's method on a bracket found by scanning
+        BRACKET_GRID for the sign change nearest the guess.
+
+        Args:
+            amounts: Cash flow amounts, flat across all series
+            day_numbers: Cash flow dates as integer day numbers (e.g. date.toordinal())
+            group_index: Series index (0..num_groups-1) of every cash flow
+            num_groups: Number of series
+            guesses: Optional starting rate per series
+
+        Returns:
+            Array of num_groups annual rates; NaN where XIRR is undefined (series
+            without both inflows and outflows, or without a root)
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        group_index = np.asarray(group_index, dtype=np.intp)
+        times = XirrSolver.years_to_last_flow(np.asarray(day_numbers, dtype=np.int64), group_index, num_groups)
+
+        if guesses is None:
+            rates = np.full(num_groups, XirrSolver.DEFAULT_GUESS)
+        else:
+            rates = np.asarray(guesses, dtype=float).copy()
+            rates[~np.isfinite(rates) | (rates <= XirrSolver.MIN_RATE)] = XirrSolver.DEFAULT_GUESS
+        starting_rates = rates.copy()
+
+        # A root needs money both paid in and received
+        has_inflow = np.bincount(group_index, weights=amounts > 0, minlength=num_groups) > 0
+        has_outflow = np.bincount(group_index, weights=amounts < 0, minlength=num_groups) > 0
+        valid = has_inflow & has_outflow
+
+        converged = ~valid
+        # Cash flows of series still being solved; shrinks as series converge
+        active_amounts, active_times, active_index = amounts, times, group_index
+
+        for _ in range(XirrSolver.MAX_NEWTON_ITERATIONS):
+            with np.errstate(all='ignore'):
+                value, derivative, scale = XirrSolver.net_future_value(
+                    rates, active_amounts, active_times, active_index, num_groups
+                )
+                step = value / derivative
+            step[converged] = 0.0
+
+            new_rates = rates - step
+            # Never step past -100%; go halfway there instead
+            new_rates = np.where(new_rates <= XirrSolver.MIN_RATE, (rates + XirrSolver.MIN_RATE) / 2, new_rates)
+
+            settled = (np.abs(step) < XirrSolver.TOLERANCE) | (np.abs(value) <= 1e-12 * scale)
+            converged |= settled & np.isfinite(new_rates)
+            rates = np.where(converged, rates, new_rates)
+
+            if converged.all():
+                break
+
+            still_active = ~converged[active_index]
+            if still_active.mean() < 0.5:
+                active_amounts = active_amounts[still_active]
+                active_times = active_times[still_active]
+                active_index = active_index[still_active]
+
+        rates[~valid] = np.nan
+        unresolved = np.flatnonzero(valid & ~(converged & np.isfinite(rates)))
+
+        if unresolved.size:
+            order = np.argsort(group_index, kind='stable')
+            bounds = np.searchsorted(group_index[order], np.arange(num_groups + 1))
+            for group in unresolved:
+                flows = order[bounds[group]:bounds[group + 1]]
+                rates[group] = XirrSolver._solve_bracketed(amounts[flows], times[flows], starting_rates[group])
+
+        return rates
+
+    @staticmethod
+    def _solve_bracketed(amounts: np.ndarray, times: np.ndarray, guess: float) -> float:
+        """
+        Solve one series with Brent's method on the bracket nearest the guess
+        """
+        def net_value(rate: float) -> float:
+            return float(np.sum(amounts * np.exp(times * np.log1p(rate))))
+
+        grid = np.array(XirrSolver.BRACKET_GRID)
+        with np.errstate(over='ignore'):
+            values = np.array([net_value(rate) for rate in grid])
+        sign_changes = np.flatnonzero(np.sign(values[:-1]) * np.sign(values[1:]) <= 0)
+
+        if sign_changes.size == 0:
+            return float('nan')
+
+        # Prefer the root closest to the guess when there are several
+        nearest = sign_changes[np.argmin(np.abs((grid[sign_changes] + grid[sign_changes + 1]) / 2 - guess))]
+        low, high = grid[nearest], grid[nearest + 1]
+
+        if values[nearest] == 0:
+            return float(low)
+        if values[nearest + 1] == 0:
+            return float(high)
+
+        return float(brentq(net_value, low, high, xtol=XirrSolver.TOLERANCE))
@@ -30,6 +30,8 @@ CREATE TABLE `goal_simulation_history` (
   `worst_case` decimal(15,2) DEFAULT NULL,
   `best_case` decimal(15,2) DEFAULT NULL,
   `success_probability` decimal(5,2) DEFAULT NULL,
+  `seed` bigint DEFAULT NULL,
+  `num_simulations` int DEFAULT NULL,
   PRIMARY KEY (`sim_id`),
   KEY `goal_id` (`goal_id`),
   CONSTRAINT `goal_simulation_history_ibfk_1` FOREIGN KEY (`goal_id`) REFERENCES `goals` (`goal_id`)
@@ -42,7 +44,7 @@ CREATE TABLE `goal_simulation_history` (
 
 LOCK TABLES `goal_simulation_history` WRITE;
 /*!40000 ALTER TABLE `goal_simulation_history` DISABLE KEYS */;
-INSERT INTO `goal_simulation_history` VALUES (1,1,'2025-12-04 10:55:34',9500000.00,6200000.00,13500000.00,68.00),(2,2,'2025-12-04 10:55:34',8700000.00,5800000.00,12400000.00,58.00),(3,3,'2025-12-04 10:55:34',26000000.00,16000000.00,42000000.00,55.00),(4,4,'2025-12-04 10:55:34',7200000.00,4100000.00,14000000.00,45.00),(5,5,'2025-12-04 10:55:34',6800000.00,3900000.00,13000000.00,49.00),(6,6,'2025-12-04 10:55:34',11900000.00,8200000.00,19000000.00,66.00),(7,7,'2025-12-04 10:55:34',4800000.00,3000000.00,9000000.00,75.00),(8,8,'2025-12-04 10:55:34',5900000.00,3400000.00,9500000.00,72.00),(9,9,'2025-12-04 10:55:34',1800000.00,1000000.00,3000000.00,76.00),(10,10,'2025-12-04 10:55:34',2100000.00,1400000.00,3500000.00,69.00),(11,11,'2025-12-04 10:55:34',8800000.00,5100000.00,14500000.00,53.00),(12,12,'2025-12-04 10:55:34',1900000.00,900000.00,4200000.00,71.00);
+INSERT INTO `goal_simulation_history` VALUES (1,1,'2025-12-04 10:55:34',9500000.00,6200000.00,13500000.00,68.00,NULL,NULL),(2,2,'2025-12-04 10:55:34',8700000.00,5800000.00,12400000.00,58.00,NULL,NULL),(3,3,'2025-12-04 10:55:34',26000000.00,16000000.00,42000000.00,55.00,NULL,NULL),(4,4,'2025-12-04 10:55:34',7200000.00,4100000.00,14000000.00,45.00,NULL,NULL),(5,5,'2025-12-04 10:55:34',6800000.00,3900000.00,13000000.00,49.00,NULL,NULL),(6,6,'2025-12-04 10:55:34',11900000.00,8200000.00,19000000.00,66.00,NULL,NULL),(7,7,'2025-12-04 10:55:34',4800000.00,3000000.00,9000000.00,75.00,NULL,NULL),(8,8,'2025-12-04 10:55:34',5900000.00,3400000.00,9500000.00,72.00,NULL,NULL),(9,9,'2025-12-04 10:55:34',1800000.00,1000000.00,3000000.00,76.00,NULL,NULL),(10,10,'2025-12-04 10:55:34',2100000.00,1400000.00,3500000.00,69.00,NULL,NULL),(11,11,'2025-12-04 10:55:34',8800000.00,5100000.00,14500000.00,53.00,NULL,NULL),(12,12,'2025-12-04 10:55:34',1900000.00,900000.00,4200000.00,71.00,NULL,NULL);
 /*!40000 ALTER TABLE `goal_simulation_history` ENABLE KEYS */;
 UNLOCK TABLES;
 /*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
@@ -34,6 +34,9 @@ CREATE TABLE `investments` (
   `current_value` decimal(15,2) DEFAULT NULL,
   `units` decimal(15,4) DEFAULT NULL,
   `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  `xirr` decimal(10,4) DEFAULT NULL,
+  `xirr_updated_at` datetime DEFAULT NULL,
+  `last_priced_at` datetime DEFAULT NULL,
   PRIMARY KEY (`investment_id`),
   KEY `portfolio_id` (`portfolio_id`),
   KEY `member_id` (`member_id`),
@@ -50,7 +53,7 @@ CREATE TABLE `investments` (
 
 LOCK TABLES `investments` WRITE;
 /*!40000 ALTER TABLE `investments` DISABLE KEYS */;
-INSERT INTO `investments` VALUES (1,1,1,1,'Axis Bluechip Fund','AXIS-BLUE','FOLIO001',500000.00,650000.00,320.0000,'2025-12-04 10:55:34'),(2,1,1,1,'HDFC Flexicap Fund','HDFC-FLEX','FOLIO002',300000.00,390000.00,210.0000,'2025-12-04 10:55:34'),(3,2,1,1,'SBI Smallcap Fund','SBI-SMALL','FOLIO003',200000.00,255000.00,150.0000,'2025-12-04 10:55:34'),(4,3,2,6,'HDFC Fixed Deposit','FD-HDFC','FD001',500000.00,500000.00,1.0000,'2025-12-04 10:55:34'),(5,4,3,4,'TCS Ltd','TCS',NULL,150000.00,170000.00,20.0000,'2025-12-04 10:55:34'),(6,4,3,4,'Infosys Ltd','INFY',NULL,100000.00,105000.00,12.0000,'2025-12-04 10:55:34'),(7,5,3,4,'Tata Motors','TATAMOT',NULL,70000.00,90000.00,15.0000,'2025-12-04 10:55:34'),(8,6,4,1,'Kotak Emerging Fund','KOTAK-EM','FOLIO004',80000.00,92000.00,60.0000,'2025-12-04 10:55:34'),(9,7,5,7,'Government Bond 2030','GOVBND',NULL,300000.00,315000.00,300.0000,'2025-12-04 10:55:34'),(10,8,6,4,'Reliance Industries','RELIANCE',NULL,120000.00,138000.00,10.0000,'2025-12-04 10:55:34'),(11,9,7,5,'SBI Gold ETF','GOLD-SBI','GOLD001',200000.00,230000.00,50.0000,'2025-12-04 10:55:34'),(12,10,10,6,'Post Office MIS','POMIS',NULL,100000.00,100000.00,1.0000,'2025-12-04 10:55:34');
+INSERT INTO `investments` VALUES (1,1,1,1,'Axis Bluechip Fund','AXIS-BLUE','FOLIO001',500000.00,650000.00,320.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(2,1,1,1,'HDFC Flexicap Fund','HDFC-FLEX','FOLIO002',300000.00,390000.00,210.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(3,2,1,1,'SBI Smallcap Fund','SBI-SMALL','FOLIO003',200000.00,255000.00,150.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(4,3,2,6,'HDFC Fixed Deposit','FD-HDFC','FD001',500000.00,500000.00,1.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(5,4,3,4,'TCS Ltd','TCS',NULL,150000.00,170000.00,20.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(6,4,3,4,'Infosys Ltd','INFY',NULL,100000.00,105000.00,12.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(7,5,3,4,'Tata Motors','TATAMOT',NULL,70000.00,90000.00,15.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(8,6,4,1,'Kotak Emerging Fund','KOTAK-EM','FOLIO004',80000.00,92000.00,60.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(9,7,5,7,'Government Bond 2030','GOVBND',NULL,300000.00,315000.00,300.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(10,8,6,4,'Reliance Industries','RELIANCE',NULL,120000.00,138000.00,10.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(11,9,7,5,'SBI Gold ETF','GOLD-SBI','GOLD001',200000.00,230000.00,50.0000,'2025-12-04 10:55:34',NULL,NULL,NULL),(12,10,10,6,'Post Office MIS','POMIS',NULL,100000.00,100000.00,1.0000,'2025-12-04 10:55:34',NULL,NULL,NULL);
 /*!40000 ALTER TABLE `investments` ENABLE KEYS */;
 UNLOCK TABLES;
 /*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
@@ -1,29 +1,39 @@
 'use client';
 
-import { useState, useEffect } from 'react';
-import { portfolioAPI, marketAPI } from '@/lib/api';
-import { Investment } from '@/types';
+import { useState, useEffect, useRef } from 'react';
+import { portfolioAPI, marketAPI, dashboardAPI } from '@/lib/api';
+import { Investment, MemberAllocation, PortfolioSummary } from '@/types';
 import { formatCurrency, formatPercentage } from '@/lib/utils';
 import Link from 'next/link';
 import { TrendingUp, TrendingDown, Plus, RefreshCw, Home } from 'lucide-react';
 
 type TabType = 'stocks' | 'mutual-funds' | 'fixed-deposits' | 'others';
 
+// Investments are listed a page at a time; more are loaded on demand
+const PAGE_SIZE = 50;
+
 export default function PortfolioPage() {
   const [investments, setInvestments] = useState<Investment[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | undefined>();
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [members, setMembers] = useState<MemberAllocation[]>([]);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
   const [lastUpdated, setLastUpdated] = useState<Date | null>(null);
   const [activeTab, setActiveTab] = useState<TabType>('stocks');
   const [selectedMember, setSelectedMember] = useState<string>('all');
   const [isDarkMode, setIsDarkMode] = useState(false);
-  const [summary, setSummary] = useState({
-    total_current: 0,
-    total_invested: 0,
-    total_gain: 0,
-    gain_percentage: 0,
+  const [summary, setSummary] = useState<PortfolioSummary>({
+    total_current_value: 0,
+    total_invested_value: 0,
+    total_gain_loss: 0,
+    gain_loss_percentage: 0,
   });
 
+  // Read by the auto-refresh interval, which outlives a single render
+  const investmentsRef = useRef<Investment[]>([]);
+  investmentsRef.current = investments;
+
   const isMarketOpen = () => {
     const now = new Date();
     const hours = now.getHours();
@@ -53,140 +63,174 @@ export default function PortfolioPage() {
     };
     window.addEventListener('darkModeChange', handleDarkModeChange);
     
-    fetchPortfolioData(false, true); // Load without prices first
-    
     return () => window.removeEventListener('darkModeChange', handleDarkModeChange);
   }, []);
 
+  useEffect(() => {
+    // The member filter is applied by the API, so changing it starts again from the first page
+    fetchPortfolioData();
+  }, [selectedMember]);
+
   useEffect(() => {
     // Only auto-refresh stocks during market hours
     const interval = setInterval(() => {
       if (isMarketOpen() && activeTab === 'stocks') {
         // Refresh every 30 seconds for stocks during market hours
-        fetchPortfolioData(true);
+        refreshPrices();
       } else {
         // Refresh every 2 minutes for other tabs or after market close
-        fetchPortfolioData(true);
+        refreshPrices();
       }
     }, isMarketOpen() && activeTab === 'stocks' ? 30000 : 120000);
     
     return () => clearInterval(interval);
   }, [activeTab]);
 
-  const fetchPortfolioData = async (isAutoRefresh = false, skipPrices = false) => {
-    if (!isAutoRefresh) setLoading(true);
-    else setRefreshing(true);
+  const fetchInvestmentsPage = (cursor?: string) =>
+    portfolioAPI.getInvestmentsPage({
+      limit: PAGE_SIZE,
+      cursor,
+      member_id: selectedMember === 'all' ? undefined : Number(selectedMember),
+    });
+
+  const fetchPortfolioData = async () => {
+    setLoading(true);
 
     try {
-      const res = await portfolioAPI.getAllInvestments();
-      const investmentsData = res.data;
+      const [page, summaryRes, membersRes] = await Promise.all([
+        fetchInvestmentsPage(),
+        portfolioAPI.getSummary(),
+        dashboardAPI.getMemberAllocation(),
+      ]);
 
-      // If skipPrices is true, show data immediately without fetching prices
-      if (skipPrices) {
-        setInvestments(investmentsData);
-        setLoading(false);
-        // Fetch prices in background
-        setTimeout(() => fetchPortfolioData(true), 100);
-        return;
-      }
+      // Show the first page immediately and fetch its prices in the background
+      setInvestments(page.items);
+      setNextCursor(page.nextCursor);
+      setSummary(summaryRes.data);
+      setMembers(membersRes.data);
+      setLoading(false);
+      refreshPrices(page.items);
+    } catch (error) {
+      console.error('Error fetching portfolio data:', error);
+      setLoading(false);
+    }
+  };
 
-      // Update investments with real-time prices where applicable
-      const updatedInvestments = await Promise.all(
-        investmentsData.map(async (inv: Investment) => {
-          const assetClass = inv.asset_class_name?.toLowerCase() || '';
-          
-          // Check if it's a stock with a symbol
-          if (inv.symbol && (assetClass.includes('stock') || assetClass.includes('equity')) &&
-              !assetClass.includes('mf') && !assetClass.includes('mutual')) {
-            try {
-              const response = await marketAPI.getStockPrice(inv.symbol);
-              const stockData = response.data; // Extract data from axios response
-              if (stockData && stockData.current_price && inv.units) {
-                const units = Number(inv.units) || 0;
-                const investedValue = Number(inv.invested_value) || 0;
-                const currentPrice = Number(stockData.current_price) || 0;
-                
-                const newCurrentValue = currentPrice * units;
-                const gain = newCurrentValue - investedValue;
-                const gainPercent = investedValue > 0 ? (gain / investedValue) * 100 : 0;
-                
-                return {
-                  ...inv,
-                  current_value: newCurrentValue,
-                  gain_loss: gain,
-                  gain_loss_percentage: gainPercent,
-                  market_price: currentPrice,
-                  price_change_percent: Number(stockData.change_percent) || 0,
-                };
-              }
-            } catch (error) {
-              console.warn(`Could not fetch real-time price for ${inv.symbol}:`, error);
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+
+    try {
+      const page = await fetchInvestmentsPage(nextCursor);
+      const pricedInvestments = await withLivePrices(page.items);
+      setInvestments(prev => [...prev, ...pricedInvestments]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more investments:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Re-price the investments loaded so far, keeping any page loaded meanwhile
+  const refreshPrices = async (loaded: Investment[] = investmentsRef.current) => {
+    setRefreshing(true);
+
+    try {
+      const pricedInvestments = await withLivePrices(loaded);
+      const pricedById = new Map(pricedInvestments.map(inv => [inv.investment_id, inv]));
+      setInvestments(prev => prev.map(inv => pricedById.get(inv.investment_id) ?? inv));
+      setLastUpdated(new Date());
+    } catch (error) {
+      console.error('Error fetching portfolio data:', error);
+    } finally {
+      setRefreshing(false);
+    }
+  };
+
+  // Update investments with real-time prices where applicable
+  const withLivePrices = (investmentsData: Investment[]): Promise<Investment[]> =>
+    Promise.all(
+      investmentsData.map(async (inv: Investment) => {
+        const assetClass = inv.asset_class_name?.toLowerCase() || '';
+        
+        // Check if it's a stock with a symbol
+        if (inv.symbol && (assetClass.includes('stock') || assetClass.includes('equity')) &&
+            !assetClass.includes('mf') && !assetClass.includes('mutual')) {
+          try {
+            const response = await marketAPI.getStockPrice(inv.symbol);
+            const stockData = response.data; // Extract data from axios response
+            if (stockData && stockData.current_price && inv.units) {
+              const units = Number(inv.units) || 0;
+              const investedValue = Number(inv.invested_value) || 0;
+              const currentPrice = Number(stockData.current_price) || 0;
+              
+              const newCurrentValue = currentPrice * units;
+              const gain = newCurrentValue - investedValue;
+              const gainPercent = investedValue > 0 ? (gain / investedValue) * 100 : 0;
+              
+              return {
+                ...inv,
+                current_value: newCurrentValue,
+                gain_loss: gain,
+                gain_loss_percentage: gainPercent,
+                market_price: currentPrice,
+                price_change_percent: Number(stockData.change_percent) || 0,
+              };
             }
+          } catch (error) {
+            console.warn(`Could not fetch real-time price for ${inv.symbol}:`, error);
           }
-          
-          // Check if it's a mutual fund with a scheme code
-          if (inv.symbol && (assetClass.includes('mf') || assetClass.includes('mutual'))) {
-            try {
-              const response = await marketAPI.getMutualFundNav(inv.symbol);
-              const mfData = response.data;
-              if (mfData && mfData.nav && inv.units) {
-                const units = Number(inv.units) || 0;
-                const investedValue = Number(inv.invested_value) || 0;
-                const currentNav = Number(mfData.nav) || 0;
-                
-                const newCurrentValue = currentNav * units;
-                const gain = newCurrentValue - investedValue;
-                const gainPercent = investedValue > 0 ? (gain / investedValue) * 100 : 0;
-                
-                return {
-                  ...inv,
-                  current_value: newCurrentValue,
-                  gain_loss: gain,
-                  gain_loss_percentage: gainPercent,
-                  market_price: currentNav,
-                  price_change_percent: Number(mfData.change_percent) || 0,
-                };
-              }
-            } catch (error) {
-              console.warn(`Could not fetch NAV for mutual fund ${inv.symbol}:`, error);
-            }
-            
-            // Fallback: Calculate NAV from existing current_value and units
-            if (inv.units && inv.current_value) {
+        }
+        
+        // Check if it's a mutual fund with a scheme code
+        if (inv.symbol && (assetClass.includes('mf') || assetClass.includes('mutual'))) {
+          try {
+            const response = await marketAPI.getMutualFundNav(inv.symbol);
+            const mfData = response.data;
+            if (mfData && mfData.nav && inv.units) {
               const units = Number(inv.units) || 0;
-              const currentValue = Number(inv.current_value) || 0;
-              const calculatedNav = units > 0 ? currentValue / units : 0;
+              const investedValue = Number(inv.invested_value) || 0;
+              const currentNav = Number(mfData.nav) || 0;
+              
+              const newCurrentValue = currentNav * units;
+              const gain = newCurrentValue - investedValue;
+              const gainPercent = investedValue > 0 ? (gain / investedValue) * 100 : 0;
               
               return {
                 ...inv,
-                market_price: calculatedNav,
+                current_value: newCurrentValue,
+                gain_loss: gain,
+                gain_loss_percentage: gainPercent,
+                market_price: currentNav,
+                price_change_percent: Number(mfData.change_percent) || 0,
               };
             }
+          } catch (error) {
+            console.warn(`Could not fetch NAV for mutual fund ${inv.symbol}:`, error);
           }
           
-          return inv;
-        })
-      );
-
-      setInvestments(updatedInvestments);
-      setLastUpdated(new Date());
-    } catch (error) {
-      console.error('Error fetching portfolio data:', error);
-    } finally {
-      setLoading(false);
-      setRefreshing(false);
-    }
-  };
+          // Fallback: Calculate NAV from existing current_value and units
+          if (inv.units && inv.current_value) {
+            const units = Number(inv.units) || 0;
+            const currentValue = Number(inv.current_value) || 0;
+            const calculatedNav = units > 0 ? currentValue / units : 0;
+            
+            return {
+              ...inv,
+              market_price: calculatedNav,
+            };
+          }
+        }
+        
+        return inv;
+      })
+    );
 
   const getFilteredInvestments = () => {
-    let filtered = investments;
+    const filtered = investments;
 
-    // Filter by member first
-    if (selectedMember !== 'all') {
-      filtered = filtered.filter(inv => inv.member_name === selectedMember);
-    }
-
-    // Then filter by asset class tab
+    // Filter the loaded investments by asset class tab
     switch (activeTab) {
       case 'stocks':
         return filtered.filter(inv => {
@@ -221,18 +265,15 @@ export default function PortfolioPage() {
     }
   };
 
-  // Get unique member names for the filter dropdown
-  const uniqueMembers = Array.from(new Set(investments.map(inv => inv.member_name).filter(Boolean)));
-
   const filteredInvestments = getFilteredInvestments();
 
-  // Calculate summary based on filtered investments (respects both tab and member filter)
-  const displayInvestments = selectedMember !== 'all' 
-    ? investments.filter(inv => inv.member_name === selectedMember)
-    : investments;
+  // Tab counts cover the pages loaded so far
+  const displayInvestments = investments;
 
-  const total_current = displayInvestments.reduce((sum: number, inv: Investment) => sum + inv.current_value, 0);
-  const total_invested = displayInvestments.reduce((sum: number, inv: Investment) => sum + inv.invested_value, 0);
+  // Totals come from the API, so they cover every investment, not just the loaded pages
+  const memberTotals = members.find(member => String(member.member_id) === selectedMember);
+  const total_current = memberTotals ? memberTotals.current_value : summary.total_current_value;
+  const total_invested = memberTotals ? memberTotals.invested_value : summary.total_invested_value;
   const total_gain = total_current - total_invested;
   const gain_percentage = total_invested > 0 ? (total_gain / total_invested) * 100 : 0;
 
@@ -291,7 +332,7 @@ export default function PortfolioPage() {
                 </span>
               )}
               <button
-                onClick={() => fetchPortfolioData(true)}
+                onClick={() => refreshPrices()}
                 disabled={refreshing}
                 className="flex items-center gap-1 text-sm text-blue-600 hover:text-blue-700 disabled:opacity-50"
               >
@@ -308,9 +349,9 @@ export default function PortfolioPage() {
               className="pl-4 pr-10 py-2 bg-blue-500 hover:bg-blue-600 text-white rounded-lg text-sm font-medium border-2 border-blue-600 focus:outline-none focus:ring-2 focus:ring-blue-500 cursor-pointer transition appearance-none bg-[url('data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTIiIGhlaWdodD0iOCIgdmlld0JveD0iMCAwIDEyIDgiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+PHBhdGggZD0iTTEgMUw2IDZMMTEgMSIgc3Ryb2tlPSJ3aGl0ZSIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiLz48L3N2Zz4=')] bg-[length:12px] bg-[right_12px_center] bg-no-repeat [&>option]:bg-white [&>option]:text-gray-900"
             >
               <option value="all">All Members</option>
-              {uniqueMembers.map((member) => (
-                <option key={member} value={member}>
-                  {member}
+              {members.map((member) => (
+                <option key={member.member_id} value={String(member.member_id)}>
+                  {member.member_name}
                 </option>
               ))}
             </select>
@@ -531,6 +572,17 @@ export default function PortfolioPage() {
               </tbody>
             </table>
           </div>
+          {nextCursor && (
+            <div className="flex justify-center px-6 py-4 border-t border-gray-200 dark:border-gray-700">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="text-sm font-medium text-blue-600 hover:text-blue-700 disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load more investments'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
       )}
@@ -18,6 +18,15 @@ const api = axios.create({
 //   return config;
 // });
 
+// List endpoints return one page at a time; the next page's cursor is in this header
+const NEXT_CURSOR_HEADER = 'x-next-cursor';
+
+// Fetch one page of a paginated list endpoint; nextCursor is undefined on the last page
+const getPage = async (url: string, params: Record<string, any> = {}) => {
+  const res = await api.get(url, { params });
+  return { items: res.data, nextCursor: res.headers[NEXT_CURSOR_HEADER] as string | undefined };
+};
+
 // Auth APIs
 export const authAPI = {
   login: (email: string, password: string) =>
@@ -36,6 +45,7 @@ export const dashboardAPI = {
   getMemberAllocation: () => api.get('/api/dashboard/member-allocation'),
   getTopPerformers: (limit = 5) => api.get(`/api/dashboard/top-performers?limit=${limit}`),
   getWorstPerformers: (limit = 5) => api.get(`/api/dashboard/worst-performers?limit=${limit}`),
+  getPerformers: (limit = 5) => api.get('/api/dashboard/performers', { params: { limit } }),
 };
 
 // Goals APIs
@@ -48,13 +58,38 @@ export const goalsAPI = {
   getGoalHistory: (goalId: number) => api.get(`/api/goals/${goalId}/history?user_id=1`),
   runSimulation: (goalId: number, numSimulations = 5000) =>
     api.post(`/api/goals/${goalId}/simulate?user_id=1`, { goal_id: goalId, num_simulations: numSimulations }),
+  runHouseholdSimulation: (numSimulations = 5000, marketCorrelation = 1.0) =>
+    api.post('/api/goals/household/simulate?user_id=1', {
+      num_simulations: numSimulations,
+      market_correlation: marketCorrelation,
+    }),
   getRescueStrategies: (goalId: number) => api.get(`/api/goals/${goalId}/rescue-strategies?user_id=1`),
+  evaluateRescueStrategies: (goalId: number, request: any) =>
+    api.post(`/api/goals/${goalId}/rescue-strategies?user_id=1`, request),
+  getGoalProjection: (goalId: number, quantiles: number[] = [10, 50, 90], numPaths = 1000) =>
+    api.get(`/api/goals/${goalId}/projection?user_id=1`, {
+      params: { quantiles: quantiles.join(','), num_paths: numPaths },
+    }),
+  solveRequiredContribution: (goalId: number, targetProbability = 80, solveFor: 'monthly_sip' | 'lump_sum' = 'monthly_sip') =>
+    api.post(`/api/goals/${goalId}/required-contribution?user_id=1`, {
+      target_probability: targetProbability,
+      solve_for: solveFor,
+    }),
 };
 
 // Portfolio APIs
 export const portfolioAPI = {
   getSummary: () => api.get('/api/portfolio/summary'),
-  getAllInvestments: () => api.get('/api/portfolio/investments'),
+  getInvestmentsPage: (params: {
+    limit?: number;
+    cursor?: string;
+    sort?: 'investment_id' | 'name' | 'invested_value' | 'current_value' | 'gain_loss_percentage';
+    order?: 'asc' | 'desc';
+    asset_class_id?: number;
+    member_id?: number;
+    min_gain_percentage?: number;
+    max_gain_percentage?: number;
+  } = {}) => getPage('/api/portfolio/investments', params),
   getAllPortfolios: () => api.get('/api/family/portfolios'),
   getInvestmentDetails: (investmentId: number) =>
     api.get(`/api/portfolio/investments/${investmentId}`),
@@ -63,10 +98,20 @@ export const portfolioAPI = {
     api.put(`/api/portfolio/investments/${investmentId}`, investmentData),
   deleteInvestment: (investmentId: number) =>
     api.delete(`/api/portfolio/investments/${investmentId}`),
-  getInvestmentTransactions: (investmentId: number) =>
-    api.get(`/api/portfolio/investments/${investmentId}/transactions`),
+  getInvestmentTransactionsPage: (investmentId: number, params: {
+    limit?: number;
+    cursor?: string;
+    sort?: 'date' | 'amount';
+    order?: 'asc' | 'desc';
+    type?: string;
+    start_date?: string;
+    end_date?: string;
+  } = {}) => getPage(`/api/portfolio/investments/${investmentId}/transactions`, params),
   createTransaction: (transactionData: any) =>
     api.post('/api/portfolio/transactions', transactionData),
+  getXirr: (level: 'investment' | 'portfolio' | 'member' | 'asset_class' | 'total' = 'investment') =>
+    api.get('/api/portfolio/xirr', { params: { level } }),
+  refreshXirr: () => api.post('/api/portfolio/xirr/refresh'),
   getAssetClasses: () => api.get('/api/portfolio/asset-classes'),
 };
 
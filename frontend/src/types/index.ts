@@ -83,6 +83,23 @@ export interface AssetAllocation {
   percentage: number;
 }
 
+export interface PortfolioSummary {
+  total_current_value: number;
+  total_invested_value: number;
+  total_gain_loss: number;
+  gain_loss_percentage: number;
+}
+
+export interface MemberAllocation {
+  member_id: number;
+  member_name: string;
+  relation: string;
+  current_value: number;
+  invested_value: number;
+  gain_loss: number;
+  num_investments: number;
+}
+
 export interface GoalHistory {
   history_id: number;
   goal_id: number;